@@ -1,16 +1,31 @@
 """TechNova Support API Package."""
 
-from .main import app
-from .models import SupportRequest, SupportResponse
-from .servicenow_client import create_service_now_incident
-from .slack_client import send_slack_message
-from .github_client import create_github_issue
+import importlib
+
+# Importing a submodule (api.config, api.routing, ...) must not build the
+# whole app and load every SDK, so these names are imported on first access
+_EXPORTS = {
+    "app": ".main",
+    "SupportRequest": ".models",
+    "SupportResponse": ".models",
+    "create_service_now_incident": ".servicenow_client",
+    "send_slack_message": ".slack_client",
+    "create_github_issue": ".github_client"
+}
 
 __all__ = [
     "app",
     "SupportRequest",
-    "SupportResponse", 
+    "SupportResponse",
     "create_service_now_incident",
     "send_slack_message",
     "create_github_issue"
 ]
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,133 @@
+"""In-process cache for ServiceNow reference data.
+
+Entries are served fresh for `ttl` seconds. After that they are served
+stale for up to `max_stale` more seconds while a single background task
+refreshes them, and concurrent misses for the same key share one load
+instead of each hitting ServiceNow.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from .config import get_settings
+from .deadline import run_detached, wait_shared
+from .shared_state import get_shared_store
+
+logger = logging.getLogger(__name__)
+
+_cache: Optional["ReferenceCache"] = None
+
+
+class ReferenceCache:
+    """TTL cache with stale-while-revalidate and single-flight loading."""
+
+    def __init__(self, ttl: float, max_stale: float):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._entries = {}
+        self._inflight = {}
+        self._generation = 0
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refresh_errors": 0}
+
+    async def get(self, key: str, loader: Callable[[], Awaitable]):
+        """
+        Get a cached value, loading it with `loader` when missing or expired.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function returning a fresh value; it should raise
+                    on failure so errors are never cached
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            Exception: Whatever `loader` raised, if there is no usable cached value
+            asyncio.TimeoutError: If the caller's deadline passes before the load finishes
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+
+            if age < self.ttl:
+                self._stats["hits"] += 1
+                return value
+
+            if age < self.ttl + self.max_stale:
+                self._stats["stale_hits"] += 1
+                self._refresh(key, loader)
+                return value
+
+        self._stats["misses"] += 1
+        # The load is shared, so each caller only bounds its own wait
+        return await wait_shared(self._refresh(key, loader))
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one cached key, or every key when `key` is None."""
+        self._generation += 1
+
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+        store = get_shared_store()
+        if store is not None:
+            if key is None:
+                store.clear("reference.")
+            else:
+                store.remove(f"reference.{key}")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the currently cached keys."""
+        return {**self._stats, "keys": sorted(self._entries)}
+
+    def _refresh(self, key: str, loader: Callable[[], Awaitable]) -> asyncio.Task:
+        """Start a load for `key` unless one is already in flight, outside any request's deadline."""
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = run_detached(self._load(key, loader, self._generation))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return task
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable], generation: int):
+        store = get_shared_store()
+        if store is None:
+            value, age = await loader(), 0.0
+        else:
+            # Under the multi-worker server one worker loads for all of them
+            value, age = await store.get_or_load(f"reference.{key}", self.ttl, loader)
+
+        # Results of loads started before an invalidation are not cached
+        if generation == self._generation:
+            self._entries[key] = (value, time.monotonic() - age)
+
+        return value
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["refresh_errors"] += 1
+            logger.warning(f"Failed to refresh reference data '{key}': {str(task.exception())}")
+
+
+def get_reference_cache() -> ReferenceCache:
+    """Return the process-wide reference data cache."""
+    global _cache
+
+    if _cache is None:
+        settings = get_settings()
+        _cache = ReferenceCache(
+            ttl=settings.reference_cache_ttl,
+            max_stale=settings.reference_cache_max_stale
+        )
+
+    return _cache
@@ -0,0 +1,239 @@
+"""Circuit breakers for the ServiceNow, Slack and GitHub clients.
+
+Each downstream service has one breaker, shared by every call to it. The
+breaker watches a rolling window of recent calls and opens when too many of
+them fail or are slow. While it is open, calls fail immediately with
+CircuitOpenError instead of waiting for the client timeout. After a cool-down
+a few probe calls are let through (half-open); the breaker closes again if
+they succeed and reopens if they fail.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Optional
+
+from .config import get_settings
+from .deadline import check_deadline, deadline_expired
+from .metrics import Gauge, track_downstream
+
+# Breaker states
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+_STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+
+CIRCUIT_STATE = Gauge(
+    "support_api_circuit_breaker_state",
+    "Circuit breaker state per downstream service (0 closed, 1 half-open, 2 open).",
+    ("service",)
+)
+
+# Services guarded by a breaker, always listed on the status endpoint
+DOWNSTREAM_SERVICES = ("servicenow", "slack", "github")
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the service's breaker is open."""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"{service} circuit breaker is open, retry in {retry_after:.0f}s")
+        self.service = service
+        self.retry_after = retry_after
+
+
+def is_downstream_failure(error: BaseException) -> bool:
+    """
+    Decide whether an exception means the downstream service is unhealthy.
+
+    Timeouts, connection errors, 5xx responses and 429s count as failures.
+    Other HTTP errors (bad input, missing channel, permissions) mean the
+    service answered normally and do not.
+    """
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if not isinstance(status, int):
+        return True
+    return status >= 500 or status == 429
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling window of calls."""
+
+    def __init__(
+        self,
+        service: str,
+        window: float = 60.0,
+        min_calls: int = 10,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1
+    ):
+        self.service = service
+        self.window = window
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = STATE_CLOSED
+        self.opened_at: Optional[float] = None
+        self._calls = deque()
+        self._probes = 0
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.set(_STATE_VALUES[self.state], service=service)
+
+    @property
+    def rejecting(self) -> bool:
+        """True while the breaker is open and still cooling down."""
+        with self._lock:
+            return self.state == STATE_OPEN and time.monotonic() - self.opened_at < self.open_seconds
+
+    def before_call(self) -> None:
+        """
+        Admit a call or reject it.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with all probes in flight
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            if self.state == STATE_OPEN:
+                remaining = self.open_seconds - (now - self.opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(self.service, remaining)
+                self._transition(STATE_HALF_OPEN)
+
+            if self.state == STATE_HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    raise CircuitOpenError(self.service, 0)
+                self._probes += 1
+
+    def record(self, failed: bool, duration: float) -> None:
+        """Record the outcome of an admitted call."""
+        with self._lock:
+            now = time.monotonic()
+            slow = duration >= self.slow_call_seconds
+
+            if self.state == STATE_HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed or slow:
+                    self._open(now)
+                else:
+                    self._transition(STATE_CLOSED)
+                    self._calls.clear()
+                return
+
+            self._calls.append((now, failed, slow))
+            self._expire(now)
+
+            if self.state == STATE_CLOSED and len(self._calls) >= self.min_calls:
+                failures = sum(1 for _, call_failed, _ in self._calls if call_failed)
+                slow_calls = sum(1 for _, _, call_slow in self._calls if call_slow)
+                if failures / len(self._calls) >= self.error_rate or slow_calls / len(self._calls) >= self.slow_call_rate:
+                    self._open(now)
+
+    def snapshot(self) -> dict:
+        """Return the breaker's state and the statistics of its current window."""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            calls = len(self._calls)
+            failures = sum(1 for _, failed, _ in self._calls if failed)
+            slow_calls = sum(1 for _, _, slow in self._calls if slow)
+
+            return {
+                "state": self.state,
+                "calls": calls,
+                "error_rate": round(failures / calls, 3) if calls else 0.0,
+                "slow_call_rate": round(slow_calls / calls, 3) if calls else 0.0,
+                "retry_after": (
+                    round(max(0.0, self.open_seconds - (now - self.opened_at)), 1)
+                    if self.state == STATE_OPEN else None
+                )
+            }
+
+    def _expire(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _open(self, now: float) -> None:
+        self.opened_at = now
+        self._calls.clear()
+        self._transition(STATE_OPEN)
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            self.state = state
+            CIRCUIT_STATE.set(_STATE_VALUES[state], service=self.service)
+            if state != STATE_HALF_OPEN:
+                self._probes = 0
+
+
+def get_circuit_breaker(service: str) -> CircuitBreaker:
+    """Return the process-wide breaker for a downstream service, creating it on first use."""
+    breaker = _breakers.get(service)
+    if breaker is not None:
+        return breaker
+
+    with _breakers_lock:
+        if service not in _breakers:
+            settings = get_settings()
+            _breakers[service] = CircuitBreaker(
+                service,
+                window=settings.circuit_breaker_window,
+                min_calls=settings.circuit_breaker_min_calls,
+                error_rate=settings.circuit_breaker_error_rate,
+                slow_call_seconds=settings.circuit_breaker_slow_call_seconds,
+                slow_call_rate=settings.circuit_breaker_slow_call_rate,
+                open_seconds=settings.circuit_breaker_open_seconds,
+                half_open_calls=settings.circuit_breaker_half_open_calls
+            )
+        return _breakers[service]
+
+
+def get_circuit_breaker_states() -> dict:
+    """Return a snapshot of every breaker, keyed by service."""
+    services = sorted(set(DOWNSTREAM_SERVICES) | set(_breakers))
+    return {service: get_circuit_breaker(service).snapshot() for service in services}
+
+
+@contextmanager
+def downstream_call(service: str, operation: str, stage: Optional[str] = None):
+    """
+    Guard a downstream call with the request deadline and the service's
+    breaker, and record its metrics.
+
+    Raises:
+        DeadlineExceededError: Before the call, if the request's budget is spent
+        CircuitOpenError: Before the call, if the breaker rejects it
+    """
+    check_deadline(service)
+    breaker = get_circuit_breaker(service)
+    breaker.before_call()
+    start = time.monotonic()
+
+    try:
+        with track_downstream(service, operation, stage):
+            yield
+    except asyncio.CancelledError:
+        # Usually our own timeout: a failure of the service unless the caller's budget ran out
+        breaker.record(not deadline_expired(), time.monotonic() - start)
+        raise
+    except Exception as e:
+        # Timing out because the caller's budget ran out says nothing about the service
+        breaker.record(is_downstream_failure(e) and not deadline_expired(), time.monotonic() - start)
+        raise
+    else:
+        breaker.record(False, time.monotonic() - start)
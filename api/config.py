@@ -12,18 +12,159 @@ class Settings(BaseSettings):
     servicenow_instance: str = os.getenv("SERVICENOW_INSTANCE", "your-instance.service-now.com")
     servicenow_username: str = os.getenv("SERVICENOW_USERNAME", "")
     servicenow_password: str = os.getenv("SERVICENOW_PASSWORD", "")
+    servicenow_timeout: float = float(os.getenv("SERVICENOW_TIMEOUT", "10"))
+    servicenow_connect_timeout: float = float(os.getenv("SERVICENOW_CONNECT_TIMEOUT", "5"))
+    servicenow_max_connections: int = int(os.getenv("SERVICENOW_MAX_CONNECTIONS", "20"))
+    servicenow_max_concurrency: int = int(os.getenv("SERVICENOW_MAX_CONCURRENCY", "10"))
+    servicenow_batch_size: int = int(os.getenv("SERVICENOW_BATCH_SIZE", "50"))
+    servicenow_page_size: int = int(os.getenv("SERVICENOW_PAGE_SIZE", "100"))
+    # Comma-separated name prefixes of our assignment groups; defaults to the
+    # prefixes in the Slack channel routing table
+    assignment_group_prefixes: str = os.getenv("ASSIGNMENT_GROUP_PREFIXES", "")
+    assignment_groups_active_only: bool = os.getenv("ASSIGNMENT_GROUPS_ACTIVE_ONLY", "true").lower() == "true"
+    # Most groups /assignment_groups returns in one response, and its default limit
+    assignment_groups_max_limit: int = int(os.getenv("ASSIGNMENT_GROUPS_MAX_LIMIT", "500"))
     
     # Slack Configuration
     slack_bot_token: str = os.getenv("SLACK_BOT_TOKEN", "")
     slack_default_channel: str = os.getenv("SLACK_DEFAULT_CHANNEL", "#incidents")
+    slack_api_url: str = os.getenv("SLACK_API_URL", "https://slack.com/api/")
+    slack_timeout: float = float(os.getenv("SLACK_TIMEOUT", "10"))
+    slack_max_connections: int = int(os.getenv("SLACK_MAX_CONNECTIONS", "20"))
+    slack_max_retries: int = int(os.getenv("SLACK_MAX_RETRIES", "3"))
+    # Channel name -> ID directory, loaded at startup with conversations.list
+    # and refreshed every SLACK_DIRECTORY_REFRESH_INTERVAL seconds; routed
+    # channels that do not exist yet are created in the background at startup
+    slack_directory_refresh_interval: float = float(os.getenv("SLACK_DIRECTORY_REFRESH_INTERVAL", "900"))
+    slack_channel_types: str = os.getenv("SLACK_CHANNEL_TYPES", "public_channel")
+    slack_provision_channels: bool = os.getenv("SLACK_PROVISION_CHANNELS", "true").lower() == "true"
+    # Incident bursts: with SLACK_DIGEST_MODE "digest" or "thread", incidents
+    # posted to a channel within SLACK_DIGEST_WINDOW seconds of its last
+    # message are held and sent together, as one message or as a reply in
+    # the first incident's thread. SLACK_DIGEST_WINDOWS overrides the window
+    # per urgency ("2:30,3:60,4:120"); urgency 1 is always posted immediately
+    slack_digest_mode: str = os.getenv("SLACK_DIGEST_MODE", "off")
+    slack_digest_window: float = float(os.getenv("SLACK_DIGEST_WINDOW", "60"))
+    slack_digest_windows: str = os.getenv("SLACK_DIGEST_WINDOWS", "")
+    # Outbound pacing to Slack's rate tiers: chat.postMessage at
+    # SLACK_POST_CHANNEL_RATE per second per channel (bursts of
+    # SLACK_POST_BURST) and SLACK_POST_RATE_PER_MINUTE per workspace;
+    # conversations.create/list are Tier 2. Calls wait for their turn, but
+    # fail with SLACK_RATE_LIMITED rather than wait more than
+    # SLACK_QUEUE_MAX_WAIT seconds within a request
+    slack_pacing_enabled: bool = os.getenv("SLACK_PACING_ENABLED", "true").lower() == "true"
+    slack_post_channel_rate: float = float(os.getenv("SLACK_POST_CHANNEL_RATE", "1"))
+    slack_post_burst: int = int(os.getenv("SLACK_POST_BURST", "3"))
+    slack_post_rate_per_minute: float = float(os.getenv("SLACK_POST_RATE_PER_MINUTE", "300"))
+    slack_tier2_rate_per_minute: float = float(os.getenv("SLACK_TIER2_RATE_PER_MINUTE", "20"))
+    slack_tier2_burst: int = int(os.getenv("SLACK_TIER2_BURST", "5"))
+    slack_queue_max_wait: float = float(os.getenv("SLACK_QUEUE_MAX_WAIT", "5"))
     
     # GitHub Configuration
     github_token: str = os.getenv("GITHUB_TOKEN", "")
     github_default_repo: str = os.getenv("GITHUB_DEFAULT_REPO", "")
+    github_api_url: str = os.getenv("GITHUB_API_URL", "https://api.github.com")
+    github_timeout: float = float(os.getenv("GITHUB_TIMEOUT", "15"))
+    github_metadata_ttl: float = float(os.getenv("GITHUB_METADATA_TTL", "600"))
+    github_create_missing_labels: bool = os.getenv("GITHUB_CREATE_MISSING_LABELS", "true").lower() == "true"
+    # Repeats of a stack trace already tracked by an issue update that issue:
+    # a comment at most every GITHUB_COMMENT_INTERVAL seconds, otherwise only
+    # a local counter. Fingerprints unseen for GITHUB_FINGERPRINT_TTL seconds
+    # get a new issue.
+    github_issue_index_path: str = os.getenv("GITHUB_ISSUE_INDEX_PATH", "issues.db")
+    github_comment_interval: float = float(os.getenv("GITHUB_COMMENT_INTERVAL", "3600"))
+    github_fingerprint_ttl: float = float(os.getenv("GITHUB_FINGERPRINT_TTL", "604800"))
+    # Issue writes go through a queue: one at a time per repository, slowed
+    # down once fewer than GITHUB_RATE_LIMIT_RESERVE requests remain, and on
+    # a 403/429 rate limit paused for Retry-After (or GITHUB_QUEUE_BACKOFF
+    # seconds, doubling) and retried up to GITHUB_QUEUE_MAX_ATTEMPTS times.
+    # Requests wait up to GITHUB_TIMEOUT for their issue; after that it is
+    # created in the background
+    github_queue_max_size: int = int(os.getenv("GITHUB_QUEUE_MAX_SIZE", "500"))
+    github_queue_max_attempts: int = int(os.getenv("GITHUB_QUEUE_MAX_ATTEMPTS", "5"))
+    github_queue_backoff: float = float(os.getenv("GITHUB_QUEUE_BACKOFF", "60"))
+    github_queue_max_backoff: float = float(os.getenv("GITHUB_QUEUE_MAX_BACKOFF", "900"))
+    github_rate_limit_reserve: int = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "50"))
+    
+    # Seconds clients may cache /categories, /impacts and /urgencies
+    static_cache_max_age: int = int(os.getenv("STATIC_CACHE_MAX_AGE", "3600"))
+    
+    # Reference Data Cache Configuration
+    # Assignment groups are served from cache for REFERENCE_CACHE_TTL seconds,
+    # then served stale for up to REFERENCE_CACHE_MAX_STALE more while refreshing
+    reference_cache_ttl: float = float(os.getenv("REFERENCE_CACHE_TTL", "300"))
+    reference_cache_max_stale: float = float(os.getenv("REFERENCE_CACHE_MAX_STALE", "3600"))
+    
+    # Slack Channel Routing Configuration
+    # Defaults to knowledge-base/servicenow-assignment-groups.txt; the optional
+    # JSON routing file maps assignment group prefixes to channels
+    routing_knowledge_base_path: str = os.getenv("ROUTING_KNOWLEDGE_BASE_PATH", "")
+    routing_config_path: str = os.getenv("ROUTING_CONFIG_PATH", "")
+    routing_reload_interval: float = float(os.getenv("ROUTING_RELOAD_INTERVAL", "30"))
+    
+    # Request Deadline Configuration
+    # Each request gets REQUEST_TIMEOUT seconds (clients may ask for up to
+    # REQUEST_TIMEOUT_MAX with an X-Request-Timeout header); downstream calls
+    # only get what is left, and Slack/GitHub are skipped with less than
+    # DEADLINE_OPTIONAL_MIN_SECONDS remaining
+    request_timeout: float = float(os.getenv("REQUEST_TIMEOUT", "30"))
+    request_timeout_max: float = float(os.getenv("REQUEST_TIMEOUT_MAX", "120"))
+    deadline_optional_min_seconds: float = float(os.getenv("DEADLINE_OPTIONAL_MIN_SECONDS", "0.5"))
+    
+    # Circuit Breaker Configuration
+    # A service's breaker opens when, over the last CIRCUIT_BREAKER_WINDOW
+    # seconds and at least CIRCUIT_BREAKER_MIN_CALLS calls, the error rate or
+    # the rate of calls slower than CIRCUIT_BREAKER_SLOW_CALL_SECONDS crosses
+    # its threshold; calls then fail fast for CIRCUIT_BREAKER_OPEN_SECONDS
+    circuit_breaker_window: float = float(os.getenv("CIRCUIT_BREAKER_WINDOW", "60"))
+    circuit_breaker_min_calls: int = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
+    circuit_breaker_error_rate: float = float(os.getenv("CIRCUIT_BREAKER_ERROR_RATE", "0.5"))
+    circuit_breaker_slow_call_seconds: float = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", "5"))
+    circuit_breaker_slow_call_rate: float = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE", "0.8"))
+    circuit_breaker_open_seconds: float = float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30"))
+    circuit_breaker_half_open_calls: int = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_CALLS", "1"))
+    
+    # Side Effect Delivery Configuration
+    # "sync" waits for Slack/GitHub before responding; "outbox" queues them
+    # in a durable local outbox and returns right after ServiceNow
+    delivery_mode: str = os.getenv("DELIVERY_MODE", "sync")
+    outbox_path: str = os.getenv("OUTBOX_PATH", "outbox.db")
+    outbox_max_attempts: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+    outbox_retry_backoff: float = float(os.getenv("OUTBOX_RETRY_BACKOFF", "2"))
+    outbox_batch_size: int = int(os.getenv("OUTBOX_BATCH_SIZE", "10"))
+    # Seconds a claimed item stays reserved; must exceed the longest delivery
+    outbox_claim_lease: float = float(os.getenv("OUTBOX_CLAIM_LEASE", "300"))
+    
+    # Idempotency: completed /get_support responses are replayed for
+    # duplicate requests within this many seconds. The records are kept in
+    # a SQLite database shared by every worker on the host
+    idempotency_path: str = os.getenv("IDEMPOTENCY_PATH", "idempotency.db")
+    idempotency_ttl: float = float(os.getenv("IDEMPOTENCY_TTL", "600"))
+    idempotency_max_entries: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "10000"))
+    # Seconds a request's key stays reserved while its pipeline runs; must
+    # exceed REQUEST_TIMEOUT_MAX
+    idempotency_lease: float = float(os.getenv("IDEMPOTENCY_LEASE", "300"))
+    
+    # Startup: before /ready passes, pre-warm DNS, downstream connections,
+    # PyGithub and the OpenAPI schema; readiness passes after
+    # STARTUP_PREWARM_TIMEOUT seconds even if pre-warming has not finished
+    startup_prewarm: bool = os.getenv("STARTUP_PREWARM", "true").lower() == "true"
+    startup_prewarm_timeout: float = float(os.getenv("STARTUP_PREWARM_TIMEOUT", "20"))
+    
+    # Server: `python -m api.server` forks WEB_CONCURRENCY workers, or one
+    # per CPU of the container's CPU quota (at most SERVER_MAX_WORKERS) when
+    # WEB_CONCURRENCY is 0, the default. Workers publish their metrics every
+    # METRICS_PUBLISH_INTERVAL seconds so /metrics reports all of them
+    server_host: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    server_port: int = int(os.getenv("SERVER_PORT", "8000"))
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    server_max_workers: int = int(os.getenv("SERVER_MAX_WORKERS", "8"))
+    metrics_publish_interval: float = float(os.getenv("METRICS_PUBLISH_INTERVAL", "5"))
     
     # API Configuration
     api_server_url: str = os.getenv("API_SERVER_URL", "http://localhost:8000")
     api_key: str = os.getenv("API_KEY", "")
+    batch_max_items: int = int(os.getenv("BATCH_MAX_ITEMS", "200"))
     api_title: str = "TechNova Support API"
     api_version: str = "1.0.0"
     api_description: str = "API for creating ServiceNow incidents and sending Slack notifications"
@@ -0,0 +1,85 @@
+"""Per-request time budget shared by every downstream call.
+
+The request middleware sets a deadline for each request, REQUEST_TIMEOUT
+seconds by default or the client's X-Request-Timeout header. Downstream calls
+use only the budget that remains as their timeout, and work that can no
+longer finish in time is not started: the caller would have given up on it.
+The deadline lives in a context variable, so it follows the request into
+tasks and worker threads started on its behalf.
+
+Work shared between requests (single-flight loads, coalesced duplicates)
+must not inherit any one request's deadline or timings. It is started with
+run_detached(), and each waiting request bounds only its own wait with
+wait_shared().
+"""
+
+import asyncio
+import contextvars
+import time
+from contextvars import ContextVar
+from typing import Coroutine, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """Raised instead of starting a downstream call once the request's budget is spent."""
+
+    def __init__(self, service: str):
+        super().__init__(f"Request deadline exceeded before calling {service}")
+        self.service = service
+
+
+def set_deadline(seconds: Optional[float]) -> None:
+    """Give the current request `seconds` from now to finish, or no deadline if None."""
+    _deadline.set(time.monotonic() + seconds if seconds is not None else None)
+
+
+def remaining_budget() -> Optional[float]:
+    """Return the seconds left for the current request, or None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_expired() -> bool:
+    """True if the current request has a deadline and it has passed."""
+    remaining = remaining_budget()
+    return remaining is not None and remaining <= 0
+
+
+def budget_timeout(timeout: float) -> float:
+    """Return `timeout` capped to the remaining budget (never below zero)."""
+    remaining = remaining_budget()
+    if remaining is None:
+        return timeout
+    return max(0.0, min(timeout, remaining))
+
+
+def run_detached(coro: Coroutine) -> asyncio.Task:
+    """Start `coro` as a task with a fresh context: no request deadline, no request timings."""
+    return asyncio.get_running_loop().create_task(coro, context=contextvars.Context())
+
+
+async def wait_shared(task: asyncio.Future):
+    """
+    Wait for a shared task within the current request's remaining budget.
+
+    The task itself is never cancelled, so other waiters still get its result.
+
+    Raises:
+        asyncio.TimeoutError: If the request's budget runs out first
+    """
+    return await asyncio.wait_for(asyncio.shield(task), timeout=remaining_budget())
+
+
+def check_deadline(service: str) -> None:
+    """
+    Make sure there is budget left to call a service.
+
+    Raises:
+        DeadlineExceededError: If the current request's deadline has passed
+    """
+    if deadline_expired():
+        raise DeadlineExceededError(service)
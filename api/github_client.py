@@ -1,38 +1,340 @@
 """GitHub client helper functions."""
 
+import hashlib
+import json
 import logging
 import re
-from typing import Optional
-from github import Github, GithubException
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
 
 from .config import get_settings
+from .circuit_breaker import CircuitOpenError, downstream_call
+from .deadline import DeadlineExceededError
+from .metrics import STACK_TRACE_DETECTION_DURATION
+from .issue_index import get_issue_index
+
+# PyGithub takes longer to import than the rest of the app and is only needed
+# once a stack trace is reported, so it is imported on first use
+if TYPE_CHECKING:
+    from github import Github, GithubException
 
 logger = logging.getLogger(__name__)
 
-# Patterns that indicate a stack trace
+# Patterns that indicate a stack trace, grouped by the family they identify
+# and checked in order. They are matched against the lowercased description
+# (prefixed with a newline so "\n" also anchors the first line), and each one
+# starts with a literal so the regex engine can skip ahead with its fast
+# literal search. Every quantifier is bounded or possessive, which keeps
+# detection linear-time even on multi-megabyte single-line pastes.
 STACK_TRACE_PATTERNS = [
-    r'Traceback \(most recent call last\)',  # Python
-    r'at .+\(.+:\d+\)',  # Java/JavaScript
-    r'^\s+at\s+',  # Generic "at" pattern
-    r'Exception in thread',  # Java
-    r'Error:\s*\n\s+at\s+',  # Node.js
-    r'File ".+", line \d+',  # Python file reference
-    r'\.py", line \d+',  # Python file
-    r'\.java:\d+\)',  # Java file
-    r'\.js:\d+:\d+',  # JavaScript file
-    r'\.ts:\d+:\d+',  # TypeScript file
-    r'Stack trace:',  # Generic
-    r'Call stack:',  # Generic
-    r'NullPointerException',  # Java
-    r'TypeError:|ValueError:|KeyError:|AttributeError:',  # Python exceptions
-    r'Caused by:',  # Java chained exceptions
+    ("python", r'traceback \(most recent call last\)'),  # Python
+    ("python", r'file "[^"\n]{1,500}+", line \d'),  # Python file reference
+    ("python", r'\.py", line \d'),  # Python file
+    ("java", r'exception in thread'),  # Java
+    ("java", r'\.java:\d++\)'),  # Java file
+    ("java", r'nullpointerexception'),  # Java
+    ("java", r'caused by:'),  # Java chained exceptions
+    ("javascript", r'error:[ \t]*+\r?\n[ \t]++at[ \t]'),  # Node.js
+    ("javascript", r'\.js:\d++:\d'),  # JavaScript file
+    ("typescript", r'\.ts:\d++:\d'),  # TypeScript file
+    ("generic", r'at [^\s(]{1,200}+ ?\([^\n()]{0,300}?:\d++\)'),  # Java/JavaScript frame
+    ("generic", r'\n[ \t]++at[ \t]'),  # Generic "at" pattern
+    ("generic", r'stack trace:'),  # Generic
+    ("generic", r'call stack:'),  # Generic
+    ("generic", r'typeerror:'),  # Python/JavaScript exceptions
+    ("generic", r'valueerror:'),
+    ("generic", r'keyerror:'),
+    ("generic", r'attributeerror:'),
+]
+
+_STACK_TRACE_DETECTORS = [
+    (family, re.compile(pattern))
+    for family, pattern in STACK_TRACE_PATTERNS
 ]
 
+# Stack-trace fingerprinting: frames are normalized so the same crash
+# reported by different users, hosts or builds hashes identically
+FINGERPRINT_FRAMES = 5
+FINGERPRINT_EXCEPTIONS = 3
+# Only the start of a description is fingerprinted, so a multi-megabyte
+# paste costs no more than a long stack trace
+FINGERPRINT_MAX_CHARS = 64 * 1024
+
+_FRAME_RE = re.compile(r'^(?:file "|at )')
+_TIMESTAMP_RE = re.compile(r'\d{4}-\d\d-\d\d[t ]\d\d:\d\d:\d\d(?:[.,]\d+)?(?:z|[+-]\d\d:?\d\d)?')
+_DIRECTORY_RE = re.compile(r'(?:[a-z]:)?(?:[\\/][^\\/\s"\'():]*)*[\\/]')
+_ADDRESS_RE = re.compile(r'0x[0-9a-f]+')
+_UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+_LINE_NUMBER_RE = re.compile(r'(?::\d+)+|\bline \d+')
+_NUMBER_RE = re.compile(r'\d+')
+# An exception line: "valueerror: ...", "caused by: java.io.ioexception", ...
+_EXCEPTION_LINE_RE = re.compile(r'(?:caused by: |exception in thread "[^"\n]*" )?([a-z_$][\w.$]*(?:error|exception))\b(?::|$)')
+
+
+# Colors used when a missing label has to be created
+LABEL_COLORS = {
+    "bug": "d73a4a",
+    "auto-generated": "ededed",
+}
+DEFAULT_LABEL_COLOR = "c5def5"
+
+# Shared GitHub client and per-repository metadata, created on first use
+_client: Optional["Github"] = None
+_repo_metadata = {}
+_repo_metadata_lock = threading.Lock()
+
+
+class RepoMetadata:
+    """Cached repository handle and label set for one repository."""
+
+    def __init__(self, repo, labels: set, labels_etag: Optional[str]):
+        self.repo = repo
+        self.labels = labels
+        self.labels_etag = labels_etag
+        self.unavailable_labels = set()
+        self.validated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+
+def get_github_client() -> "Github":
+    """Return the shared GitHub client instance, creating it on first use."""
+    global _client
+    
+    if _client is None:
+        from github import Github
+        from urllib3.util.retry import Retry
+        
+        settings = get_settings()
+        # Rate-limited writes are retried by the write queue, which backs off
+        # without holding a worker thread; only idempotent calls are retried here.
+        # Lazy objects are only fetched when an attribute is read, so
+        # repo.get_issue(n).create_comment() is a single POST
+        _client = Github(
+            settings.github_token,
+            base_url=settings.github_api_url,
+            per_page=100,
+            lazy=True,
+            retry=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+        )
+    
+    return _client
+
+
+def is_rate_limited(error: "GithubException") -> bool:
+    """True for GitHub's primary and secondary rate limit responses."""
+    from github import RateLimitExceededException
+    
+    return isinstance(error, RateLimitExceededException) or error.status == 429
+
+
+def rate_limit_delay(headers: Optional[dict]) -> Optional[float]:
+    """
+    Return how long GitHub asks us to wait, from Retry-After or the rate limit reset.
+    
+    Args:
+        headers: Response headers of a rate-limited request
+        
+    Returns:
+        float: Seconds to wait, or None if the headers do not say
+    """
+    headers = {name.lower(): value for name, value in (headers or {}).items()}
+    
+    try:
+        if "retry-after" in headers:
+            return max(0.0, float(headers["retry-after"]))
+        if headers.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in headers:
+            return max(0.0, float(headers["x-ratelimit-reset"]) - time.time())
+    except ValueError:
+        pass
+    
+    return None
+
+
+def get_rate_limit_status() -> tuple:
+    """
+    Return the rate limit seen on the shared client's last response.
+    
+    Returns:
+        tuple: (remaining requests, epoch seconds of the next reset), or
+               (None, None) before GitHub has reported them
+    """
+    if _client is None:
+        return None, None
+    
+    remaining, limit = _client.requester.rate_limiting
+    if limit < 0:
+        return None, None
+    return remaining, _client.requester.rate_limiting_resettime
+
+
+def _request_conditional(repo, url: str, etag: Optional[str], parameters: Optional[dict] = None) -> tuple:
+    """
+    GET a repository URL with If-None-Match, which PyGithub's public API cannot send.
+    
+    This is the only use of PyGithub's private requester; it was checked
+    against PyGithub 2.10 (requirements.txt keeps PyGithub below 3).
+    
+    Returns:
+        tuple: (status, response headers, response body)
+    """
+    headers = {"If-None-Match": etag} if etag else None
+    return repo._requester.requestJson("GET", url, parameters=parameters, headers=headers)
+
 
-def get_github_client() -> Github:
-    """Create and return a GitHub client instance."""
-    settings = get_settings()
-    return Github(settings.github_token)
+def _fetch_labels(repo, etag: Optional[str] = None) -> tuple:
+    """
+    Fetch a repository's label names, revalidating with the cached ETag.
+    
+    Args:
+        repo: PyGithub Repository
+        etag: ETag of the previously fetched first page of labels
+        
+    Returns:
+        tuple: (set of label names, or None if unchanged since `etag`; new ETag)
+    """
+    from github import GithubException
+    
+    with downstream_call("github", "get_labels"):
+        status, response_headers, output = _request_conditional(repo, f"{repo.url}/labels", etag, {"per_page": 100})
+        if status >= 400:
+            raise GithubException(status, output, response_headers)
+    
+    if status == 304:
+        return None, etag
+    
+    labels = {label["name"] for label in json.loads(output)}
+    
+    # Rare: more than one page of labels; let PyGithub walk the rest
+    if 'rel="next"' in response_headers.get("link", ""):
+        with downstream_call("github", "get_labels"):
+            labels = {label.name for label in repo.get_labels()}
+    
+    return labels, response_headers.get("etag")
+
+
+def get_repo_metadata(repo_name: str) -> RepoMetadata:
+    """
+    Get the cached handle and label set for a repository.
+    
+    Entries older than GITHUB_METADATA_TTL are revalidated with conditional
+    requests, which GitHub does not count against the rate limit when
+    nothing changed.
+    
+    Args:
+        repo_name: Repository name (owner/repo format)
+        
+    Returns:
+        RepoMetadata: The cached repository metadata
+    """
+    ttl = get_settings().github_metadata_ttl
+    
+    with _repo_metadata_lock:
+        metadata = _repo_metadata.get(repo_name)
+        
+        if metadata is None:
+            with downstream_call("github", "get_repo"):
+                repo = get_github_client().get_repo(repo_name)
+            labels, etag = _fetch_labels(repo)
+            metadata = RepoMetadata(repo, labels, etag)
+            _repo_metadata[repo_name] = metadata
+            return metadata
+    
+    with metadata.lock:
+        if time.monotonic() - metadata.validated_at >= ttl:
+            with downstream_call("github", "get_repo"):
+                metadata.repo.update()
+            labels, etag = _fetch_labels(metadata.repo, metadata.labels_etag)
+            if labels is not None:
+                metadata.labels = labels
+                metadata.labels_etag = etag
+                metadata.unavailable_labels.clear()
+            metadata.validated_at = time.monotonic()
+    
+    return metadata
+
+
+def invalidate_repo_metadata(repo_name: Optional[str] = None) -> None:
+    """Drop cached metadata for one repository, or for all of them."""
+    with _repo_metadata_lock:
+        if repo_name is None:
+            _repo_metadata.clear()
+        else:
+            _repo_metadata.pop(repo_name, None)
+
+
+def resolve_labels(metadata: RepoMetadata, labels: list) -> list:
+    """
+    Return the labels that can be applied, creating missing ones once.
+    
+    Labels that cannot be created (e.g., the token lacks permission) are
+    remembered and skipped until the metadata is next refreshed.
+    
+    Args:
+        metadata: Cached repository metadata
+        labels: Desired label names
+        
+    Returns:
+        list: Label names that exist in the repository
+    """
+    from github import GithubException
+    
+    create_missing = get_settings().github_create_missing_labels
+    existing_labels = []
+    
+    with metadata.lock:
+        for label in labels:
+            if label in metadata.labels:
+                existing_labels.append(label)
+                continue
+            
+            if not create_missing or label in metadata.unavailable_labels:
+                continue
+            
+            try:
+                with downstream_call("github", "create_label"):
+                    metadata.repo.create_label(label, LABEL_COLORS.get(label, DEFAULT_LABEL_COLOR))
+                metadata.labels.add(label)
+                existing_labels.append(label)
+                logger.info(f"Created missing label '{label}'")
+            except GithubException as e:
+                # Rate limits are retried by the write queue, not remembered
+                if is_rate_limited(e):
+                    raise
+                # 422 means someone else created it in the meantime
+                if e.status == 422:
+                    metadata.labels.add(label)
+                    existing_labels.append(label)
+                else:
+                    metadata.unavailable_labels.add(label)
+                    logger.warning(f"Label '{label}' does not exist in repo and could not be created, skipping")
+    
+    return existing_labels
+
+
+def detect_stack_trace(error_message: str) -> Optional[str]:
+    """
+    Detect a stack trace in an error message.
+    
+    Args:
+        error_message: The error message to check
+        
+    Returns:
+        str: Family of the first matching pattern ("python", "java",
+             "javascript", "typescript" or "generic"), or None if no
+             stack trace pattern is found
+    """
+    if not error_message:
+        return None
+    
+    with STACK_TRACE_DETECTION_DURATION.time():
+        text = "\n" + error_message.lower()
+        
+        for family, detector in _STACK_TRACE_DETECTORS:
+            if detector.search(text):
+                return family
+        
+        return None
 
 
 def contains_stack_trace(error_message: str) -> bool:
@@ -45,14 +347,155 @@ def contains_stack_trace(error_message: str) -> bool:
     Returns:
         bool: True if a stack trace pattern is found
     """
+    return detect_stack_trace(error_message) is not None
+
+
+def normalize_frame(line: str) -> str:
+    """
+    Strip the run-specific parts of a stack frame or exception line.
+    
+    Timestamps, directories (including user home paths), memory addresses,
+    UUIDs, line/column numbers and other numbers are removed so only the
+    file name and function remain.
+    
+    Args:
+        line: A lowercased stack trace line
+        
+    Returns:
+        str: The normalized line
+    """
+    line = _TIMESTAMP_RE.sub("", line)
+    line = _UUID_RE.sub("", line)
+    line = _DIRECTORY_RE.sub("", line)
+    line = _ADDRESS_RE.sub("0x", line)
+    line = _LINE_NUMBER_RE.sub("", line)
+    line = _NUMBER_RE.sub("#", line)
+    return " ".join(line.split())
+
+
+def stack_trace_fingerprint(error_message: str, family: Optional[str] = None) -> Optional[str]:
+    """
+    Compute a fingerprint identifying the crash behind a stack trace.
+    
+    The fingerprint hashes the exception types and the top FINGERPRINT_FRAMES
+    normalized frames (the innermost ones for Python, whose tracebacks list
+    the most recent call last). Exception types are only taken from
+    exception and "caused by" lines next to the frames, so narrative text
+    around the trace does not change the fingerprint. Descriptions without
+    recognizable frames fall back to hashing every normalized line. Only
+    the first FINGERPRINT_MAX_CHARS characters are read.
+    
+    Args:
+        error_message: The description containing the stack trace
+        family: Stack trace family from detect_stack_trace
+        
+    Returns:
+        str: A 16 character hex fingerprint, or None for an empty message
+    """
     if not error_message:
+        return None
+    
+    lines = [line.strip() for line in error_message[:FINGERPRINT_MAX_CHARS].lower().splitlines()]
+    lines = [line for line in lines if line]
+    frames = [index for index, line in enumerate(lines) if _FRAME_RE.match(line)]
+    
+    if not frames:
+        parts = [normalize_frame(line) for line in lines]
+    else:
+        frame_set = set(frames)
+        exception_types = []
+        for index, line in enumerate(lines):
+            # Exception lines sit right above their frames (Java, JavaScript) or
+            # just below them, after the source and caret lines (Python)
+            if index in frame_set or not (
+                index + 1 in frame_set or frame_set.intersection((index - 1, index - 2, index - 3))
+            ):
+                continue
+            
+            match = _EXCEPTION_LINE_RE.match(line)
+            if match and match.group(1) not in exception_types and len(exception_types) < FINGERPRINT_EXCEPTIONS:
+                exception_types.append(match.group(1))
+        
+        top_frames = frames[-FINGERPRINT_FRAMES:] if family == "python" else frames[:FINGERPRINT_FRAMES]
+        parts = exception_types + [normalize_frame(lines[index]) for index in top_frames]
+    
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def update_existing_issue(
+    metadata: RepoMetadata,
+    repo_name: str,
+    fingerprint: str,
+    existing: dict,
+    incident_number: Optional[str] = None
+) -> bool:
+    """
+    Record a repeat of a crash on the issue already tracking it.
+    
+    A comment with the new occurrences is posted at most once every
+    GITHUB_COMMENT_INTERVAL seconds; in between only the local counter is
+    bumped, so a crash reported hundreds of times an hour costs one API
+    call instead of hundreds. The issue index hands out the comment slot
+    atomically, so concurrent repeats in any worker post one comment.
+    
+    Args:
+        metadata: Cached repository metadata
+        repo_name: Repository name (owner/repo format)
+        fingerprint: Stack-trace fingerprint
+        existing: Index entry returned by claim_issue
+        incident_number: ServiceNow incident reporting the repeat
+        
+    Returns:
+        bool: True if a comment was posted
+        
+    Raises:
+        GithubException: If the comment could not be posted
+    """
+    index = get_issue_index()
+    entry = index.claim_comment(repo_name, fingerprint, get_settings().github_comment_interval)
+    if entry is None:
         return False
     
-    for pattern in STACK_TRACE_PATTERNS:
-        if re.search(pattern, error_message, re.MULTILINE | re.IGNORECASE):
-            return True
+    new_occurrences = entry["occurrences"] - entry["reported_occurrences"]
+    comment = (
+        f"Seen {new_occurrences} more time(s), {entry['occurrences']} in total"
+        f" (stack trace fingerprint `{fingerprint}`)."
+    )
+    if incident_number:
+        comment += f" Latest ServiceNow incident: {incident_number}."
     
-    return False
+    with downstream_call("github", "create_comment"):
+        metadata.repo.get_issue(existing["issue_number"]).create_comment(comment)
+    index.record_comment(repo_name, fingerprint, entry["occurrences"])
+    return True
+
+
+def claim_issue(repo_name: str, fingerprint: str) -> Optional[dict]:
+    """
+    Find the issue tracking a fingerprint, or reserve the fingerprint for a new one.
+    
+    If another caller holds the reservation, in this process or another,
+    this waits for its issue, so concurrent reports of a new crash all end
+    up on one issue. No lock is held while waiting.
+    
+    Args:
+        repo_name: Repository name (owner/repo format)
+        fingerprint: Stack-trace fingerprint
+        
+    Returns:
+        dict: Index entry of the issue tracking the fingerprint, or None if
+              this call reserved it and must open the issue
+    """
+    index = get_issue_index()
+    while True:
+        existing = index.claim(repo_name, fingerprint)
+        if existing is None or existing["issue_number"]:
+            return existing
+        
+        existing = index.wait_for_issue(repo_name, fingerprint)
+        if existing is not None:
+            return existing
+        # The other worker failed to open the issue; try to reserve it ourselves
 
 
 def create_github_issue(
@@ -83,21 +526,29 @@ def create_github_issue(
         "issue_url": None,
         "issue_number": None,
         "error_details": None,
-        "stack_trace_detected": False
+        "stack_trace_detected": False,
+        "stack_trace_family": None,
+        "stack_trace_fingerprint": None,
+        "occurrences": 0
     }
     
     # Check if error message contains a stack trace
-    if not contains_stack_trace(error_message):
+    stack_trace_family = detect_stack_trace(error_message)
+    if stack_trace_family is None:
         logger.info("No stack trace detected in error message, skipping GitHub issue creation")
         result["success"] = True  # Not an error, just no action needed
         return result
     
     result["stack_trace_detected"] = True
-    logger.info("Stack trace detected, creating GitHub issue")
+    result["stack_trace_family"] = stack_trace_family
+    fingerprint = stack_trace_fingerprint(error_message, stack_trace_family)
+    result["stack_trace_fingerprint"] = fingerprint
+    logger.info(f"{stack_trace_family} stack trace detected (fingerprint {fingerprint})")
+    
+    from github import GithubException
     
     try:
         settings = get_settings()
-        client = get_github_client()
         
         # Use provided repo or default from config
         target_repo = repo_name or settings.github_default_repo
@@ -110,57 +561,74 @@ def create_github_issue(
             }
             return result
         
-        repo = client.get_repo(target_repo)
-        
-        # Build issue title
-        title_parts = []
-        if incident_number:
-            title_parts.append(f"[{incident_number}]")
-        if product_id:
-            title_parts.append(f"[{product_id}]")
-        title_parts.append(short_description or "Error with stack trace detected")
-        
-        issue_title = " ".join(title_parts)
-        
-        # Build issue body
-        issue_body = build_issue_body(
-            error_message=error_message,
-            incident_number=incident_number,
-            short_description=short_description,
-            product_id=product_id,
-            caller_username=caller_username
-        )
-        
-        # Create labels
-        labels = ["bug", "auto-generated"]
-        if product_id:
-            labels.append(f"product:{product_id}")
+        metadata = get_repo_metadata(target_repo)
         
-        # Try to use existing labels, skip if they don't exist
-        existing_labels = []
-        for label in labels:
+        # A known crash updates its existing issue instead of opening another
+        existing = claim_issue(target_repo, fingerprint)
+        if existing is not None:
             try:
-                repo.get_label(label)
-                existing_labels.append(label)
-            except GithubException:
-                logger.warning(f"Label '{label}' does not exist in repo, skipping")
+                commented = update_existing_issue(metadata, target_repo, fingerprint, existing, incident_number)
+            except GithubException as e:
+                # The issue was deleted or transferred; open a new one below
+                if e.status not in (404, 410):
+                    raise
+                get_issue_index().forget(target_repo, fingerprint)
+                # Unless another worker has already opened it
+                existing = claim_issue(target_repo, fingerprint)
+                commented = False
+            
+            if existing is not None:
+                result["success"] = True
+                result["issue_url"] = existing["issue_url"]
+                result["issue_number"] = existing["issue_number"]
+                result["occurrences"] = existing["occurrences"]
+                logger.info(
+                    f"Stack trace already tracked by GitHub issue #{existing['issue_number']} "
+                    f"({existing['occurrences']} occurrences, {'commented' if commented else 'counted'})"
+                )
+                return result
         
-        # Create the issue
-        issue = repo.create_issue(
-            title=issue_title,
-            body=issue_body,
-            labels=existing_labels if existing_labels else None
-        )
+        # claim_issue() reserved the fingerprint for this call
+        try:
+            _open_issue(
+                result, metadata, target_repo, fingerprint, error_message,
+                incident_number, short_description, product_id, caller_username
+            )
+        except BaseException:
+            get_issue_index().release(target_repo, fingerprint)
+            raise
         
-        result["success"] = True
-        result["issue_created"] = True
-        result["issue_url"] = issue.html_url
-        result["issue_number"] = issue.number
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping GitHub issue: {str(e)}")
+        result["error_details"] = {
+            "error_code": "GITHUB_CIRCUIT_OPEN",
+            "error_message": str(e),
+            "service": "github"
+        }
         
-        logger.info(f"Successfully created GitHub issue #{issue.number}: {issue.html_url}")
+    except DeadlineExceededError as e:
+        logger.warning(f"Skipping GitHub issue: {str(e)}")
+        result["error_details"] = {
+            "error_code": "GITHUB_DEADLINE_EXCEEDED",
+            "error_message": str(e),
+            "service": "github"
+        }
         
     except GithubException as e:
+        if is_rate_limited(e):
+            logger.warning(f"GitHub rate limit hit: {str(e)}")
+            result["error_details"] = {
+                "error_code": "GITHUB_RATE_LIMITED",
+                "error_message": str(e),
+                "service": "github",
+                "retry_after": rate_limit_delay(e.headers)
+            }
+            return result
+        
         logger.error(f"GitHub API error: {str(e)}")
+        # The repository may have been renamed or deleted; refetch next time
+        if e.status in (404, 410):
+            invalidate_repo_metadata(target_repo)
         result["error_details"] = {
             "error_code": "GITHUB_API_ERROR",
             "error_message": str(e),
@@ -178,12 +646,73 @@ def create_github_issue(
     return result
 
 
+def _open_issue(
+    result: dict,
+    metadata: RepoMetadata,
+    repo_name: str,
+    fingerprint: str,
+    error_message: str,
+    incident_number: Optional[str],
+    short_description: Optional[str],
+    product_id: Optional[str],
+    caller_username: Optional[str]
+) -> None:
+    """Create a new issue for a stack trace and index it by fingerprint."""
+    # Build issue title
+    title_parts = []
+    if incident_number:
+        title_parts.append(f"[{incident_number}]")
+    if product_id:
+        title_parts.append(f"[{product_id}]")
+    title_parts.append(short_description or "Error with stack trace detected")
+    
+    issue_title = " ".join(title_parts)
+    
+    # Build issue body
+    issue_body = build_issue_body(
+        error_message=error_message,
+        fingerprint=fingerprint,
+        incident_number=incident_number,
+        short_description=short_description,
+        product_id=product_id,
+        caller_username=caller_username
+    )
+    
+    # Create labels
+    labels = ["bug", "auto-generated"]
+    if product_id:
+        labels.append(f"product:{product_id}")
+    
+    # Use cached labels, creating missing ones once
+    existing_labels = resolve_labels(metadata, labels)
+    
+    # Create the issue
+    with downstream_call("github", "create_issue"):
+        issue = metadata.repo.create_issue(
+            title=issue_title,
+            body=issue_body,
+            labels=existing_labels
+        )
+    
+    result["success"] = True
+    result["issue_created"] = True
+    result["issue_url"] = issue.html_url
+    result["issue_number"] = issue.number
+    result["occurrences"] = 1
+    
+    # Later reports of the same crash update this issue
+    get_issue_index().record_issue(repo_name, fingerprint, issue.number, issue.html_url)
+    
+    logger.info(f"Successfully created GitHub issue #{issue.number}: {issue.html_url}")
+
+
 def build_issue_body(
     error_message: str,
     incident_number: Optional[str] = None,
     short_description: Optional[str] = None,
     product_id: Optional[str] = None,
-    caller_username: Optional[str] = None
+    caller_username: Optional[str] = None,
+    fingerprint: Optional[str] = None
 ) -> str:
     """
     Build the GitHub issue body with formatted content.
@@ -194,6 +723,7 @@ def build_issue_body(
         short_description: Brief summary of the issue
         product_id: The product ID related to this error
         caller_username: Username of the person who reported the issue
+        fingerprint: Stack-trace fingerprint used to de-duplicate issues
         
     Returns:
         str: Formatted issue body in Markdown
@@ -219,6 +749,8 @@ def build_issue_body(
         body_parts.append(f"| Reported By | {caller_username} |")
     if short_description:
         body_parts.append(f"| Summary | {short_description} |")
+    if fingerprint:
+        body_parts.append(f"| Stack Trace Fingerprint | `{fingerprint}` |")
     
     body_parts.append("")
     
@@ -0,0 +1,273 @@
+"""Bounded queue for GitHub issue writes.
+
+GitHub's secondary rate limits reject bursts of content creation. Rather
+than firing one create_github_issue per request and losing most of them
+during an outage, issue writes are queued here:
+- Each repository gets one worker, so writes to a repo run one at a time.
+- Workers slow down as the remaining rate limit runs low.
+- On a 403/429 rate limit, or while the circuit breaker is open, the
+  queue pauses for Retry-After, until the reset, or for an exponential
+  backoff, and then retries the same write.
+
+A request waits for its issue only as long as its GitHub timeout allows.
+After that the issue stays queued and is created in the background.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+from .config import get_settings
+from .github_client import create_github_issue, get_rate_limit_status
+from .metrics import Gauge
+
+logger = logging.getLogger(__name__)
+
+GITHUB_QUEUE_DEPTH = Gauge(
+    "support_api_github_write_queue_depth",
+    "GitHub issue writes waiting in the write queue.",
+    ("repo",)
+)
+
+# Error codes that mean "try again later" rather than "this write failed"
+RETRYABLE_ERROR_CODES = ("GITHUB_RATE_LIMITED", "GITHUB_CIRCUIT_OPEN")
+
+_queue: Optional["GitHubWriteQueue"] = None
+
+
+class GitHubQueueFullError(Exception):
+    """Raised when the write queue already holds its maximum number of writes."""
+
+
+class GitHubWriteQueue:
+    """Per-repository serialized, rate-limit-aware queue of create_github_issue calls."""
+
+    def __init__(
+        self,
+        max_size: int = 500,
+        max_attempts: int = 5,
+        backoff: float = 60.0,
+        max_backoff: float = 900.0,
+        rate_limit_reserve: int = 50
+    ):
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limit_reserve = rate_limit_reserve
+        self._jobs = {}
+        self._workers = {}
+        self._paused_until = 0.0
+        self._stats = {"completed": 0, "retried": 0, "failed": 0, "rejected": 0}
+
+    @property
+    def backlog(self) -> int:
+        return sum(len(jobs) for jobs in self._jobs.values())
+
+    def submit(self, repo: str, **kwargs) -> asyncio.Future:
+        """
+        Queue a create_github_issue call for a repository.
+
+        Args:
+            repo: Repository name (owner/repo format)
+            **kwargs: Arguments for create_github_issue
+
+        Returns:
+            asyncio.Future: Resolves to the create_github_issue result
+
+        Raises:
+            GitHubQueueFullError: If the queue is full
+        """
+        if self.backlog >= self.max_size:
+            self._stats["rejected"] += 1
+            raise GitHubQueueFullError(f"GitHub write queue is full ({self.max_size} writes)")
+
+        future = asyncio.get_running_loop().create_future()
+        self._jobs.setdefault(repo, deque()).append({
+            "kwargs": {**kwargs, "repo_name": repo},
+            "future": future,
+            "attempts": 0,
+            "queued_at": time.monotonic()
+        })
+        GITHUB_QUEUE_DEPTH.set(len(self._jobs[repo]), repo=repo)
+
+        if repo not in self._workers:
+            # A fresh context: queued writes must not inherit the request's deadline
+            self._workers[repo] = asyncio.get_running_loop().create_task(
+                self._run(repo), context=contextvars.Context()
+            )
+
+        return future
+
+    async def _run(self, repo: str) -> None:
+        jobs = self._jobs[repo]
+        try:
+            while jobs:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+                job = jobs[0]
+                job["attempts"] += 1
+                try:
+                    result = await asyncio.to_thread(create_github_issue, **job["kwargs"])
+                except Exception as e:
+                    logger.error(f"Unexpected error in GitHub write queue: {str(e)}")
+                    result = {
+                        "success": False,
+                        "issue_created": False,
+                        "issue_url": None,
+                        "issue_number": None,
+                        "error_details": {
+                            "error_code": "GITHUB_UNEXPECTED_ERROR",
+                            "error_message": str(e),
+                            "service": "github"
+                        }
+                    }
+
+                error_code = (result.get("error_details") or {}).get("error_code")
+                if error_code in RETRYABLE_ERROR_CODES and job["attempts"] < self.max_attempts:
+                    self._stats["retried"] += 1
+                    self._pause(self._retry_delay(result["error_details"], job["attempts"]))
+                    continue
+
+                jobs.popleft()
+                GITHUB_QUEUE_DEPTH.set(len(jobs), repo=repo)
+                self._stats["completed" if result.get("success") else "failed"] += 1
+                if not job["future"].done():
+                    job["future"].set_result(result)
+
+                self._pace()
+        finally:
+            self._workers.pop(repo, None)
+            if not jobs:
+                self._jobs.pop(repo, None)
+
+    def _retry_delay(self, error_details: dict, attempts: int) -> float:
+        """Wait Retry-After or until the reset if GitHub said so, else back off exponentially."""
+        if error_details.get("error_code") == "GITHUB_CIRCUIT_OPEN":
+            return get_settings().circuit_breaker_open_seconds
+
+        retry_after = error_details.get("retry_after")
+        if retry_after is not None:
+            return retry_after
+
+        return min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+
+    def _pause(self, seconds: float) -> None:
+        """Hold every repository's writes; GitHub rate limits are per account."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"GitHub writes paused for {seconds:.0f}s ({self.backlog} queued)")
+
+    def _pace(self) -> None:
+        """Spread the remaining rate limit over the time left until it resets."""
+        remaining, reset_at = get_rate_limit_status()
+        if remaining is None or remaining > self.rate_limit_reserve:
+            return
+
+        until_reset = max(0.0, reset_at - time.time())
+        self._pause(until_reset if remaining <= 0 else until_reset / remaining)
+
+    def snapshot(self) -> dict:
+        """Return the backlog per repository, the current pause and the outcome counters."""
+        now = time.monotonic()
+        return {
+            "backlog": self.backlog,
+            "max_size": self.max_size,
+            "repos": {
+                repo: {
+                    "queued": len(jobs),
+                    "oldest_seconds": round(now - jobs[0]["queued_at"], 1) if jobs else 0.0
+                }
+                for repo, jobs in self._jobs.items()
+            },
+            "paused_for_seconds": round(max(0.0, self._paused_until - now), 1),
+            **self._stats
+        }
+
+    async def close(self) -> None:
+        """Stop the workers; writes still queued are dropped."""
+        if self.backlog:
+            logger.warning(f"Dropping {self.backlog} queued GitHub writes on shutdown")
+        for task in list(self._workers.values()):
+            task.cancel()
+        for task in list(self._workers.values()):
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+def get_github_queue() -> GitHubWriteQueue:
+    """Return the process-wide GitHub write queue."""
+    global _queue
+
+    if _queue is None:
+        settings = get_settings()
+        _queue = GitHubWriteQueue(
+            max_size=settings.github_queue_max_size,
+            max_attempts=settings.github_queue_max_attempts,
+            backoff=settings.github_queue_backoff,
+            max_backoff=settings.github_queue_max_backoff,
+            rate_limit_reserve=settings.github_rate_limit_reserve
+        )
+
+    return _queue
+
+
+async def close_github_queue() -> None:
+    """Stop the process-wide GitHub write queue."""
+    global _queue
+
+    if _queue is not None:
+        await _queue.close()
+    _queue = None
+
+
+async def queue_github_issue(timeout: float, **kwargs) -> dict:
+    """
+    Queue a GitHub issue write and wait up to `timeout` seconds for it.
+
+    Args:
+        timeout: Seconds to wait for the write before reporting it as queued
+        **kwargs: Arguments for create_github_issue
+
+    Returns:
+        dict: The create_github_issue result, or a result with queued=True if
+              the write is still waiting, or a GITHUB_QUEUE_FULL error
+    """
+    repo = kwargs.pop("repo_name", None) or get_settings().github_default_repo
+    if not repo:
+        return await asyncio.to_thread(create_github_issue, **kwargs)
+
+    try:
+        future = get_github_queue().submit(repo, **kwargs)
+    except GitHubQueueFullError as e:
+        logger.warning(str(e))
+        return {
+            "success": False,
+            "issue_created": False,
+            "issue_url": None,
+            "issue_number": None,
+            "error_details": {
+                "error_code": "GITHUB_QUEUE_FULL",
+                "error_message": str(e),
+                "service": "github"
+            }
+        }
+
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.info(f"GitHub issue still queued after {timeout:.1f}s, creating it in the background")
+        return {
+            "success": True,
+            "issue_created": False,
+            "issue_url": None,
+            "issue_number": None,
+            "queued": True,
+            "error_details": None
+        }
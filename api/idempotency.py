@@ -0,0 +1,269 @@
+"""Idempotent replay and in-flight coalescing for /get_support.
+
+Requests are keyed by their Idempotency-Key header or, when the client does
+not send one, by a hash of the request body. A completed response is kept
+for `ttl` seconds and replayed for later duplicates, and duplicates that
+arrive while the first request is still running wait for that same
+pipeline run instead of creating another incident.
+
+The records live in a small SQLite (WAL) database, like the outbox and the
+GitHub issue index, so they survive restarts and are shared by every
+worker process on the host. A key is reserved before its pipeline runs:
+only one caller can insert the reservation, and duplicates in other
+workers poll until it holds a response. A reservation whose holder died
+expires after `lease` seconds.
+
+The run starts in a fresh context, so it shares no timings with the
+requests waiting for it. The request that starts it passes its own time
+budget to the call and waits for the result; duplicates only bound their
+own wait.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Optional, Tuple
+
+from .config import get_settings
+from .deadline import remaining_budget, run_detached, wait_shared
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    result TEXT,
+    stored_at REAL NOT NULL,
+    reserved_until REAL
+);
+CREATE INDEX IF NOT EXISTS idempotency_stored_at ON idempotency (stored_at);
+"""
+
+_store: Optional["IdempotencyStore"] = None
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when an idempotency key is reused for a different request."""
+
+
+def request_fingerprint(body: str) -> str:
+    """Return a stable hash of a serialized request body."""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """SQLite-backed TTL store of completed responses plus the requests still in flight."""
+
+    def __init__(self, path: str, ttl: float, max_entries: int, lease: float = 300.0, poll_interval: float = 0.05):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        # Runs started by this process, so local duplicates share the result without polling
+        self._inflight = {}
+        self._stats = {"replayed": 0, "coalesced": 0, "executed": 0}
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        call: Callable[[], Awaitable],
+        should_store: Callable[[object], bool] = lambda result: True,
+        encode: Callable[[object], str] = json.dumps,
+        decode: Callable[[str], object] = json.loads
+    ) -> Tuple[object, bool]:
+        """
+        Run `call` once per key, replaying or sharing its result for duplicates.
+
+        Args:
+            key: Idempotency key of the request
+            fingerprint: Hash of the request body, used to detect key reuse
+            call: Coroutine function running the pipeline
+            should_store: Decides whether a result is kept for replay; results
+                          it rejects are only shared with in-flight duplicates
+                          in the same process
+            encode: Serializes a result for the database
+            decode: Rebuilds a result stored by `encode`
+
+        Returns:
+            tuple: (result, replayed) where replayed is True if the pipeline
+                   did not run for this caller
+
+        Raises:
+            IdempotencyConflictError: If the key was used for a different request
+            asyncio.TimeoutError: If a duplicate's deadline passes before the
+                                  in-flight run finishes; the run goes on and
+                                  its result is kept for a retry
+        """
+        while True:
+            row = self._claim(key, fingerprint)
+            if row is None:
+                break
+
+            self._check_fingerprint(key, row["fingerprint"], fingerprint)
+            if row["result"] is not None:
+                self._stats["replayed"] += 1
+                return decode(row["result"]), True
+
+            self._stats["coalesced"] += 1
+            task = self._inflight.get(key)
+            if task is not None:
+                return await wait_shared(task), True
+
+            # Another worker is running the pipeline; a reservation it gives
+            # up or lets expire is claimed again on the next pass
+            row = await asyncio.wait_for(self._wait_for_result(key), timeout=remaining_budget())
+            if row is not None and row["result"] is not None:
+                return decode(row["result"]), True
+
+        self._stats["executed"] += 1
+        task = run_detached(self._execute(key, call, should_store, encode))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._inflight.pop(key, None))
+        # `call` is bounded by this caller's own deadline, so the caller waits
+        # for its result instead of giving up on work that has been done
+        return await asyncio.shield(task), False
+
+    def stats(self) -> dict:
+        """Return this process's replay counters and the stored and in-flight keys of all workers."""
+        with self._lock:
+            stored, inflight = self._conn.execute(
+                "SELECT COUNT(result), COUNT(*) - COUNT(result) FROM idempotency"
+            ).fetchone()
+        return {**self._stats, "stored": stored, "inflight": inflight}
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _claim(self, key: str, fingerprint: str) -> Optional[sqlite3.Row]:
+        """Reserve `key` for this caller and return None, or return its existing row."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM idempotency WHERE key = ? "
+                    "AND ((result IS NOT NULL AND stored_at < ?) OR reserved_until < ?)",
+                    (key, now - self.ttl, now)
+                )
+                cursor = self._conn.execute(
+                    "INSERT INTO idempotency (key, fingerprint, result, stored_at, reserved_until) "
+                    "VALUES (?, ?, NULL, ?, ?) ON CONFLICT (key) DO NOTHING",
+                    (key, fingerprint, now, now + self.lease)
+                )
+                row = self._select(key) if cursor.rowcount == 0 else None
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return row
+
+    async def _wait_for_result(self, key: str) -> Optional[sqlite3.Row]:
+        """Poll until another worker's reservation holds a result, is released or expires."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            with self._lock:
+                row = self._select(key)
+            if row is None or row["result"] is not None or row["reserved_until"] < time.time():
+                return row
+
+    async def _execute(
+        self,
+        key: str,
+        call: Callable[[], Awaitable],
+        should_store: Callable[[object], bool],
+        encode: Callable[[object], str]
+    ):
+        try:
+            result = await call()
+        except Exception:
+            self._release(key)
+            raise
+
+        if should_store(result):
+            self._store_result(key, encode(result))
+        else:
+            self._release(key)
+
+        return result
+
+    def _store_result(self, key: str, result: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE idempotency SET result = ?, stored_at = ?, reserved_until = NULL WHERE key = ?",
+                    (result, now, key)
+                )
+                # Drop expired responses, then the oldest ones beyond max_entries
+                self._conn.execute(
+                    "DELETE FROM idempotency WHERE result IS NOT NULL AND stored_at < ?",
+                    (now - self.ttl,)
+                )
+                self._conn.execute(
+                    "DELETE FROM idempotency WHERE key IN (SELECT key FROM idempotency "
+                    "WHERE result IS NOT NULL ORDER BY stored_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM idempotency WHERE key = ? AND result IS NULL", (key,))
+
+    def _select(self, key: str) -> Optional[sqlite3.Row]:
+        return self._conn.execute(
+            "SELECT fingerprint, result, reserved_until FROM idempotency WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+    @staticmethod
+    def _check_fingerprint(key: str, expected: str, actual: str) -> None:
+        if expected != actual:
+            logger.warning(f"Idempotency key {key} reused with a different request")
+            raise IdempotencyConflictError("Idempotency key was already used for a different request")
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Return the process-wide idempotency store, opening it on first use."""
+    global _store
+
+    if _store is None:
+        settings = get_settings()
+        _store = IdempotencyStore(
+            settings.idempotency_path,
+            ttl=settings.idempotency_ttl,
+            max_entries=settings.idempotency_max_entries,
+            lease=settings.idempotency_lease
+        )
+
+    return _store
+
+
+def close_idempotency_store() -> None:
+    """Close the process-wide idempotency store."""
+    global _store
+
+    if _store is not None:
+        _store.close()
+    _store = None
@@ -0,0 +1,237 @@
+"""Local index from stack-trace fingerprint to the GitHub issue tracking it.
+
+When many customers report the same crash, create_github_issue looks the
+trace's fingerprint up here and updates the existing issue instead of
+opening a new one. The index lives in a small SQLite (WAL) database so it
+survives restarts and is shared by every worker process on the host.
+
+A new fingerprint is reserved before its issue is created: claim() inserts
+a placeholder row (issue number 0) that only one caller can win. Callers
+that lose wait for the winner's issue and update it, so concurrent reports
+of a new crash open one issue even across processes. A reservation whose
+holder died expires after `reservation_ttl` seconds.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .config import get_settings
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issue_index (
+    repo TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    issue_number INTEGER NOT NULL,
+    issue_url TEXT NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    reported_occurrences INTEGER NOT NULL DEFAULT 1,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_commented_at REAL NOT NULL,
+    reserved_until REAL,
+    PRIMARY KEY (repo, fingerprint)
+);
+"""
+
+_index: Optional["IssueIndex"] = None
+
+
+class IssueIndex:
+    """SQLite-backed map from (repository, fingerprint) to a GitHub issue."""
+
+    def __init__(self, path: str, ttl: float, reservation_ttl: float = 60.0, poll_interval: float = 0.2):
+        self.path = path
+        self.ttl = ttl
+        self.reservation_ttl = reservation_ttl
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # Indexes created before issues were reserved lack the column
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(issue_index)")}
+        if "reserved_until" not in columns:
+            self._conn.execute("ALTER TABLE issue_index ADD COLUMN reserved_until REAL")
+
+    def claim(self, repo: str, fingerprint: str, now: Optional[float] = None) -> Optional[dict]:
+        """
+        Reserve a fingerprint for a new issue, or count one more occurrence of it.
+
+        Entries whose last occurrence is older than the TTL are treated as
+        absent, so a crash that comes back long after being fixed gets a
+        fresh issue.
+
+        Args:
+            repo: Repository name (owner/repo format)
+            fingerprint: Stack-trace fingerprint
+            now: Current time, defaults to time.time()
+
+        Returns:
+            dict: The issue number, URL, occurrence counts and last comment
+                  time. The issue number is 0 while another caller is still
+                  creating the issue. None means this caller reserved the
+                  fingerprint and must call record_issue() or release().
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM issue_index WHERE repo = ? AND fingerprint = ? "
+                    "AND (last_seen < ? OR reserved_until < ?)",
+                    (repo, fingerprint, now - self.ttl, now)
+                )
+                cursor = self._conn.execute(
+                    "INSERT INTO issue_index "
+                    "(repo, fingerprint, issue_number, issue_url, occurrences, reported_occurrences, "
+                    "first_seen, last_seen, last_commented_at, reserved_until) "
+                    "VALUES (?, ?, 0, '', 1, 1, ?, ?, ?, ?) ON CONFLICT (repo, fingerprint) DO NOTHING",
+                    (repo, fingerprint, now, now, now, now + self.reservation_ttl)
+                )
+                row = None
+                if cursor.rowcount == 0:
+                    self._conn.execute(
+                        "UPDATE issue_index SET occurrences = occurrences + 1, last_seen = ? "
+                        "WHERE repo = ? AND fingerprint = ?",
+                        (now, repo, fingerprint)
+                    )
+                    row = self._select(repo, fingerprint)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return dict(row) if row is not None else None
+
+    def wait_for_issue(self, repo: str, fingerprint: str) -> Optional[dict]:
+        """
+        Wait until another caller's reservation of a fingerprint becomes an issue.
+
+        Blocks the calling thread, polling every `poll_interval` seconds.
+
+        Returns:
+            dict: The entry as returned by claim(), or None if the reservation
+                  was released or expired without an issue being created
+        """
+        while True:
+            with self._lock:
+                row = self._select(repo, fingerprint)
+            if row is None or row["issue_number"]:
+                return dict(row) if row is not None else None
+            if row["reserved_until"] is None or row["reserved_until"] < time.time():
+                return None
+            time.sleep(self.poll_interval)
+
+    def record_issue(self, repo: str, fingerprint: str, issue_number: int, issue_url: str) -> None:
+        """Point a reserved fingerprint at its newly created issue."""
+        now = time.time()
+        with self._lock:
+            # Occurrences counted while the issue was being created are kept
+            self._conn.execute(
+                "INSERT INTO issue_index "
+                "(repo, fingerprint, issue_number, issue_url, occurrences, reported_occurrences, "
+                "first_seen, last_seen, last_commented_at, reserved_until) "
+                "VALUES (?, ?, ?, ?, 1, 1, ?, ?, ?, NULL) ON CONFLICT (repo, fingerprint) DO UPDATE SET "
+                "issue_number = excluded.issue_number, issue_url = excluded.issue_url, "
+                "reported_occurrences = 1, last_commented_at = excluded.last_commented_at, reserved_until = NULL",
+                (repo, fingerprint, issue_number, issue_url, now, now, now)
+            )
+
+    def release(self, repo: str, fingerprint: str) -> None:
+        """Give up a reservation whose issue could not be created."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM issue_index WHERE repo = ? AND fingerprint = ? AND issue_number = 0",
+                (repo, fingerprint)
+            )
+
+    def claim_comment(self, repo: str, fingerprint: str, interval: float, now: Optional[float] = None) -> Optional[dict]:
+        """
+        Take the right to comment on a fingerprint's issue, at most once per `interval`.
+
+        The comment time is moved forward in the same transaction that
+        checks it, so concurrent repeats in any worker post one comment.
+
+        Args:
+            repo: Repository name (owner/repo format)
+            fingerprint: Stack-trace fingerprint
+            interval: Minimum seconds between comments
+            now: Current time, defaults to time.time()
+
+        Returns:
+            dict: The entry as returned by claim(), or None if the issue was
+                  commented on less than `interval` seconds ago
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._select(repo, fingerprint)
+                if row is not None and row["issue_number"] and now - row["last_commented_at"] >= interval:
+                    self._conn.execute(
+                        "UPDATE issue_index SET last_commented_at = ? WHERE repo = ? AND fingerprint = ?",
+                        (now, repo, fingerprint)
+                    )
+                else:
+                    row = None
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return dict(row) if row is not None else None
+
+    def record_comment(self, repo: str, fingerprint: str, reported_occurrences: int) -> None:
+        """Remember that the issue was updated with the occurrence count so far."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE issue_index SET reported_occurrences = ?, last_commented_at = ? "
+                "WHERE repo = ? AND fingerprint = ?",
+                (reported_occurrences, time.time(), repo, fingerprint)
+            )
+
+    def forget(self, repo: str, fingerprint: str) -> None:
+        """Drop a fingerprint, e.g. because its issue was deleted."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM issue_index WHERE repo = ? AND fingerprint = ?",
+                (repo, fingerprint)
+            )
+
+    def _select(self, repo: str, fingerprint: str) -> Optional[sqlite3.Row]:
+        return self._conn.execute(
+            "SELECT issue_number, issue_url, occurrences, reported_occurrences, last_commented_at, reserved_until "
+            "FROM issue_index WHERE repo = ? AND fingerprint = ?",
+            (repo, fingerprint)
+        ).fetchone()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_issue_index() -> IssueIndex:
+    """Return the process-wide issue index, opening it on first use."""
+    global _index
+
+    if _index is None:
+        settings = get_settings()
+        _index = IssueIndex(settings.github_issue_index_path, ttl=settings.github_fingerprint_ttl)
+
+    return _index
+
+
+def close_issue_index() -> None:
+    """Close the process-wide issue index."""
+    global _index
+
+    if _index is not None:
+        _index.close()
+    _index = None
@@ -1,23 +1,58 @@
 """TechNova Support API - FastAPI Application."""
 
+import asyncio
 import logging
-from fastapi import FastAPI, HTTPException, Depends, Security
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request, Response, Security
+from fastapi.responses import PlainTextResponse
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 
-from typing import Optional
+from typing import List, Optional
 
 from .config import get_settings, Settings
 from .models import SupportRequest, SupportResponse
+from .cache import get_reference_cache
 from .servicenow_client import (
+    close_servicenow_client,
     create_service_now_incident,
-    get_assignment_groups,
-    get_categories,
-    get_impacts,
-    get_urgencies
+    create_service_now_incidents,
+    get_assignment_groups
 )
-from .slack_client import send_slack_message
-from .github_client import create_github_issue
+from .slack_client import (
+    close_slack_client,
+    get_incident_digest,
+    get_slack_stats,
+    normalize_channel,
+    send_slack_incident_list,
+    send_slack_message,
+    start_channel_directory
+)
+from .github_client import contains_stack_trace, create_github_issue
+from .github_queue import close_github_queue, get_github_queue, queue_github_issue
+from .routing import ASSIGNMENT_GROUP_SLACK_CHANNELS, get_routing_index, reload_routing_index
+from .circuit_breaker import get_circuit_breaker, get_circuit_breaker_states
+from .deadline import budget_timeout, remaining_budget, set_deadline
+from .issue_index import close_issue_index
+from .static_responses import build_static_responses, get_static_response
+from .startup import get_prewarm_status, mark_ready, prewarm
+from .metrics import (
+    REQUEST_DURATION,
+    REQUESTS_IN_FLIGHT,
+    add_stage_time,
+    format_server_timing,
+    get_request_timings,
+    record_error,
+    render_metrics,
+    render_worker_metrics,
+    run_metrics_publisher,
+    start_request_timings,
+    time_stage
+)
+from .idempotency import IdempotencyConflictError, close_idempotency_store, get_idempotency_store, request_fingerprint
+from .shared_state import get_shared_store, get_worker_index
+from .outbox import STATUS_PENDING, close_outbox, get_outbox, run_outbox_worker
 
 # Configure logging
 logging.basicConfig(
@@ -30,10 +65,13 @@ logger = logging.getLogger(__name__)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
-def verify_api_key(api_key: str = Security(api_key_header)) -> str:
+async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
     """
     Verify the API key provided in the X-API-Key header.
     
+    Async so that the check runs on the event loop rather than a
+    threadpool worker.
+    
     Args:
         api_key: The API key from the request header
         
@@ -43,6 +81,12 @@ def verify_api_key(api_key: str = Security(api_key_header)) -> str:
     Raises:
         HTTPException: If API key is missing or invalid
     """
+    with time_stage("auth"):
+        return check_api_key(api_key)
+
+
+def check_api_key(api_key: Optional[str]) -> str:
+    """Validate an API key against the configured key."""
     settings = get_settings()
     
     # If no API key is configured, allow all requests (development mode)
@@ -67,41 +111,6 @@ def verify_api_key(api_key: str = Security(api_key_header)) -> str:
     return api_key
 
 
-# Assignment Group to Slack Channel Mapping
-ASSIGNMENT_GROUP_SLACK_CHANNELS = {
-    # CLOUD - Cloud Infrastructure Services
-    "CLOUD": "#cloud-support",
-    
-    # DATA - Data & Analytics
-    "DATA": "#data-support",
-    
-    # SECURITY - Cybersecurity Operations
-    "SEC": "#security-incidents",
-    
-    # COLLAB - Collaboration & Productivity
-    "COLLAB": "#collab-support",
-    
-    # FINTECH - Financial Technology
-    "FIN": "#fintech-support",
-    
-    # DEVTOOLS - Developer Tools & Platforms
-    "DEVTOOLS": "#devtools-support",
-    "DEV": "#devtools-support",
-    
-    # ITSM - IT Service Management
-    "ITSM": "#itsm-support",
-    
-    # ERP - Enterprise Resource Planning
-    "ERP": "#erp-support",
-    
-    # IOT - IoT & Industrial
-    "IOT": "#iot-support",
-    
-    # General/Fallback
-    "GENERAL": "#general-support",
-}
-
-
 def get_slack_channel_for_assignment_group(assignment_group: str) -> Optional[str]:
     """
     Get the appropriate Slack channel for a given assignment group.
@@ -115,20 +124,70 @@ def get_slack_channel_for_assignment_group(assignment_group: str) -> Optional[st
     if not assignment_group:
         return None
     
-    # Extract the prefix from the assignment group (e.g., "CLOUD" from "CLOUD-L1-Support")
-    assignment_group_upper = assignment_group.upper()
-    
-    # Check each prefix
-    for prefix, channel in ASSIGNMENT_GROUP_SLACK_CHANNELS.items():
-        if assignment_group_upper.startswith(prefix):
-            return channel
-    
-    # Return None to use default channel from .env
-    return None
+    # Longest matching prefix wins; None falls back to the default channel from .env
+    return get_routing_index().resolve(assignment_group)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers and release shared resources on shutdown."""
+    settings = get_settings()
+    background_tasks = []
+    
+    # Encode the constant reference payloads once
+    build_static_responses()
+    
+    if settings.delivery_mode == "outbox":
+        background_tasks.append(asyncio.create_task(
+            run_outbox_worker(get_outbox(), deliver_outbox_item, batch_size=settings.outbox_batch_size)
+        ))
+    
+    # Resolve Slack channel IDs and create routed channels in the background;
+    # until then messages post by channel name
+    routed_channels = set(get_routing_index().routes.values()) | {settings.slack_default_channel}
+    directory_refresher = start_channel_directory(routed_channels)
+    if directory_refresher is not None:
+        background_tasks.append(directory_refresher)
+    
+    # Share this worker's metrics, so any worker's /metrics reports all of them
+    store = get_shared_store()
+    if store is not None:
+        background_tasks.append(asyncio.create_task(
+            run_metrics_publisher(store, get_worker_index(), settings.metrics_publish_interval)
+        ))
+    
+    # Pay the first request's cold-start costs before /ready passes
+    if settings.startup_prewarm:
+        background_tasks.append(asyncio.create_task(prewarm(app, settings.startup_prewarm_timeout)))
+    else:
+        mark_ready()
+    
+    yield
+    
+    for task in background_tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    if settings.delivery_mode == "outbox":
+        close_outbox()
+    
+    # Post incidents still held for a Slack digest before the client goes away
+    await get_incident_digest().flush()
+    await close_github_queue()
+    
+    await close_servicenow_client()
+    await close_slack_client()
+    close_issue_index()
+    close_idempotency_store()
+
 
 # Initialize FastAPI app
 settings = get_settings()
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.api_title,
     version=settings.api_version,
     description=settings.api_description,
@@ -143,6 +202,24 @@ app = FastAPI(
 # Define OpenAPI security scheme for documentation
 app.openapi_schema = None  # Reset to allow customization
 
+API_KEY_ERROR_RESPONSES = {
+    status: {
+        "description": description,
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"detail": {"type": "string", "example": example}}
+                }
+            }
+        }
+    }
+    for status, description, example in (
+        ("401", "Missing API Key", "Missing API Key. Include 'X-API-Key' header in your request."),
+        ("403", "Invalid API Key", "Invalid API Key")
+    )
+}
+
 def custom_openapi():
     """Generate custom OpenAPI schema with API key security."""
     if app.openapi_schema:
@@ -168,12 +245,13 @@ def custom_openapi():
         }
     }
     
-    # Apply security globally to all endpoints except health
+    # Apply security globally to all endpoints except the probes and metrics
     for path, methods in openapi_schema["paths"].items():
-        if path != "/health":
+        if path not in ("/health", "/ready", "/metrics"):
             for method in methods.values():
                 if isinstance(method, dict):
                     method["security"] = [{"ApiKeyAuth": []}]
+                    method["responses"].update(API_KEY_ERROR_RESPONSES)
     
     app.openapi_schema = openapi_schema
     return app.openapi_schema
@@ -190,138 +268,702 @@ app.add_middleware(
 )
 
 
+def get_request_budget(request: Request) -> float:
+    """Return the time budget for a request: X-Request-Timeout if valid, else REQUEST_TIMEOUT."""
+    header = request.headers.get("X-Request-Timeout")
+    if header:
+        try:
+            budget = float(header)
+            if budget > 0:
+                return min(budget, settings.request_timeout_max)
+        except ValueError:
+            pass
+        logger.warning(f"Ignoring invalid X-Request-Timeout header: {header}")
+    
+    return settings.request_timeout
+
+
+@app.middleware("http")
+async def track_request_metrics(request: Request, call_next):
+    """Record request metrics and report per-stage durations in a Server-Timing header."""
+    REQUESTS_IN_FLIGHT.inc()
+    timings = start_request_timings()
+    set_deadline(get_request_budget(request))
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["Server-Timing"] = format_server_timing(
+            timings, total=(time.perf_counter() - start) * 1000
+        )
+        response.headers["Timing-Allow-Origin"] = "*"
+        return response
+    finally:
+        REQUESTS_IN_FLIGHT.dec()
+        # Label by route template so /deliveries/{incident_number} is one series
+        route = request.scope.get("route")
+        REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            endpoint=getattr(route, "path", "unmatched"),
+            status=str(status)
+        )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "version": settings.api_version}
 
 
-@app.post("/get_support", response_model=SupportResponse)
-async def get_support(
-    request: SupportRequest,
-    api_key: str = Depends(verify_api_key)
-) -> SupportResponse:
+@app.get("/ready")
+async def readiness_check(response: Response):
     """
-    Create a support incident in ServiceNow and send a Slack notification.
+    Readiness probe.
     
-    This endpoint:
-    1. Creates a new incident in ServiceNow with the provided details
-    2. Sends a notification to the configured Slack channel
-    3. Returns the incident details and status
+    Returns 503 until start-up pre-warming has finished, so new pods only
+    receive traffic once the first request no longer pays cold-start costs.
+    """
+    prewarm_status = get_prewarm_status()
+    if not prewarm_status["ready"]:
+        response.status_code = 503
+    return {"status": "ready" if prewarm_status["ready"] else "warming", "prewarm": prewarm_status}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics for the incident pipeline.
+    
+    Exposes request and per-downstream latency histograms, in-flight gauges,
+    stack trace detection time and error counters by error_code. Under the
+    multi-worker server the values are summed over all workers, using the
+    snapshots the other workers published in the last few seconds.
+    """
+    store = get_shared_store()
+    body = render_worker_metrics(store, get_worker_index()) if store is not None else render_metrics()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+async def run_with_timeout(service: str, call, timeout: float) -> dict:
+    """
+    Await a downstream call, turning a timeout into an error result.
+    
+    The timeout is capped to what is left of the request's time budget.
     
     Args:
-        request: SupportRequest containing incident details
+        service: Downstream service name (e.g., "slack", "github")
+        call: Awaitable returning the client's result dict
+        timeout: Seconds to wait before giving up on this branch
         
     Returns:
-        SupportResponse with incident number and status
+        dict: The client's result, or a failed result with timeout error details
     """
-    logger.info(f"Received support request: {request.short_description}")
+    timeout = budget_timeout(timeout)
+    try:
+        return await asyncio.wait_for(call, timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"{service} call timed out after {timeout:.1f}s")
+        return {
+            "success": False,
+            "error_details": {
+                "error_code": f"{service.upper()}_TIMEOUT",
+                "error_message": f"{service} call timed out after {timeout:.1f}s",
+                "service": service
+            }
+        }
+
+
+def skip_optional_call(service: str) -> Optional[dict]:
+    """
+    Decide whether an optional side effect should be skipped right away.
     
-    # Step 1: Create the ServiceNow incident
-    snow_result = create_service_now_incident(request)
+    Slack and GitHub are skipped while their circuit breaker is open, and
+    when less than DEADLINE_OPTIONAL_MIN_SECONDS of the request's time budget
+    is left - the caller would give up before they finish.
     
-    if not snow_result["success"]:
-        logger.error(f"Failed to create ServiceNow incident: {snow_result['error_details']}")
-        return SupportResponse(
-            success=False,
-            incident_number=None,
-            incident_sys_id=None,
-            slack_message_sent=False,
-            error_details=snow_result["error_details"]
-        )
+    Args:
+        service: Downstream service name ("slack" or "github")
+        
+    Returns:
+        dict: A failed result with error details, or None to go ahead
+    """
+    remaining = remaining_budget()
+    
+    if get_circuit_breaker(service).rejecting:
+        error_code = f"{service.upper()}_CIRCUIT_OPEN"
+        error_message = f"{service} circuit breaker is open"
+    elif remaining is not None and remaining < settings.deadline_optional_min_seconds:
+        error_code = f"{service.upper()}_DEADLINE_EXCEEDED"
+        error_message = f"Only {max(remaining, 0):.1f}s of the request deadline left, not calling {service}"
+    else:
+        return None
     
-    # Step 2: Send Slack notification to the appropriate channel based on assignment group
+    logger.warning(f"Skipping {service} call: {error_message}")
+    error_details = {"error_code": error_code, "error_message": error_message, "service": service}
+    record_error(error_details)
+    return {"success": False, "error_details": error_details}
+
+
+async def notify_slack(request: SupportRequest, incident_number: str, hold_for_digest: bool = True) -> dict:
+    """
+    Send the Slack notification for a newly created incident.
+    
+    Args:
+        request: The support request
+        incident_number: The ServiceNow incident number
+        hold_for_digest: Whether the incident may be held for a digest
+                         (SLACK_DIGEST_MODE) instead of posted now
+        
+    Returns:
+        dict: The Slack result, with the channel it was sent to
+    """
     slack_channel = get_slack_channel_for_assignment_group(request.assignment_group)
+    
+    # Slack is optional; do not wait on it while it is failing or out of time
+    slack_result = skip_optional_call("slack")
+    if slack_result is not None:
+        slack_result["channel"] = slack_channel or settings.slack_default_channel
+        return slack_result
+    
     logger.info(f"Sending Slack notification to channel: {slack_channel or 'default'}")
     
-    slack_result = send_slack_message(
-        channel=slack_channel,
-        incident_number=snow_result["incident_number"],
-        short_description=request.short_description,
-        description=request.description,
-        assignment_group=request.assignment_group,
-        urgency=request.urgency_value,
-        impact=request.impact_value,
-        caller=request.caller_username
+    slack_result = await run_with_timeout(
+        "slack",
+        send_slack_message(
+            channel=slack_channel,
+            incident_number=incident_number,
+            short_description=request.short_description,
+            description=request.description,
+            assignment_group=request.assignment_group,
+            urgency=request.urgency_value,
+            impact=request.impact_value,
+            caller=request.caller_username,
+            hold_for_digest=hold_for_digest
+        ),
+        settings.slack_timeout
     )
+    slack_result.setdefault("channel", slack_channel or settings.slack_default_channel)
     
     if not slack_result["success"]:
         logger.warning(f"Failed to send Slack message: {slack_result['error_details']}")
+        record_error(slack_result["error_details"])
         # Note: We still return success=True since the incident was created
     
-    # Step 3: Create GitHub issue if stack trace detected in description
+    return slack_result
+
+
+async def open_github_issue(request: SupportRequest, incident_number: str) -> dict:
+    """Create a GitHub issue if a stack trace is detected in the description."""
     github_result = {"success": True, "issue_created": False, "issue_url": None, "issue_number": None}
-    if request.description:
-        github_result = create_github_issue(
+    if not request.description or not contains_stack_trace(request.description):
+        return github_result
+    
+    # GitHub is optional; do not wait on it while it is failing or out of time
+    skipped_result = skip_optional_call("github")
+    if skipped_result is not None:
+        return skipped_result
+    
+    # Issue writes are queued and paced; past the timeout the issue is
+    # still created, in the background
+    with time_stage("github"):
+        github_result = await queue_github_issue(
+            budget_timeout(settings.github_timeout),
             error_message=request.description,
-            incident_number=snow_result["incident_number"],
+            incident_number=incident_number,
             short_description=request.short_description,
             caller_username=request.caller_username
         )
-        if github_result.get("issue_created"):
-            logger.info(f"GitHub issue created: {github_result['issue_url']}")
-        elif github_result.get("error_details"):
-            logger.warning(f"Failed to create GitHub issue: {github_result['error_details']}")
     
+    if github_result.get("issue_created"):
+        logger.info(f"GitHub issue created: {github_result['issue_url']}")
+    elif github_result.get("error_details"):
+        logger.warning(f"Failed to create GitHub issue: {github_result['error_details']}")
+        record_error(github_result["error_details"])
+    
+    return github_result
+
+
+async def deliver_outbox_item(kind: str, payload: dict) -> dict:
+    """Deliver a side effect queued in the outbox."""
+    request = SupportRequest(**payload["request"])
+    
+    if kind == "slack":
+        # A digest only holds the incident in memory, so the item would be
+        # marked delivered before its message exists and lost on a restart
+        return await notify_slack(request, payload["incident_number"], hold_for_digest=False)
+    if kind == "github":
+        # Bypass the write queue: a write still queued when the wait times out
+        # would be reported as delivered and lost with the process. The outbox
+        # already retries with backoff, and the issue index de-duplicates.
+        if not request.description or not contains_stack_trace(request.description):
+            return {"success": True, "issue_created": False, "issue_url": None, "issue_number": None}
+        return await asyncio.to_thread(
+            create_github_issue,
+            error_message=request.description,
+            incident_number=payload["incident_number"],
+            short_description=request.short_description,
+            caller_username=request.caller_username
+        )
+    
+    raise ValueError(f"Unknown outbox item kind: {kind}")
+
+
+def enqueue_side_effects(request: SupportRequest, incident_number: str) -> dict:
+    """
+    Queue the Slack notification and GitHub issue for background delivery.
+    
+    Returns:
+        dict: Maps each queued side effect kind to its delivery status
+    """
+    outbox = get_outbox()
+    payload = {"incident_number": incident_number, "request": request.model_dump()}
+    
+    statuses = {}
+    outbox.enqueue(incident_number, "slack", payload)
+    statuses["slack"] = STATUS_PENDING
+    
+    # Only queue GitHub work that would actually open an issue
+    if request.description and contains_stack_trace(request.description):
+        outbox.enqueue(incident_number, "github", payload)
+        statuses["github"] = STATUS_PENDING
+    
+    return statuses
+
+
+async def notify_slack_grouped(created: list) -> list:
+    """
+    Notify Slack about several new incidents with one message per channel.
+    
+    Args:
+        created: List of (SupportRequest, incident_number) tuples
+        
+    Returns:
+        list: The Slack result for each incident, in order
+    """
+    channels = {}
+    for index, (request, _) in enumerate(created):
+        channel = normalize_channel(get_slack_channel_for_assignment_group(request.assignment_group))
+        channels.setdefault(channel, []).append(index)
+    
+    async def notify_channel(channel: str, indexes: list) -> dict:
+        # A lone incident still gets the full single-incident message
+        if len(indexes) == 1:
+            request, incident_number = created[indexes[0]]
+            return await notify_slack(request, incident_number)
+        
+        incidents = [
+            {
+                "incident_number": created[index][1],
+                "short_description": created[index][0].short_description,
+                "assignment_group": created[index][0].assignment_group,
+                "urgency": created[index][0].urgency_value
+            }
+            for index in indexes
+        ]
+        slack_result = skip_optional_call("slack")
+        if slack_result is not None:
+            slack_result["channel"] = channel
+            return slack_result
+        
+        logger.info(f"Sending one Slack message for {len(incidents)} incidents to {channel}")
+        slack_result = await run_with_timeout("slack", send_slack_incident_list(channel, incidents), settings.slack_timeout)
+        slack_result.setdefault("channel", channel)
+        
+        if not slack_result["success"]:
+            logger.warning(f"Failed to send Slack message: {slack_result['error_details']}")
+            record_error(slack_result["error_details"])
+        
+        return slack_result
+    
+    channel_results = await asyncio.gather(
+        *(notify_channel(channel, indexes) for channel, indexes in channels.items())
+    )
+    
+    results = [None] * len(created)
+    for indexes, slack_result in zip(channels.values(), channel_results):
+        for index in indexes:
+            results[index] = slack_result
+    
+    return results
+
+
+def build_support_response(snow_result: dict, slack_result: dict, github_result: dict) -> SupportResponse:
+    """Merge the ServiceNow, Slack and GitHub results into a SupportResponse."""
     return SupportResponse(
         success=True,
         incident_number=snow_result["incident_number"],
         incident_sys_id=snow_result["incident_sys_id"],
-        slack_message_sent=slack_result["success"],
+        slack_message_sent=slack_result["success"] and not slack_result.get("digest"),
         slack_channel=slack_result.get("channel"),
         github_issue_created=github_result.get("issue_created", False),
         github_issue_url=github_result.get("issue_url"),
         github_issue_number=github_result.get("issue_number"),
+        slack_delivery_status="digest" if slack_result.get("digest") else None,
+        github_delivery_status="queued" if github_result.get("queued") else None,
         error_details=slack_result.get("error_details") if not slack_result["success"] else github_result.get("error_details")
     )
 
 
+def build_failed_response(snow_result: dict) -> SupportResponse:
+    """Build the SupportResponse for an incident ServiceNow failed to create."""
+    logger.error(f"Failed to create ServiceNow incident: {snow_result['error_details']}")
+    return SupportResponse(
+        success=False,
+        incident_number=None,
+        incident_sys_id=None,
+        slack_message_sent=False,
+        error_details=snow_result["error_details"]
+    )
+
+
+def build_queued_response(snow_result: dict, statuses: dict) -> SupportResponse:
+    """Build the SupportResponse for an incident whose side effects were queued in the outbox."""
+    return SupportResponse(
+        success=True,
+        incident_number=snow_result["incident_number"],
+        incident_sys_id=snow_result["incident_sys_id"],
+        slack_delivery_status=statuses.get("slack"),
+        github_delivery_status=statuses.get("github")
+    )
+
+
+async def run_support_pipeline(request: SupportRequest, budget: Optional[float]) -> SupportResponse:
+    """
+    Process a support request and attach the per-stage timings to its response.
+    
+    The run is shared with duplicate requests and starts in a fresh context,
+    so it gets its own timings. It keeps the budget of the request that
+    started it: every downstream call is capped to it, and once it runs out
+    Slack and GitHub are skipped or cut short while the incident is still
+    returned.
+    
+    Args:
+        request: The support request
+        budget: Seconds left of the starting request's budget, None for no deadline
+    """
+    set_deadline(budget)
+    start_request_timings()
+    support_response = await process_support_request(request)
+    support_response.timings = get_request_timings()
+    return support_response
+
+
+async def process_support_request(request: SupportRequest) -> SupportResponse:
+    """Create the ServiceNow incident and deliver its Slack and GitHub side effects."""
+    # Step 1: Create the ServiceNow incident
+    snow_result = await create_service_now_incident(request)
+    
+    if not snow_result["success"]:
+        record_error(snow_result["error_details"])
+        return build_failed_response(snow_result)
+    
+    # In outbox mode, persist the side effects and return right away
+    if settings.delivery_mode == "outbox":
+        statuses = enqueue_side_effects(request, snow_result["incident_number"])
+        return build_queued_response(snow_result, statuses)
+    
+    # Step 2: Notify Slack and open a GitHub issue concurrently - neither
+    # depends on the other once the incident number exists
+    slack_result, github_result = await asyncio.gather(
+        notify_slack(request, snow_result["incident_number"]),
+        open_github_issue(request, snow_result["incident_number"])
+    )
+    
+    return build_support_response(snow_result, slack_result, github_result)
+
+
+@app.post("/get_support", response_model=SupportResponse)
+async def get_support(
+    request: SupportRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        default=None,
+        alias="Idempotency-Key",
+        description="Client-chosen key; retries with the same key replay the first response"
+    ),
+    api_key: str = Depends(verify_api_key)
+) -> SupportResponse:
+    """
+    Create a support incident in ServiceNow and send a Slack notification.
+    
+    This endpoint:
+    1. Creates a new incident in ServiceNow with the provided details
+    2. Sends a notification to the configured Slack channel and, if the
+       description contains a stack trace, opens a GitHub issue - concurrently
+    3. Returns the incident details and status
+    
+    Duplicate requests - the same Idempotency-Key, or the same body when no
+    key is sent - get the first request's response instead of creating
+    another incident. Replayed responses carry an Idempotent-Replayed header.
+    The pipeline runs within this request's budget (X-Request-Timeout), so
+    once ServiceNow has created the incident the response reports it, even
+    if Slack or GitHub had to be skipped. A duplicate waiting for an
+    in-flight pipeline gets a 504 if its own budget runs out first; the
+    pipeline finishes and a retry replays its response.
+    
+    Args:
+        request: SupportRequest containing incident details
+        idempotency_key: Optional Idempotency-Key header
+        
+    Returns:
+        SupportResponse with incident number and status
+    """
+    logger.info(f"Received support request: {request.short_description}")
+    
+    fingerprint = request_fingerprint(request.model_dump_json())
+    key = f"key:{idempotency_key}" if idempotency_key else f"body:{fingerprint}"
+    budget = remaining_budget()
+    
+    try:
+        support_response, replayed = await get_idempotency_store().run(
+            key,
+            fingerprint,
+            lambda: run_support_pipeline(request, budget),
+            # Failed ServiceNow calls created nothing, so a retry may run again
+            should_store=lambda result: result.success,
+            encode=SupportResponse.model_dump_json,
+            decode=SupportResponse.model_validate_json
+        )
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except asyncio.TimeoutError:
+        # Only a duplicate waiting for another request's pipeline times out;
+        # the pipeline keeps running and its response is kept for replay
+        raise HTTPException(
+            status_code=504,
+            detail="Request timeout exceeded while processing; retry the same request to get its result"
+        )
+    
+    if replayed:
+        logger.info(f"Replaying response for duplicate request ({support_response.incident_number})")
+        response.headers["Idempotent-Replayed"] = "true"
+    else:
+        # Report the pipeline's stages in this request's Server-Timing header
+        for stage, milliseconds in (support_response.timings or {}).items():
+            add_stage_time(stage, milliseconds)
+    
+    return support_response
+
+
+@app.post("/get_support/batch", response_model=List[SupportResponse])
+async def get_support_batch(
+    requests: List[SupportRequest],
+    api_key: str = Depends(verify_api_key)
+) -> List[SupportResponse]:
+    """
+    Create several support incidents at once.
+    
+    This endpoint:
+    1. Creates all incidents through the ServiceNow Batch API in as few
+       round trips as possible
+    2. Sends one Slack message per channel listing that channel's incidents
+       and opens GitHub issues for stack traces concurrently
+    3. Returns one SupportResponse per request, in order
+    
+    Args:
+        requests: List of SupportRequest objects
+        
+    Returns:
+        List of SupportResponse, one per request
+    """
+    if len(requests) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(requests)} requests, maximum is {settings.batch_max_items}"
+        )
+    
+    logger.info(f"Received batch of {len(requests)} support requests")
+    
+    # Step 1: Create all ServiceNow incidents
+    snow_results = await create_service_now_incidents(requests)
+    
+    responses = [None] * len(requests)
+    created = []
+    for index, (request, snow_result) in enumerate(zip(requests, snow_results)):
+        if not snow_result["success"]:
+            record_error(snow_result["error_details"])
+            responses[index] = build_failed_response(snow_result)
+        elif settings.delivery_mode == "outbox":
+            statuses = enqueue_side_effects(request, snow_result["incident_number"])
+            responses[index] = build_queued_response(snow_result, statuses)
+        else:
+            created.append(index)
+    
+    # Step 2: Notify Slack per channel and open GitHub issues concurrently
+    if created:
+        pairs = [(requests[index], snow_results[index]["incident_number"]) for index in created]
+        slack_results, *github_results = await asyncio.gather(
+            notify_slack_grouped(pairs),
+            *(open_github_issue(request, incident_number) for request, incident_number in pairs)
+        )
+        
+        for position, index in enumerate(created):
+            responses[index] = build_support_response(
+                snow_results[index], slack_results[position], github_results[position]
+            )
+    
+    return responses
+
+
+@app.get("/deliveries/{incident_number}")
+async def get_delivery_status(
+    incident_number: str,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Get the outbox delivery state of an incident's Slack and GitHub side effects.
+    
+    Returns:
+        dict: Delivery status, attempts and last error for each side effect
+    """
+    if settings.delivery_mode != "outbox":
+        raise HTTPException(status_code=404, detail="Outbox delivery mode is not enabled")
+    
+    deliveries = get_outbox().get_status(incident_number)
+    if not deliveries:
+        raise HTTPException(status_code=404, detail=f"No deliveries found for {incident_number}")
+    
+    return {"incident_number": incident_number, "deliveries": deliveries}
+
+
+@app.post("/routing/reload")
+async def reload_routing(api_key: str = Depends(verify_api_key)):
+    """
+    Reload the assignment group to Slack channel routes from their sources.
+    
+    Returns:
+        dict: The loaded routes
+    """
+    index = await asyncio.to_thread(reload_routing_index)
+    return {"routes": index.routes}
+
+
+@app.get("/circuit_breakers")
+async def circuit_breakers(api_key: str = Depends(verify_api_key)):
+    """
+    Get the circuit breaker state of each downstream service.
+    
+    Returns:
+        Per service: state (closed, open or half_open), calls and error and
+        slow call rates in the current window, and seconds until an open
+        breaker lets a probe call through
+    """
+    return {"circuit_breakers": get_circuit_breaker_states()}
+
+
+@app.get("/slack/stats")
+async def slack_stats(api_key: str = Depends(verify_api_key)):
+    """
+    Get retry and rate-limit counters for the shared Slack client.
+    
+    Returns:
+        dict: Retry count, rate-limited responses, total throttled seconds,
+              digest counters and the outbound scheduler's queue depth and
+              wait times per method
+    """
+    return get_slack_stats()
+
+
+@app.get("/github/queue")
+async def github_queue_status(api_key: str = Depends(verify_api_key)):
+    """
+    Get the backlog of the GitHub issue write queue.
+    
+    Returns:
+        dict: Queued writes in total and per repository, how long writes are
+              paused for, and completed, retried, failed and rejected counts
+    """
+    return get_github_queue().snapshot()
+
+
 @app.get("/assignment_groups")
-async def list_assignment_groups(api_key: str = Depends(verify_api_key)):
+async def list_assignment_groups(
+    prefix: Optional[str] = Query(default=None, description="Only return groups whose name starts with this prefix (e.g., CLOUD)"),
+    limit: Optional[int] = Query(
+        default=None,
+        ge=1,
+        le=settings.assignment_groups_max_limit,
+        description=f"Maximum number of groups to return (default and maximum {settings.assignment_groups_max_limit})"
+    ),
+    api_key: str = Depends(verify_api_key)
+):
     """
     Get available ServiceNow assignment groups.
     
+    The response never holds more than ASSIGNMENT_GROUPS_MAX_LIMIT groups,
+    so its size stays bounded however many groups match.
+    
     Returns:
         list: Available assignment groups
     """
-    groups = get_assignment_groups()
+    groups = await get_assignment_groups(prefix=prefix, limit=limit or settings.assignment_groups_max_limit)
     return {"assignment_groups": groups}
 
 
+@app.post("/reference_cache/invalidate")
+async def invalidate_reference_cache(
+    key: Optional[str] = None,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Drop cached ServiceNow reference data so the next request refetches it.
+    
+    Under the multi-worker server, the other workers refetch once their
+    own copy expires (REFERENCE_CACHE_TTL).
+    
+    Args:
+        key: Cache key to invalidate (e.g., "assignment_groups"); all keys if omitted
+        
+    Returns:
+        dict: Cache counters after invalidation
+    """
+    cache = get_reference_cache()
+    cache.invalidate(key)
+    return cache.stats()
+
+
 @app.get("/categories")
-async def list_categories(api_key: str = Depends(verify_api_key)):
+async def list_categories(request: Request, api_key: str = Depends(verify_api_key)):
     """
     Get available incident categories.
     
+    Served from a pre-serialized payload with an ETag; send If-None-Match
+    to get 304 Not Modified when the list has not changed.
+    
     Returns:
         list: Available incident categories
     """
-    categories = get_categories()
-    return {"categories": categories}
+    return get_static_response("categories").respond(request.headers.get("If-None-Match"))
 
 
 @app.get("/impacts")
-async def list_impacts(api_key: str = Depends(verify_api_key)):
+async def list_impacts(request: Request, api_key: str = Depends(verify_api_key)):
     """
     Get available impact values.
     
+    Served from a pre-serialized payload with an ETag; send If-None-Match
+    to get 304 Not Modified when the list has not changed.
+    
     Returns:
         list: Available impact values with labels
     """
-    impacts = get_impacts()
-    return {"impacts": impacts}
+    return get_static_response("impacts").respond(request.headers.get("If-None-Match"))
 
 
 @app.get("/urgencies")
-async def list_urgencies(api_key: str = Depends(verify_api_key)):
+async def list_urgencies(request: Request, api_key: str = Depends(verify_api_key)):
     """
     Get available urgency values.
     
+    Served from a pre-serialized payload with an ETag; send If-None-Match
+    to get 304 Not Modified when the list has not changed.
+    
     Returns:
         list: Available urgency values with labels
     """
-    urgencies = get_urgencies()
-    return {"urgencies": urgencies}
+    return get_static_response("urgencies").respond(request.headers.get("If-None-Match"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,309 @@
+"""Prometheus metrics for the incident pipeline.
+
+A small dependency-free implementation of counters, gauges and histograms
+rendered in the Prometheus text exposition format by GET /metrics. Every
+metric is process-local and safe to update from worker threads (GitHub
+calls run in a thread pool).
+
+Under the multi-worker server each worker publishes a snapshot of its
+values to the shared store every few seconds, and /metrics adds the other
+workers' latest snapshots to its own values. A scrape therefore reports
+the whole server whichever worker answers it, with the other workers'
+values at most one publish interval old.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+# Latency buckets in seconds, from a cached lookup up to a slow downstream call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+
+# Per-request stage durations in milliseconds, set by the request middleware
+_request_timings: ContextVar[Optional[dict]] = ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class holding one value per label combination."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def collect(self) -> dict:
+        """Return a copy of the values by label values."""
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def combine(value, other):
+        """Add another process's value for the same labels."""
+        return value + other
+
+    def render(self, values: Optional[dict] = None) -> list:
+        """Return the metric's exposition lines, for `values` or the current values."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        items = sorted((self.collect() if values is None else values).items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["buckets"][index] += 1
+                    break
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the `with` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def collect(self) -> dict:
+        with self._lock:
+            return {key: {**state, "buckets": list(state["buckets"])} for key, state in self._values.items()}
+
+    @staticmethod
+    def combine(value, other):
+        return {
+            "buckets": [count + other_count for count, other_count in zip(value["buckets"], other["buckets"])],
+            "sum": value["sum"] + other["sum"],
+            "count": value["count"] + other["count"]
+        }
+
+    def render(self, values: Optional[dict] = None) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        items = sorted((self.collect() if values is None else values).items())
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["buckets"]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{labels} {state['count']}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "support_api_request_duration_seconds",
+    "Total time spent handling an API request.",
+    ("method", "endpoint", "status")
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "support_api_requests_in_flight",
+    "API requests currently being handled."
+)
+DOWNSTREAM_DURATION = Histogram(
+    "support_api_downstream_duration_seconds",
+    "Time spent in calls to ServiceNow, Slack and GitHub.",
+    ("service", "operation")
+)
+DOWNSTREAM_IN_FLIGHT = Gauge(
+    "support_api_downstream_in_flight",
+    "Calls to ServiceNow, Slack and GitHub currently waiting on a response.",
+    ("service",)
+)
+STACK_TRACE_DETECTION_DURATION = Histogram(
+    "support_api_stack_trace_detection_duration_seconds",
+    "Time spent scanning descriptions for stack traces.",
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5)
+)
+ERRORS = Counter(
+    "support_api_errors_total",
+    "Downstream failures by service and error code.",
+    ("service", "error_code")
+)
+
+
+def start_request_timings() -> dict:
+    """Start collecting stage timings for the current request and return them."""
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def get_request_timings() -> Optional[dict]:
+    """Return a copy of the current request's stage timings, rounded to 0.1 ms."""
+    timings = _request_timings.get()
+    if timings is None:
+        return None
+    return {stage: round(duration, 1) for stage, duration in timings.items()}
+
+
+def add_stage_time(stage: str, milliseconds: float) -> None:
+    """Add time to a stage of the current request, if timings are being collected."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + milliseconds
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Add the duration of the `with` block to a stage of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage_time(stage, (time.perf_counter() - start) * 1000)
+
+
+def format_server_timing(timings: dict, total: Optional[float] = None) -> str:
+    """Format stage timings (milliseconds) as a Server-Timing header value."""
+    entries = [f"{stage};dur={duration:.1f}" for stage, duration in timings.items()]
+    if total is not None:
+        entries.append(f"total;dur={total:.1f}")
+    return ", ".join(entries)
+
+
+@contextmanager
+def track_downstream(service: str, operation: str, stage: Optional[str] = None):
+    """
+    Time a downstream call and count it as in flight while it runs.
+
+    The duration is also added to the current request's `stage` timing,
+    which defaults to the service name.
+    """
+    DOWNSTREAM_IN_FLIGHT.inc(service=service)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        DOWNSTREAM_IN_FLIGHT.dec(service=service)
+        DOWNSTREAM_DURATION.observe(duration, service=service, operation=operation)
+        add_stage_time(stage or service, duration * 1000)
+
+
+def record_error(error_details: Optional[dict]) -> None:
+    """Count a client result's error_details, if any."""
+    if error_details:
+        ERRORS.inc(
+            service=error_details.get("service", "unknown"),
+            error_code=error_details.get("error_code", "UNKNOWN")
+        )
+
+
+def snapshot_metrics() -> dict:
+    """Return every metric's values in a JSON-serializable form."""
+    return {
+        metric.name: [[list(key), value] for key, value in metric.collect().items()]
+        for metric in _registry
+    }
+
+
+def render_metrics(snapshots: Iterable[dict] = ()) -> str:
+    """
+    Render every registered metric in the Prometheus text format.
+
+    Args:
+        snapshots: Other processes' snapshot_metrics() to add to this one's values
+    """
+    lines = []
+    for metric in _registry:
+        values = metric.collect()
+        for snapshot in snapshots:
+            for key, value in snapshot.get(metric.name, ()):
+                key = tuple(key)
+                values[key] = metric.combine(values[key], value) if key in values else value
+        lines.extend(metric.render(values))
+    return "\n".join(lines) + "\n"
+
+
+def render_worker_metrics(store, worker: int) -> str:
+    """Render this worker's metrics plus the snapshots the other workers published to `store`."""
+    snapshots = []
+    for key in store.keys("metrics-"):
+        entry = store.read(key) if key != f"metrics-{worker}" else None
+        if entry is not None:
+            snapshots.append(entry[0])
+    return render_metrics(snapshots)
+
+
+async def run_metrics_publisher(store, worker: int, interval: float) -> None:
+    """Publish this worker's metrics to `store` every `interval` seconds."""
+    while True:
+        store.write(f"metrics-{worker}", snapshot_metrics())
+        await asyncio.sleep(interval)
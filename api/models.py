@@ -1,6 +1,6 @@
 """Pydantic models for the Support API."""
 
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel, Field
 
 
@@ -51,10 +51,22 @@ class SupportResponse(BaseModel):
     github_issue_created: bool = False
     github_issue_url: Optional[str] = None
     github_issue_number: Optional[int] = None
+    slack_delivery_status: Optional[str] = Field(
+        default=None,
+        description="Outbox delivery state of the Slack notification (pending, delivered or failed), or digest when it is held for the channel's next digest message"
+    )
+    github_delivery_status: Optional[str] = Field(
+        default=None,
+        description="Outbox delivery state of the GitHub issue (pending, delivered or failed), or queued when the issue is still waiting in the GitHub write queue"
+    )
     error_details: Optional[dict] = Field(
         default=None,
         description="A unified wrapper to fetch all details about the error"
     )
+    timings: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Milliseconds spent per stage (auth, servicenow, slack, slack_channel_create, github)"
+    )
 
 
 class ErrorDetails(BaseModel):
@@ -0,0 +1,329 @@
+"""Durable outbox for Slack and GitHub side effects.
+
+In outbox delivery mode, /get_support records its Slack and GitHub work
+items in a local SQLite (WAL) database and returns as soon as the
+ServiceNow incident exists. A background worker drains the outbox,
+retrying failed deliveries with exponential backoff, so a Slack outage or
+a slow GitHub API no longer adds to user-facing latency and failed
+notifications are kept instead of only being logged.
+
+A claimed item is leased for OUTBOX_CLAIM_LEASE seconds. If the process
+delivering it dies or shuts down mid-delivery, the expired lease counts as
+a failed attempt and the item is retried after the usual backoff, by any
+worker sharing the database. An item that keeps crashing or hanging its
+worker therefore still ends up failed after OUTBOX_MAX_ATTEMPTS.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Delivery states for an outbox item
+STATUS_PENDING = "pending"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_DELIVERED = "delivered"
+STATUS_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    incident_number TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    result TEXT,
+    claimed_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_outbox_incident ON outbox (incident_number);
+"""
+
+_outbox: Optional["Outbox"] = None
+
+
+class Outbox:
+    """SQLite-backed queue of side effects waiting to be delivered."""
+
+    def __init__(self, path: str, max_attempts: int = 5, base_backoff: float = 2.0, lease: float = 300.0):
+        """
+        Args:
+            path: SQLite database file
+            max_attempts: Deliveries to try before an item is marked failed
+            base_backoff: Seconds before the first retry, doubled on each later one
+            lease: Seconds a claim lasts before the item may be claimed again
+        """
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # Outboxes created before claims were leased lack the column
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if "claimed_at" not in columns:
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN claimed_at REAL")
+
+    def enqueue(self, incident_number: str, kind: str, payload: dict) -> int:
+        """
+        Persist a side effect for later delivery.
+
+        Args:
+            incident_number: The ServiceNow incident the side effect belongs to
+            kind: Side effect type ("slack" or "github")
+            payload: JSON-serializable data the delivery handler needs
+
+        Returns:
+            int: The outbox item id
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO outbox (incident_number, kind, payload, status, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (incident_number, kind, json.dumps(payload), STATUS_PENDING, now, now, now)
+            )
+        self.notify()
+        return cursor.lastrowid
+
+    def claim_due(self, limit: int, now: Optional[float] = None) -> list:
+        """
+        Mark up to `limit` due items as in progress and return them.
+
+        Due items are pending items whose retry time has come. In-progress
+        items whose lease expired, because the process delivering them is
+        gone or stuck, are first recorded as a failed attempt and scheduled
+        for a retry like any other failure.
+
+        Args:
+            limit: Maximum number of items to claim
+            now: Current time, defaults to time.time()
+
+        Returns:
+            list: The claimed items
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                expired = self._conn.execute(
+                    "SELECT id, attempts FROM outbox WHERE status = ? AND (claimed_at IS NULL OR claimed_at <= ?)",
+                    (STATUS_IN_PROGRESS, now - self.lease)
+                ).fetchall()
+                for row in expired:
+                    attempts = row["attempts"] + 1
+                    status, next_attempt_at = self._schedule_retry(attempts, now)
+                    self._conn.execute(
+                        "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, "
+                        "claimed_at = NULL, updated_at = ? WHERE id = ?",
+                        (status, attempts, "Delivery lease expired", next_attempt_at, now, row["id"])
+                    )
+                if expired:
+                    logger.warning(f"Outbox delivery lease expired for {len(expired)} items; counted as failed attempts")
+
+                rows = self._conn.execute(
+                    "SELECT id, incident_number, kind, payload, attempts FROM outbox "
+                    "WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                    (STATUS_PENDING, now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, claimed_at = ?, updated_at = ? WHERE id = ?",
+                    [(STATUS_IN_PROGRESS, now, now, row["id"]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [
+            {
+                "id": row["id"],
+                "incident_number": row["incident_number"],
+                "kind": row["kind"],
+                "payload": json.loads(row["payload"]),
+                "attempts": row["attempts"]
+            }
+            for row in rows
+        ]
+
+    def mark_delivered(self, item_id: int, result: dict) -> None:
+        """Record a successful delivery."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, result = ?, last_error = NULL, updated_at = ? "
+                "WHERE id = ?",
+                (STATUS_DELIVERED, json.dumps(result, default=str), time.time(), item_id)
+            )
+
+    def mark_attempt_failed(self, item_id: int, attempts: int, error: str, now: Optional[float] = None) -> str:
+        """
+        Record a failed delivery attempt and schedule a retry.
+
+        Args:
+            item_id: The outbox item id
+            attempts: Number of attempts made before this one
+            error: Description of the failure
+            now: Current time, defaults to time.time()
+
+        Returns:
+            str: The item's new status (pending, or failed once retries are exhausted)
+        """
+        attempts += 1
+        now = time.time() if now is None else now
+        status, next_attempt_at = self._schedule_retry(attempts, now)
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, attempts, error, next_attempt_at, now, item_id)
+            )
+        return status
+
+    def _schedule_retry(self, attempts: int, now: float) -> tuple:
+        """Return the status and retry time of an item after `attempts` failed deliveries."""
+        status = STATUS_FAILED if attempts >= self.max_attempts else STATUS_PENDING
+        return status, now + self.base_backoff * (2 ** (attempts - 1))
+
+    def get_status(self, incident_number: str) -> dict:
+        """
+        Get the delivery state of every side effect for an incident.
+
+        Returns:
+            dict: Maps side effect kind to its status, attempts and last error
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, status, attempts, last_error, result FROM outbox WHERE incident_number = ? ORDER BY id",
+                (incident_number,)
+            ).fetchall()
+
+        return {
+            row["kind"]: {
+                "status": row["status"],
+                "attempts": row["attempts"],
+                "last_error": row["last_error"],
+                "result": json.loads(row["result"]) if row["result"] else None
+            }
+            for row in rows
+        }
+
+    def backlog(self) -> dict:
+        """Count outbox items by status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def notify(self) -> None:
+        """Wake the worker so new items are delivered without waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def wait_for_work(self, timeout: float) -> None:
+        """Sleep until new work is enqueued or `timeout` seconds pass."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def get_outbox() -> Outbox:
+    """Return the process-wide outbox, opening it on first use."""
+    global _outbox
+
+    if _outbox is None:
+        settings = get_settings()
+        _outbox = Outbox(
+            settings.outbox_path,
+            max_attempts=settings.outbox_max_attempts,
+            base_backoff=settings.outbox_retry_backoff,
+            lease=settings.outbox_claim_lease
+        )
+
+    return _outbox
+
+
+def close_outbox() -> None:
+    """Close the process-wide outbox."""
+    global _outbox
+
+    if _outbox is not None:
+        _outbox.close()
+    _outbox = None
+
+
+async def deliver_item(outbox: Outbox, item: dict, deliver: Callable[[str, dict], Awaitable[dict]]) -> None:
+    """Deliver a single outbox item and record the outcome."""
+    try:
+        result = await deliver(item["kind"], item["payload"])
+    except Exception as e:
+        result = {"success": False, "error_details": {"error_message": str(e)}}
+
+    if result.get("success"):
+        outbox.mark_delivered(item["id"], result)
+        logger.info(f"Delivered {item['kind']} side effect for {item['incident_number']}")
+        return
+
+    error = (result.get("error_details") or {}).get("error_message", "unknown error")
+    status = outbox.mark_attempt_failed(item["id"], item["attempts"], error)
+    if status == STATUS_FAILED:
+        logger.error(f"Giving up on {item['kind']} side effect for {item['incident_number']}: {error}")
+    else:
+        logger.warning(f"Retrying {item['kind']} side effect for {item['incident_number']}: {error}")
+
+
+async def run_outbox_worker(
+    outbox: Outbox,
+    deliver: Callable[[str, dict], Awaitable[dict]],
+    batch_size: int = 10,
+    poll_interval: float = 1.0
+) -> None:
+    """
+    Drain the outbox until cancelled.
+
+    Args:
+        outbox: The outbox to drain
+        deliver: Coroutine taking (kind, payload) and returning the client's result dict
+        batch_size: Maximum number of items delivered concurrently
+        poll_interval: Seconds between polls when there is no new work
+    """
+    logger.info(f"Outbox worker started ({outbox.path})")
+
+    while True:
+        try:
+            items = outbox.claim_due(batch_size)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read outbox: {str(e)}")
+            items = []
+
+        if items:
+            await asyncio.gather(*(deliver_item(outbox, item, deliver) for item in items))
+        else:
+            await outbox.wait_for_work(poll_interval)
@@ -0,0 +1,145 @@
+"""Client-side pacing of calls to rate-limited APIs.
+
+A RateLimitScheduler holds token buckets, e.g. one per API method and one
+per (method, channel). A call takes a token from every bucket that applies
+to it. If a bucket is empty, the call waits its turn instead of being sent
+and rejected with a 429. Waiting calls are served in arrival order. Queue
+depth and wait times are exported as metrics.
+"""
+
+import asyncio
+import time
+from typing import Callable, Iterable, Optional
+
+from .metrics import Gauge, Histogram, add_stage_time
+
+RATE_LIMIT_QUEUE_DEPTH = Gauge(
+    "support_api_rate_limit_queue_depth",
+    "Calls waiting for a rate limit token.",
+    ("service", "method")
+)
+RATE_LIMIT_WAIT = Histogram(
+    "support_api_rate_limit_wait_seconds",
+    "Time calls spent waiting for a rate limit token.",
+    ("service", "method"),
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+
+class RateLimitWaitError(Exception):
+    """Raised instead of queueing a call that would wait longer than its caller allows."""
+
+    def __init__(self, service: str, method: str, wait: float):
+        super().__init__(f"{service} {method} is rate limited, next slot in {wait:.1f}s")
+        self.service = service
+        self.method = method
+        self.wait = wait
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `burst`.
+
+    This is the GCRA form of a token bucket. It stores the time at which the
+    bucket would be full again rather than a token count, so a call can
+    reserve a future token: the wait is computed and the token taken in one
+    step, with no lock and no polling.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.interval = 1.0 / rate
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self._full_at = 0.0
+
+    def ready_at(self, now: float) -> float:
+        """Return the earliest time a token is available."""
+        return max(now, self._full_at - self.tolerance)
+
+    def take(self, at: float) -> None:
+        """Take one token at time `at` (no earlier than ready_at)."""
+        self._full_at = max(self._full_at, at) + self.interval
+
+
+class RateLimitScheduler:
+    """Paces one service's calls through per-method and per-key token buckets."""
+
+    def __init__(self, service: str, bucket_factory: Callable[[tuple], Optional[TokenBucket]]):
+        """
+        Args:
+            service: Service name used in metrics and errors
+            bucket_factory: Returns the bucket for a key such as ("chat.postMessage",)
+                            or ("chat.postMessage", "C123"), or None for no limit
+        """
+        self.service = service
+        self._bucket_factory = bucket_factory
+        self._buckets = {}
+        self._stats = {}
+
+    def _bucket(self, key: tuple) -> Optional[TokenBucket]:
+        if key not in self._buckets:
+            self._buckets[key] = self._bucket_factory(key)
+        return self._buckets[key]
+
+    async def acquire(self, method: str, keys: Iterable[Optional[str]] = (), max_wait: Optional[float] = None) -> float:
+        """
+        Wait for a token from the method's bucket and from each keyed bucket.
+
+        Args:
+            method: API method being called
+            keys: Extra bucket keys for this call, e.g. the channel
+            max_wait: Longest acceptable wait in seconds, or None to wait as long as needed
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RateLimitWaitError: If the wait would exceed `max_wait`; no token is taken
+        """
+        buckets = [self._bucket((method,))] + [self._bucket((method, key)) for key in keys if key]
+        buckets = [bucket for bucket in buckets if bucket is not None]
+        if not buckets:
+            return 0.0
+
+        now = time.monotonic()
+        start = max(bucket.ready_at(now) for bucket in buckets)
+        wait = start - now
+        if max_wait is not None and wait > max_wait:
+            raise RateLimitWaitError(self.service, method, wait)
+
+        for bucket in buckets:
+            bucket.take(start)
+
+        stats = self._stats.setdefault(method, {
+            "queue_depth": 0,
+            "calls": 0,
+            "delayed": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0
+        })
+        stats["calls"] += 1
+        if wait > 0:
+            stats["queue_depth"] += 1
+            stats["delayed"] += 1
+            RATE_LIMIT_QUEUE_DEPTH.inc(service=self.service, method=method)
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                stats["queue_depth"] -= 1
+                RATE_LIMIT_QUEUE_DEPTH.dec(service=self.service, method=method)
+            stats["wait_seconds"] += wait
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], wait)
+            add_stage_time(f"{self.service}_queue", wait * 1000)
+
+        RATE_LIMIT_WAIT.observe(max(wait, 0.0), service=self.service, method=method)
+        return max(wait, 0.0)
+
+    def snapshot(self) -> dict:
+        """Return queue depth and wait statistics per method."""
+        return {
+            method: {
+                **stats,
+                "wait_seconds": round(stats["wait_seconds"], 3),
+                "max_wait_seconds": round(stats["max_wait_seconds"], 3)
+            }
+            for method, stats in self._stats.items()
+        }
@@ -0,0 +1,237 @@
+"""Assignment group to Slack channel routing.
+
+Routes are keyed by assignment group prefix and resolved by longest-prefix
+match, so "DEVTOOLS-L1-Support" picks the DEVTOOLS route over DEV no matter
+the order routes were defined in. The table is built from the built-in
+defaults, the Slack channels listed in the assignment group knowledge base
+and an optional JSON routing file, and is reloaded when those files change.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KNOWLEDGE_BASE_PATH = (
+    Path(__file__).resolve().parent.parent / "knowledge-base" / "servicenow-assignment-groups.txt"
+)
+
+# Maximum number of distinct assignment groups remembered per routing index
+MAX_CACHED_GROUPS = 4096
+
+# Assignment Group to Slack Channel Mapping
+ASSIGNMENT_GROUP_SLACK_CHANNELS = {
+    # CLOUD - Cloud Infrastructure Services
+    "CLOUD": "#cloud-support",
+
+    # DATA - Data & Analytics
+    "DATA": "#data-support",
+
+    # SECURITY - Cybersecurity Operations
+    "SEC": "#security-incidents",
+
+    # COLLAB - Collaboration & Productivity
+    "COLLAB": "#collab-support",
+
+    # FINTECH - Financial Technology
+    "FIN": "#fintech-support",
+
+    # DEVTOOLS - Developer Tools & Platforms
+    "DEVTOOLS": "#devtools-support",
+    "DEV": "#devtools-support",
+
+    # ITSM - IT Service Management
+    "ITSM": "#itsm-support",
+
+    # ERP - Enterprise Resource Planning
+    "ERP": "#erp-support",
+
+    # IOT - IoT & Industrial
+    "IOT": "#iot-support",
+
+    # General/Fallback
+    "GENERAL": "#general-support",
+}
+
+_SECTION_RE = re.compile(r'^##\s+([A-Za-z0-9]+)\s+-')
+_GROUP_ROW_RE = re.compile(r'^\|\s*([A-Za-z0-9]+)-[^|]*\|\s*AGR-')
+_SLACK_CHANNEL_RE = re.compile(r'Slack Channel:\**\s*(#[\w-]+)')
+
+_index: Optional["RoutingIndex"] = None
+_index_lock = threading.Lock()
+_last_reload_check = 0.0
+
+
+class RoutingIndex:
+    """Longest-prefix-match table from assignment group prefix to Slack channel."""
+
+    def __init__(self, routes: dict, source_mtimes: Optional[dict] = None):
+        self.routes = {prefix.upper(): channel for prefix, channel in routes.items() if prefix}
+        self.source_mtimes = source_mtimes or {}
+        self._max_prefix_length = max((len(prefix) for prefix in self.routes), default=0)
+        self._cache = {}
+
+    def resolve(self, assignment_group: str) -> Optional[str]:
+        """
+        Resolve the Slack channel for an assignment group.
+
+        Args:
+            assignment_group: The ServiceNow assignment group name (e.g., "CLOUD-L1-Support")
+
+        Returns:
+            The Slack channel of the longest matching prefix, or None if no prefix matches
+        """
+        try:
+            return self._cache[assignment_group]
+        except KeyError:
+            pass
+
+        group_upper = assignment_group.upper()
+        channel = None
+
+        # Try candidate prefixes from longest to shortest; each probe is one dict lookup
+        for length in range(min(len(group_upper), self._max_prefix_length), 0, -1):
+            channel = self.routes.get(group_upper[:length])
+            if channel is not None:
+                break
+
+        if len(self._cache) >= MAX_CACHED_GROUPS:
+            self._cache.clear()
+        self._cache[assignment_group] = channel
+
+        return channel
+
+
+def parse_knowledge_base_routes(text: str) -> dict:
+    """
+    Extract prefix to Slack channel routes from the assignment group directory.
+
+    Each "## PREFIX - Department" section contributes its section prefix and
+    the prefix of every assignment group in its table, all routed to the
+    section's "Slack Channel" entry.
+
+    Args:
+        text: Contents of servicenow-assignment-groups.txt
+
+    Returns:
+        dict: Maps assignment group prefix to Slack channel
+    """
+    routes = {}
+    prefixes = set()
+
+    def flush(channel: Optional[str]) -> None:
+        if channel:
+            for prefix in prefixes:
+                routes[prefix.upper()] = channel
+
+    channel = None
+    for line in text.splitlines():
+        section = _SECTION_RE.match(line)
+        if section:
+            flush(channel)
+            prefixes = {section.group(1)}
+            channel = None
+            continue
+
+        row = _GROUP_ROW_RE.match(line)
+        if row:
+            prefixes.add(row.group(1))
+            continue
+
+        slack_channel = _SLACK_CHANNEL_RE.search(line)
+        if slack_channel:
+            channel = slack_channel.group(1)
+
+    flush(channel)
+    return routes
+
+
+def _source_paths() -> list:
+    """Return the files the routing table is built from."""
+    settings = get_settings()
+    paths = [Path(settings.routing_knowledge_base_path or DEFAULT_KNOWLEDGE_BASE_PATH)]
+
+    if settings.routing_config_path:
+        paths.append(Path(settings.routing_config_path))
+
+    return paths
+
+
+def _mtime(path: Path) -> Optional[float]:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def build_routing_index() -> RoutingIndex:
+    """
+    Build a routing index from the defaults, the knowledge base and the routing file.
+
+    Later sources override earlier ones for the same prefix. A missing or
+    unreadable source is logged and skipped.
+    """
+    routes = dict(ASSIGNMENT_GROUP_SLACK_CHANNELS)
+    source_mtimes = {}
+
+    for path in _source_paths():
+        source_mtimes[path] = _mtime(path)
+        if source_mtimes[path] is None:
+            logger.warning(f"Routing source {path} not found, skipping")
+            continue
+
+        try:
+            text = path.read_text(encoding="utf-8")
+            if path.suffix == ".json":
+                routes.update({prefix.upper(): channel for prefix, channel in json.loads(text).items()})
+            else:
+                routes.update(parse_knowledge_base_routes(text))
+        except (OSError, ValueError, AttributeError) as e:
+            logger.error(f"Failed to load routing source {path}: {str(e)}")
+
+    logger.info(f"Loaded {len(routes)} assignment group routes")
+    return RoutingIndex(routes, source_mtimes)
+
+
+def reload_routing_index() -> RoutingIndex:
+    """Rebuild the routing index from its sources and swap it in."""
+    global _index
+
+    index = build_routing_index()
+    with _index_lock:
+        _index = index
+    return index
+
+
+def get_routing_index() -> RoutingIndex:
+    """
+    Return the current routing index, rebuilding it if a source file changed.
+
+    Source files are checked at most once every ROUTING_RELOAD_INTERVAL seconds.
+    """
+    global _index, _last_reload_check
+
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = build_routing_index()
+                _last_reload_check = time.monotonic()
+        return _index
+
+    index = _index
+    interval = get_settings().routing_reload_interval
+    now = time.monotonic()
+    if interval > 0 and now - _last_reload_check >= interval:
+        _last_reload_check = now
+        if any(_mtime(path) != mtime for path, mtime in index.source_mtimes.items()):
+            logger.info("Routing sources changed, reloading")
+            index = reload_routing_index()
+
+    return index
@@ -0,0 +1,227 @@
+"""Production server entry point: `python -m api.server`.
+
+Runs the API in uvicorn worker processes. By default (WEB_CONCURRENCY=0)
+there is one worker per CPU of the cgroup CPU quota (the Kubernetes CPU
+limit), rounded up and capped by the CPUs the process may run on and by
+SERVER_MAX_WORKERS; WEB_CONCURRENCY=n runs exactly n workers.
+
+Before forking, the parent:
+- imports the app and the SDKs it defers,
+- builds the settings, routing index and static responses, so the workers
+  share those pages instead of each building its own,
+- binds the listening socket the workers share,
+- opens the shared store (api.shared_state) the workers use for the Slack
+  channel directory, ServiceNow reference data and metrics snapshots.
+
+Idempotency records, the outbox and the GitHub issue index are SQLite
+databases every worker opens after the fork.
+
+The parent then supervises the workers. It replaces a worker that dies, and
+passes SIGTERM/SIGINT on so each worker shuts down gracefully. With one
+worker nothing is forked and the server runs in the parent process.
+"""
+
+import importlib
+import logging
+import math
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import uvicorn
+
+from .config import get_settings
+from .shared_state import configure_workers, set_worker_index
+
+logger = logging.getLogger(__name__)
+
+# uvicorn's exit status when the app fails to start; a worker exiting with it is not restarted
+STARTUP_FAILURE = 3
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """
+    Return the CPU quota of this container in CPUs, e.g. 0.5 for a 500m limit.
+
+    Reads cpu.max (cgroup v2) or cpu.cfs_quota_us / cpu.cfs_period_us (cgroup v1).
+
+    Returns:
+        float: CPUs the container may use, or None if it has no quota
+    """
+    try:
+        quota, period = (root / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    for directory in (root / "cpu", root / "cpu,cpuacct"):
+        try:
+            quota = int((directory / "cpu.cfs_quota_us").read_text())
+            period = int((directory / "cpu.cfs_period_us").read_text())
+            return None if quota <= 0 else quota / period
+        except (OSError, ValueError):
+            continue
+
+    return None
+
+
+def available_cpus() -> int:
+    """Return the number of CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    """Return WEB_CONCURRENCY, or one worker per CPU of the quota (rounded up)."""
+    settings = get_settings()
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+
+    cpus = available_cpus()
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, min(cpus, settings.server_max_workers))
+
+
+def shared_state_directory() -> str:
+    """Create a directory for the workers' shared store, on tmpfs when there is one."""
+    base = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+    return tempfile.mkdtemp(prefix="technova-support-api-", dir=base)
+
+
+def preload():
+    """Import the app and build the read-mostly state the workers inherit."""
+    from .main import app
+    from .routing import get_routing_index
+    from .static_responses import build_static_responses
+
+    # The SDKs are only deferred to speed up a single process's start-up
+    for module in ("github", "aiohttp", "httpx", "slack_sdk.web.async_client"):
+        importlib.import_module(module)
+    get_routing_index()
+    build_static_responses()
+    return app
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Bind the listening socket the workers share."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve(app, sock: socket.socket) -> int:
+    """Run one uvicorn server on `sock` until it is told to stop; return its exit status."""
+    server = uvicorn.Server(uvicorn.Config(app, log_level="info"))
+    server.run(sockets=[sock])
+    return 0 if server.started else STARTUP_FAILURE
+
+
+class Supervisor:
+    """Forks the workers and keeps the configured number of them running."""
+
+    def __init__(self, app, sock: socket.socket, workers: int):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.children = {}
+        self.stopping = False
+
+    def spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                set_worker_index(index)
+                status = serve(self.app, self.sock)
+            finally:
+                # Skip the parent's exit handlers, which remove the shared store
+                os._exit(status)
+
+        self.children[pid] = (index, time.monotonic())
+        logger.info(f"Started worker {index} (pid {pid})")
+
+    def stop(self, signum, frame) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self.stop)
+        # Forward Ctrl-C as SIGTERM: a second SIGINT makes uvicorn skip its graceful shutdown
+        signal.signal(signal.SIGINT, self.stop)
+
+        for index in range(self.workers):
+            self.spawn(index)
+
+        exit_status = 0
+        while self.children:
+            try:
+                pid, wait_status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            index, started_at = self.children.pop(pid)
+            status = os.waitstatus_to_exitcode(wait_status)
+            if self.stopping:
+                continue
+
+            if status == STARTUP_FAILURE:
+                logger.error(f"Worker {index} (pid {pid}) failed to start, shutting down")
+                exit_status = STARTUP_FAILURE
+                self.stop(None, None)
+                continue
+
+            logger.warning(f"Worker {index} (pid {pid}) exited with status {status}, restarting it")
+            # Do not spin if a worker keeps dying right after starting
+            time.sleep(max(0.0, 1.0 - (time.monotonic() - started_at)))
+            self.spawn(index)
+
+        return exit_status
+
+
+def main() -> int:
+    settings = get_settings()
+    workers = worker_count()
+    sock = bind_socket(settings.server_host, settings.server_port)
+
+    if workers == 1:
+        return serve(preload(), sock)
+
+    directory = shared_state_directory()
+    try:
+        configure_workers(workers, directory)
+        app = preload()
+
+        logger.info(
+            f"Serving on {settings.server_host}:{settings.server_port} with {workers} workers "
+            f"(CPU quota {cgroup_cpu_quota() or 'none'}, {available_cpus()} CPUs)"
+        )
+        return Supervisor(app, sock, workers).run()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,195 @@
 """ServiceNow client helper functions."""
 
+import asyncio
+import base64
+import json
 import logging
-from typing import Optional
-from pysnow import Client
-from pysnow.exceptions import PysnowException
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
+from .cache import get_reference_cache
 from .config import get_settings
+from .circuit_breaker import CircuitOpenError, downstream_call
+from .deadline import DeadlineExceededError, check_deadline, remaining_budget
 from .models import SupportRequest
+from .routing import get_routing_index
+
+# httpx is imported on first use, so importing the app does not pay for it
+# until ServiceNow is actually called
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
 
+# Only request the fields we actually read back from the Table API
+INCIDENT_FIELDS = "number,sys_id"
+ASSIGNMENT_GROUP_FIELDS = "name,sys_id"
+
+# Process-wide connection pool and concurrency limit, created on first use
+_client: Optional["httpx.AsyncClient"] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+class ServiceNowError(Exception):
+    """Raised when the ServiceNow Table API returns an error response."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
 
-def get_servicenow_client() -> Client:
-    """Create and return a ServiceNow client instance."""
+def get_servicenow_base_url() -> str:
+    """
+    Build the ServiceNow base URL from the configured instance.
+    
+    Accepts either a bare instance name ("dev12345") or a full host
+    ("dev12345.service-now.com").
+    """
     settings = get_settings()
+    instance = settings.servicenow_instance.strip().rstrip("/")
     
-    client = Client(
-        instance=settings.servicenow_instance,
-        user=settings.servicenow_username,
-        password=settings.servicenow_password
-    )
+    if instance.startswith(("http://", "https://")):
+        return instance
+    
+    if "." not in instance:
+        instance = f"{instance}.service-now.com"
     
-    return client
+    return f"https://{instance}"
 
 
-def create_service_now_incident(request: SupportRequest) -> dict:
+def get_servicenow_client() -> "httpx.AsyncClient":
+    """Return the shared ServiceNow HTTP client, creating it on first use."""
+    global _client
+    
+    if _client is None or _client.is_closed:
+        import httpx
+        
+        settings = get_settings()
+        _client = httpx.AsyncClient(
+            base_url=f"{get_servicenow_base_url()}/api/now",
+            auth=(settings.servicenow_username, settings.servicenow_password),
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json"
+            },
+            timeout=httpx.Timeout(
+                settings.servicenow_timeout,
+                connect=settings.servicenow_connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.servicenow_max_connections,
+                max_keepalive_connections=settings.servicenow_max_connections,
+                keepalive_expiry=30
+            )
+        )
+    
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore bounding concurrent ServiceNow calls."""
+    global _semaphore
+    
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(get_settings().servicenow_max_concurrency)
+    
+    return _semaphore
+
+
+async def close_servicenow_client() -> None:
+    """Close the shared ServiceNow HTTP client and release its connections."""
+    global _client, _semaphore
+    
+    if _client is not None:
+        await _client.aclose()
+    
+    _client = None
+    _semaphore = None
+
+
+def _error_message(response: "httpx.Response") -> str:
+    """Extract a readable error message from a ServiceNow error response."""
+    try:
+        error = response.json().get("error") or {}
+        message = error.get("message") or response.reason_phrase
+        detail = error.get("detail")
+        return f"{message}: {detail}" if detail else message
+    except ValueError:
+        return f"HTTP {response.status_code} {response.reason_phrase}"
+
+
+async def table_request(method: str, table: str, **kwargs) -> "httpx.Response":
+    """
+    Send a request to the ServiceNow Table API.
+    
+    Args:
+        method: HTTP method
+        table: Table name (e.g., "incident")
+        **kwargs: Extra arguments passed through to httpx (params, json, ...)
+        
+    Returns:
+        httpx.Response: The successful response
+        
+    Raises:
+        ServiceNowError: If ServiceNow returns an error status
+        httpx.HTTPError: On connection errors and timeouts
+    """
+    return await _send(method, f"/table/{table}", f"{method} {table}", **kwargs)
+
+
+async def _send(method: str, url: str, operation: str, **kwargs) -> "httpx.Response":
+    """Send a ServiceNow request within the concurrency limit and the request's time budget."""
+    import httpx
+    
+    client = get_servicenow_client()
+    
+    async def send() -> "httpx.Response":
+        async with _get_semaphore():
+            with downstream_call("servicenow", operation):
+                response = await client.request(method, url, **kwargs)
+                if response.is_error:
+                    raise ServiceNowError(_error_message(response), response.status_code)
+                return response
+    
+    remaining = remaining_budget()
+    if remaining is None:
+        return await send()
+    
+    # Bound the whole call, including waiting for a concurrency slot
+    check_deadline("servicenow")
+    try:
+        return await asyncio.wait_for(send(), timeout=remaining)
+    except asyncio.TimeoutError:
+        raise httpx.TimeoutException("Request deadline reached while waiting for ServiceNow")
+
+
+def build_incident_payload(request: SupportRequest) -> dict:
+    """Build the ServiceNow incident record for a support request."""
+    # Build the incident payload
+    incident_data = {
+        "short_description": request.short_description,
+        "urgency": request.urgency_value,
+    }
+    
+    # Add optional fields if provided
+    if request.description:
+        incident_data["description"] = request.description
+        
+    if request.assignment_group:
+        incident_data["assignment_group"] = request.assignment_group
+        
+    if request.caller_username:
+        incident_data["caller_id"] = request.caller_username
+        
+    if request.impact_value:
+        incident_data["impact"] = request.impact_value
+        
+    if request.incident_category:
+        incident_data["category"] = request.incident_category
+    
+    return incident_data
+
+
+async def create_service_now_incident(request: SupportRequest) -> dict:
     """
     Create a new incident in ServiceNow.
     
@@ -41,41 +206,26 @@ def create_service_now_incident(request: SupportRequest) -> dict:
         "error_details": None
     }
     
+    import httpx
+    
     try:
-        client = get_servicenow_client()
-        
-        # Get the incident table resource
-        incident_table = client.resource(api_path='/table/incident')
-        
-        # Build the incident payload
-        incident_data = {
-            "short_description": request.short_description,
-            "urgency": request.urgency_value,
-        }
-        
-        # Add optional fields if provided
-        if request.description:
-            incident_data["description"] = request.description
-            
-        if request.assignment_group:
-            incident_data["assignment_group"] = request.assignment_group
-            
-        if request.caller_username:
-            incident_data["caller_id"] = request.caller_username
-            
-        if request.impact_value:
-            incident_data["impact"] = request.impact_value
-            
-        if request.incident_category:
-            incident_data["category"] = request.incident_category
+        incident_data = build_incident_payload(request)
         
         logger.info(f"Creating ServiceNow incident with data: {incident_data}")
         
-        # Create the incident
-        response = incident_table.create(payload=incident_data)
+        # Create the incident, asking only for the fields we return
+        response = await table_request(
+            "POST",
+            "incident",
+            json=incident_data,
+            params={
+                "sysparm_fields": INCIDENT_FIELDS,
+                "sysparm_exclude_reference_link": "true"
+            }
+        )
         
         # Extract incident details from response
-        incident_record = response.one()
+        incident_record = response.json().get("result", {})
         
         result["success"] = True
         result["incident_number"] = incident_record.get("number")
@@ -83,7 +233,31 @@ def create_service_now_incident(request: SupportRequest) -> dict:
         
         logger.info(f"Successfully created incident: {result['incident_number']}")
         
-    except PysnowException as e:
+    except CircuitOpenError as e:
+        logger.error(f"ServiceNow request rejected: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SERVICENOW_CIRCUIT_OPEN",
+            "error_message": str(e),
+            "service": "servicenow"
+        }
+        
+    except DeadlineExceededError as e:
+        logger.error(str(e))
+        result["error_details"] = {
+            "error_code": "SERVICENOW_DEADLINE_EXCEEDED",
+            "error_message": str(e),
+            "service": "servicenow"
+        }
+        
+    except httpx.TimeoutException as e:
+        logger.error(f"ServiceNow request timed out: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SERVICENOW_TIMEOUT",
+            "error_message": str(e) or "ServiceNow request timed out",
+            "service": "servicenow"
+        }
+        
+    except (ServiceNowError, httpx.HTTPError) as e:
         logger.error(f"ServiceNow API error: {str(e)}")
         result["error_details"] = {
             "error_code": "SERVICENOW_API_ERROR",
@@ -102,26 +276,273 @@ def create_service_now_incident(request: SupportRequest) -> dict:
     return result
 
 
-def get_assignment_groups() -> list:
+def _batch_item_result(serviced: Optional[dict]) -> dict:
+    """Turn one serviced Batch API request into a create_service_now_incident result."""
+    result = {
+        "success": False,
+        "incident_number": None,
+        "incident_sys_id": None,
+        "error_details": None
+    }
+    
+    if serviced is None:
+        result["error_details"] = {
+            "error_code": "SERVICENOW_API_ERROR",
+            "error_message": "Request was not serviced by the ServiceNow batch API",
+            "service": "servicenow"
+        }
+        return result
+    
+    try:
+        body = json.loads(base64.b64decode(serviced.get("body") or "") or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError(f"expected a JSON object, got {type(body).__name__}")
+    except ValueError as e:
+        # Only this item failed; the rest of the batch is still usable
+        logger.error(f"Invalid ServiceNow batch item body: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SERVICENOW_API_ERROR",
+            "error_message": f"Invalid batch item response: {str(e)}",
+            "service": "servicenow"
+        }
+        return result
+    
+    if serviced.get("status_code", 500) >= 400:
+        error = body.get("error") or {}
+        result["error_details"] = {
+            "error_code": "SERVICENOW_API_ERROR",
+            "error_message": error.get("message") or serviced.get("status_text") or "Batch item failed",
+            "service": "servicenow"
+        }
+        return result
+    
+    incident_record = body.get("result", {})
+    result["success"] = True
+    result["incident_number"] = incident_record.get("number")
+    result["incident_sys_id"] = incident_record.get("sys_id")
+    return result
+
+
+async def _create_incident_batch(requests: list) -> list:
+    """Create up to one batch worth of incidents with a single Batch API call."""
+    headers = [
+        {"name": "Content-Type", "value": "application/json"},
+        {"name": "Accept", "value": "application/json"}
+    ]
+    rest_requests = [
+        {
+            "id": str(index),
+            "method": "POST",
+            "url": f"/api/now/table/incident?sysparm_fields={INCIDENT_FIELDS}&sysparm_exclude_reference_link=true",
+            "headers": headers,
+            "body": base64.b64encode(json.dumps(build_incident_payload(request)).encode()).decode()
+        }
+        for index, request in enumerate(requests)
+    ]
+    
+    response = await _send(
+        "POST",
+        "/v1/batch",
+        "POST batch",
+        json={"batch_request_id": "incidents", "rest_requests": rest_requests}
+    )
+    
+    serviced = {item["id"]: item for item in response.json().get("serviced_requests", [])}
+    return [_batch_item_result(serviced.get(str(index))) for index in range(len(requests))]
+
+
+async def create_service_now_incidents(requests: list) -> list:
+    """
+    Create several incidents through the ServiceNow Batch API.
+    
+    Requests are sent SERVICENOW_BATCH_SIZE at a time, one round trip per batch.
+    
+    Args:
+        requests: List of SupportRequest objects
+        
+    Returns:
+        list: One create_service_now_incident-style result dict per request, in order
+    """
+    batch_size = get_settings().servicenow_batch_size
+    batches = [requests[start:start + batch_size] for start in range(0, len(requests), batch_size)]
+    logger.info(f"Creating {len(requests)} ServiceNow incidents in {len(batches)} batch call(s)")
+    
+    import httpx
+    
+    async def create_batch(batch: list) -> list:
+        try:
+            return await _create_incident_batch(batch)
+        
+        except CircuitOpenError as e:
+            logger.error(f"ServiceNow batch request rejected: {str(e)}")
+            error_details = {
+                "error_code": "SERVICENOW_CIRCUIT_OPEN",
+                "error_message": str(e),
+                "service": "servicenow"
+            }
+            
+        except DeadlineExceededError as e:
+            logger.error(str(e))
+            error_details = {
+                "error_code": "SERVICENOW_DEADLINE_EXCEEDED",
+                "error_message": str(e),
+                "service": "servicenow"
+            }
+            
+        except httpx.TimeoutException as e:
+            logger.error(f"ServiceNow batch request timed out: {str(e)}")
+            error_details = {
+                "error_code": "SERVICENOW_TIMEOUT",
+                "error_message": str(e) or "ServiceNow request timed out",
+                "service": "servicenow"
+            }
+            
+        except (ServiceNowError, httpx.HTTPError) as e:
+            logger.error(f"ServiceNow batch API error: {str(e)}")
+            error_details = {
+                "error_code": "SERVICENOW_API_ERROR",
+                "error_message": str(e),
+                "service": "servicenow"
+            }
+            
+        except Exception as e:
+            logger.error(f"Unexpected error creating incidents: {str(e)}")
+            error_details = {
+                "error_code": "SERVICENOW_UNEXPECTED_ERROR",
+                "error_message": str(e),
+                "service": "servicenow"
+            }
+        
+        return [
+            {"success": False, "incident_number": None, "incident_sys_id": None, "error_details": error_details}
+            for _ in batch
+        ]
+    
+    results = []
+    for batch_results in await asyncio.gather(*(create_batch(batch) for batch in batches)):
+        results.extend(batch_results)
+    
+    return results
+
+
+def get_assignment_group_prefixes() -> list:
+    """Return the name prefixes that identify our assignment groups."""
+    settings = get_settings()
+    
+    if settings.assignment_group_prefixes:
+        return [prefix.strip() for prefix in settings.assignment_group_prefixes.split(",") if prefix.strip()]
+    
+    return sorted(get_routing_index().routes)
+
+
+def build_assignment_group_query(prefixes: Optional[list] = None) -> str:
+    """
+    Build the encoded query filtering sys_user_group on the ServiceNow side.
+    
+    Args:
+        prefixes: Group name prefixes to match (any of them)
+        
+    Returns:
+        str: ServiceNow encoded query, ordered by name for stable paging
+    """
+    conditions = []
+    
+    if get_settings().assignment_groups_active_only:
+        conditions.append("active=true")
+    
+    if prefixes:
+        # ^OR binds tighter than ^, so this reads active AND (prefix1 OR prefix2 ...)
+        conditions.append("^OR".join(f"nameSTARTSWITH{prefix}" for prefix in prefixes))
+    
+    conditions.append("ORDERBYname")
+    return "^".join(conditions)
+
+
+async def iter_assignment_groups(
+    prefixes: Optional[list] = None,
+    limit: Optional[int] = None
+) -> AsyncIterator[dict]:
+    """
+    Stream assignment groups from ServiceNow one page at a time.
+    
+    Args:
+        prefixes: Group name prefixes to match; defaults to our configured prefixes
+        limit: Maximum number of groups to yield
+        
+    Yields:
+        dict: Assignment group name and sys_id
+        
+    Raises:
+        ServiceNowError: If ServiceNow returns an error status
+        httpx.HTTPError: On connection errors and timeouts
+    """
+    page_size = get_settings().servicenow_page_size
+    query = build_assignment_group_query(prefixes if prefixes is not None else get_assignment_group_prefixes())
+    offset = 0
+    
+    while limit is None or offset < limit:
+        page_limit = page_size if limit is None else min(page_size, limit - offset)
+        response = await table_request(
+            "GET",
+            "sys_user_group",
+            params={
+                "sysparm_query": query,
+                "sysparm_fields": ASSIGNMENT_GROUP_FIELDS,
+                "sysparm_limit": page_limit,
+                "sysparm_offset": offset,
+                "sysparm_exclude_reference_link": "true"
+            }
+        )
+        records = response.json().get("result", [])
+        
+        for record in records:
+            yield {"name": record.get("name"), "sys_id": record.get("sys_id")}
+        
+        if len(records) < page_limit:
+            break
+        offset += len(records)
+
+
+async def fetch_assignment_groups() -> list:
+    """
+    Fetch our assignment groups from ServiceNow, bypassing the cache.
+    
+    Returns:
+        list: List of assignment group names and sys_ids
+        
+    Raises:
+        ServiceNowError: If ServiceNow returns an error status
+        httpx.HTTPError: On connection errors and timeouts
+    """
+    return [group async for group in iter_assignment_groups()]
+
+
+async def get_assignment_groups(prefix: Optional[str] = None, limit: Optional[int] = None) -> list:
     """
     Retrieve available assignment groups from ServiceNow.
     
+    Served from the reference data cache; concurrent misses share a single
+    ServiceNow request.
+    
+    Args:
+        prefix: Only return groups whose name starts with this prefix
+        limit: Maximum number of groups to return
+        
     Returns:
         list: List of assignment group names
     """
     try:
-        client = get_servicenow_client()
-        group_table = client.resource(api_path='/table/sys_user_group')
-        
-        response = group_table.get(query={}, fields=['name', 'sys_id'])
-        groups = [{"name": record.get("name"), "sys_id": record.get("sys_id")} 
-                  for record in response.all()]
-        
-        return groups
+        groups = await get_reference_cache().get("assignment_groups", fetch_assignment_groups)
         
     except Exception as e:
         logger.error(f"Error fetching assignment groups: {str(e)}")
         return []
+    
+    if prefix:
+        prefix_upper = prefix.upper()
+        groups = [group for group in groups if (group["name"] or "").upper().startswith(prefix_upper)]
+    
+    return groups[:limit] if limit is not None else groups
 
 
 def get_categories() -> list:
@@ -0,0 +1,189 @@
+"""Read-mostly data shared by the worker processes of the multi-worker server.
+
+`python -m api.server` forks its workers from a parent that has already
+imported the app and built its settings, routing index and static
+responses. Those pages are shared copy-on-write. Data the workers fetch at
+run time cannot be shared that way: the Slack channel directory and the
+ServiceNow reference lists. That data is published to a SharedStore
+instead. It is a directory of JSON files on /dev/shm (tmpfs, so shared
+memory), replaced atomically on every write.
+
+One worker fetches a key while the others wait for its result. The loader
+is elected with a non-blocking flock on the key's lock file, and the kernel
+releases the lock if that worker dies. A refresh therefore costs one
+downstream call, not one per worker.
+
+What is shared is the fetch and the published bytes. It is not the
+Python objects. Each worker decodes a file once per version and keeps
+that one decoded copy. The reference cache and the channel directory
+use the copy as is. The data is small: a few hundred group names and
+channel IDs. Serving it straight from the mapped bytes would mean
+decoding on every lookup.
+
+When the app runs as a single process, there is no store and every worker
+helper falls back to in-process behaviour.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+_store: Optional["SharedStore"] = None
+_worker_count = 1
+_worker_index = 0
+
+
+def _try_lock(lock_file) -> bool:
+    """Take an exclusive flock without blocking; it is released when the file is closed."""
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+class SharedStore:
+    """Key -> JSON value files shared between processes, with cross-process single-flight loading."""
+
+    def __init__(self, directory: str, poll_interval: float = 0.05):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        # key -> (file identity, decoded entry), so unchanged files are not re-read
+        self._decoded = {}
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def read(self, key: str) -> Optional[tuple]:
+        """
+        Read a published value.
+
+        Returns:
+            tuple: (value, age in seconds), or None if nothing is published
+        """
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            cached = self._decoded.get(key)
+            if cached is None or cached[0] != identity:
+                cached = (identity, json.loads(path.read_bytes()))
+                self._decoded[key] = cached
+        except (FileNotFoundError, ValueError):
+            self._decoded.pop(key, None)
+            return None
+
+        entry = cached[1]
+        return entry["value"], max(0.0, time.time() - entry["written_at"])
+
+    def write(self, key: str, value) -> None:
+        """Publish a JSON-serializable value, replacing the previous one atomically."""
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}")
+        tmp_path.write_text(json.dumps({"written_at": time.time(), "value": value}, separators=(",", ":")))
+        os.replace(tmp_path, path)
+
+    def remove(self, key: str) -> None:
+        """Drop a published key."""
+        self._path(key).unlink(missing_ok=True)
+
+    def keys(self, prefix: str = "") -> list:
+        """Return the published keys starting with `prefix`."""
+        return sorted(path.stem for path in self.directory.glob(f"{prefix}*.json"))
+
+    def clear(self, prefix: str = "") -> None:
+        """Drop every published key starting with `prefix`."""
+        for path in self.directory.glob(f"{prefix}*.json"):
+            path.unlink(missing_ok=True)
+
+    async def get_or_load(self, key: str, max_age: float, loader: Callable[[], Awaitable]) -> tuple:
+        """
+        Return a value published within `max_age` seconds, or load and publish it.
+
+        Only one process runs `loader` for a key at a time. The others poll
+        until it publishes, and take over if it fails or dies.
+
+        Args:
+            key: Store key
+            max_age: Oldest published value to accept, in seconds
+            loader: Coroutine function returning a fresh JSON-serializable value
+
+        Returns:
+            tuple: (value, age in seconds)
+
+        Raises:
+            Exception: Whatever `loader` raised
+        """
+        while True:
+            entry = self.read(key)
+            if entry is not None and entry[1] < max_age:
+                return entry
+
+            with open(self.directory / f"{key}.lock", "w") as lock_file:
+                if _try_lock(lock_file):
+                    # Another process may have published while we took the lock
+                    entry = self.read(key)
+                    if entry is not None and entry[1] < max_age:
+                        return entry
+
+                    value = await loader()
+                    self.write(key, value)
+                    return value, 0.0
+
+            await asyncio.sleep(self.poll_interval)
+
+    def snapshot(self) -> dict:
+        """Return the age and size of every published key."""
+        keys = {}
+        for path in sorted(self.directory.glob("*.json")):
+            entry = self.read(path.stem)
+            if entry is not None:
+                keys[path.stem] = {"age_seconds": round(entry[1], 1), "bytes": self._decoded[path.stem][0][2]}
+        return {"directory": str(self.directory), "keys": keys}
+
+
+def configure_workers(worker_count: int, directory: Optional[str] = None) -> Optional[SharedStore]:
+    """
+    Record how many worker processes serve the app and open their shared store.
+
+    Called by the server before it forks its workers.
+
+    Args:
+        worker_count: Number of worker processes
+        directory: Directory for the shared store, or None for no store
+
+    Returns:
+        SharedStore: The shared store, or None
+    """
+    global _store, _worker_count
+
+    _worker_count = max(1, worker_count)
+    _store = SharedStore(directory) if directory else None
+    return _store
+
+
+def get_shared_store() -> Optional[SharedStore]:
+    """Return the store shared with the other workers, or None in a single-process server."""
+    return _store
+
+
+def get_worker_count() -> int:
+    """Return the number of worker processes serving the app."""
+    return _worker_count
+
+
+def set_worker_index(index: int) -> None:
+    """Record which worker this process is; called in each worker right after the fork."""
+    global _worker_index
+
+    _worker_index = index
+
+
+def get_worker_index() -> int:
+    """Return this worker's index, stable across restarts of the worker."""
+    return _worker_index
@@ -1,22 +1,150 @@
 """Slack client helper functions."""
 
+import asyncio
+import contextvars
 import logging
-from typing import Optional
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+import time
+from typing import TYPE_CHECKING, Iterable, Optional
 
 from .config import get_settings
+from .circuit_breaker import CircuitOpenError, downstream_call
+from .deadline import DeadlineExceededError, remaining_budget, run_detached, wait_shared
+from .metrics import record_error
+from .rate_limit import RateLimitScheduler, RateLimitWaitError, TokenBucket
+from .shared_state import get_shared_store, get_worker_count
+
+# aiohttp and slack_sdk are imported when the client is first created (by the
+# background channel directory load), so importing the app does not pay for them
+if TYPE_CHECKING:
+    import aiohttp
+    from slack_sdk.web.async_client import AsyncWebClient
 
 logger = logging.getLogger(__name__)
 
+# Process-wide Slack client and its keep-alive HTTP session, created on first use
+_client: Optional["AsyncWebClient"] = None
+_session: Optional["aiohttp.ClientSession"] = None
+_directory: Optional["ChannelDirectory"] = None
+_digest: Optional["IncidentDigest"] = None
+_scheduler: Optional[RateLimitScheduler] = None
+
+# Slack Web API methods in rate limit Tier 2 (20+ per minute)
+TIER_2_METHODS = ("conversations.create", "conversations.list")
+
+# Incidents listed per message; each takes one block next to the header and divider
+MAX_INCIDENTS_PER_MESSAGE = 40
+
+# Counters for Slack retries, time spent waiting on rate limits and digests
+_stats = {
+    "retries": 0,
+    "rate_limited": 0,
+    "throttled_seconds": 0.0,
+    "digest_held": 0,
+    "digest_messages": 0
+}
+
+
+def get_slack_client() -> "AsyncWebClient":
+    """Return the shared Slack AsyncWebClient, creating it on first use."""
+    global _client, _session
+    
+    if _client is None or _session is None or _session.closed:
+        import aiohttp
+        from slack_sdk.web.async_client import AsyncWebClient
+        
+        from .slack_retry import CountingConnectionErrorRetryHandler, CountingRateLimitRetryHandler
+        
+        settings = get_settings()
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.slack_max_connections,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            )
+        )
+        _client = AsyncWebClient(
+            token=settings.slack_bot_token,
+            base_url=settings.slack_api_url,
+            session=_session,
+            timeout=int(settings.slack_timeout),
+            retry_handlers=[
+                CountingConnectionErrorRetryHandler(_stats),
+                CountingRateLimitRetryHandler(_stats, max_retry_count=settings.slack_max_retries)
+            ]
+        )
+    
+    return _client
+
+
+async def close_slack_client() -> None:
+    """Close the shared Slack HTTP session."""
+    global _client, _session
+    
+    if _session is not None and not _session.closed:
+        await _session.close()
+    
+    _client = None
+    _session = None
+
 
-def get_slack_client() -> WebClient:
-    """Create and return a Slack WebClient instance."""
+def get_slack_stats() -> dict:
+    """Return retry and rate-limit counters and outbound queue statistics for Slack."""
+    return {**_stats, "scheduler": get_slack_scheduler().snapshot()}
+
+
+def _slack_bucket(key: tuple) -> Optional[TokenBucket]:
+    """
+    Token bucket for a Slack method, or for a method and channel.
+    
+    Slack's limits apply to the app as a whole, so under the multi-worker
+    server each worker gets an equal share of them.
+    """
     settings = get_settings()
-    return WebClient(token=settings.slack_bot_token)
+    workers = get_worker_count()
+    method = key[0]
+    
+    if method == "chat.postMessage":
+        if len(key) > 1:
+            return TokenBucket(settings.slack_post_channel_rate / workers, settings.slack_post_burst / workers)
+        rate = settings.slack_post_rate_per_minute / 60 / workers
+        return TokenBucket(rate, rate)
+    
+    if method in TIER_2_METHODS and len(key) == 1:
+        return TokenBucket(settings.slack_tier2_rate_per_minute / 60 / workers, settings.slack_tier2_burst / workers)
+    
+    return None
+
+
+def get_slack_scheduler() -> RateLimitScheduler:
+    """Return the process-wide scheduler pacing outbound Slack calls."""
+    global _scheduler
+    
+    if _scheduler is None:
+        _scheduler = RateLimitScheduler("slack", _slack_bucket)
+    
+    return _scheduler
 
 
-def create_channel(channel_name: str, is_private: bool = False) -> dict:
+async def pace(method: str, channel: Optional[str] = None) -> None:
+    """
+    Wait for Slack's rate limits to allow a call.
+    
+    Background work waits as long as needed; within a request the wait is
+    capped by SLACK_QUEUE_MAX_WAIT and the remaining budget.
+    
+    Raises:
+        RateLimitWaitError: If the call would have to wait longer than allowed
+    """
+    settings = get_settings()
+    if not settings.slack_pacing_enabled:
+        return
+    
+    remaining = remaining_budget()
+    max_wait = None if remaining is None else min(settings.slack_queue_max_wait, remaining)
+    await get_slack_scheduler().acquire(method, [channel_key(channel)] if channel else [], max_wait)
+
+
+async def create_channel(channel_name: str, is_private: bool = False) -> dict:
     """
     Create a new Slack channel.
     
@@ -36,17 +164,45 @@ def create_channel(channel_name: str, is_private: bool = False) -> dict:
     # Remove # prefix if present
     channel_name = channel_name.lstrip('#')
     
+    from slack_sdk.errors import SlackApiError
+    
     try:
         client = get_slack_client()
-        response = client.conversations_create(
-            name=channel_name,
-            is_private=is_private
-        )
+        await pace("conversations.create")
+        with downstream_call("slack", "conversations.create", stage="slack_channel_create"):
+            response = await client.conversations_create(
+                name=channel_name,
+                is_private=is_private
+            )
         
         result["success"] = response["ok"]
         result["channel_id"] = response["channel"]["id"]
         logger.info(f"Successfully created Slack channel: {channel_name}")
         
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping Slack channel creation: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SLACK_CIRCUIT_OPEN",
+            "error_message": str(e),
+            "service": "slack"
+        }
+        
+    except DeadlineExceededError as e:
+        logger.warning(f"Skipping Slack channel creation: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SLACK_DEADLINE_EXCEEDED",
+            "error_message": str(e),
+            "service": "slack"
+        }
+        
+    except RateLimitWaitError as e:
+        logger.warning(f"Skipping Slack channel creation: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SLACK_RATE_LIMITED",
+            "error_message": str(e),
+            "service": "slack"
+        }
+        
     except SlackApiError as e:
         error_msg = e.response['error']
         logger.error(f"Slack API error creating channel: {error_msg}")
@@ -67,8 +223,227 @@ def create_channel(channel_name: str, is_private: bool = False) -> dict:
     return result
 
 
-def send_slack_message(
-    channel: Optional[str] = None,
+def channel_key(channel: str) -> str:
+    """Return the directory key for a channel name ("#Cloud-Support" -> "cloud-support")."""
+    return channel.lstrip('#').lower()
+
+
+class ChannelDirectory:
+    """Cache of Slack channel names to channel IDs."""
+
+    def __init__(self):
+        self._ids = {}
+        self._creating = {}
+        self._unavailable = set()
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    async def load(self, provision: Iterable[str] = ()) -> None:
+        """
+        Load every channel the bot can see, creating missing channels in `provision`.
+        
+        Under the multi-worker server one worker lists (and provisions) the
+        channels and publishes the directory; the others reuse it while it
+        is less than half a refresh interval old, so workers refreshing at
+        about the same time cost one conversations.list between them.
+        
+        Args:
+            provision: Channels that must exist
+            
+        Raises:
+            SlackApiError: If Slack rejects the request
+        """
+        async def list_and_provision() -> dict:
+            self._ids = await self._list_channels()
+            self._unavailable.clear()
+            await self.provision(provision)
+            return self._ids
+        
+        store = get_shared_store()
+        if store is None:
+            await list_and_provision()
+        else:
+            max_age = get_settings().slack_directory_refresh_interval / 2
+            ids, _ = await store.get_or_load("slack_channels", max_age, list_and_provision)
+            # Unless this worker did the loading, adopt the published copy.
+            # It is the store's decoded dict, so it is replaced, never mutated
+            if ids is not self._ids:
+                self._ids = ids
+                self._unavailable.clear()
+        
+        self.loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(self._ids)} Slack channels into the channel directory")
+
+    async def _list_channels(self) -> dict:
+        """Return every channel the bot can see with one paginated conversations.list."""
+        client = get_slack_client()
+        types = get_settings().slack_channel_types
+        ids = {}
+        cursor = None
+        
+        while True:
+            await pace("conversations.list")
+            with downstream_call("slack", "conversations.list"):
+                response = await client.conversations_list(
+                    types=types,
+                    exclude_archived=True,
+                    limit=1000,
+                    cursor=cursor
+                )
+            for channel in response["channels"]:
+                ids[channel_key(channel["name"])] = channel["id"]
+            
+            cursor = (response.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                break
+        
+        return ids
+
+    def resolve(self, channel: str) -> Optional[str]:
+        """Return the cached ID of a channel, or None if it is not known."""
+        return self._ids.get(channel_key(channel))
+
+    def forget(self, channel: str) -> None:
+        """Drop a channel whose cached ID turned out to be stale."""
+        key = channel_key(channel)
+        if key in self._ids:
+            self._ids = {name: channel_id for name, channel_id in self._ids.items() if name != key}
+
+    async def ensure(self, channel: str, create: bool = False) -> Optional[str]:
+        """
+        Return the ID of a channel, creating the channel if it does not exist.
+        
+        Channels are only created when the directory is loaded (so a miss
+        really means the channel is missing) or when `create` is True.
+        Concurrent calls for the same channel share one creation, including
+        one started by the startup provisioning, and a channel that could
+        not be created is not retried until the next reload unless `create`
+        is True.
+        
+        Args:
+            channel: Channel name, with or without # prefix
+            create: Create the channel even if the directory is not loaded
+            
+        Returns:
+            str: The channel ID, or None if it is unknown and could not be created
+                 (or its creation did not finish within the caller's deadline)
+        """
+        channel_id = self.resolve(channel)
+        if channel_id is not None:
+            return channel_id
+        
+        key = channel_key(channel)
+        task = self._creating.get(key)
+        if task is None and not create and (not self.loaded or key in self._unavailable):
+            return None
+        
+        if task is None:
+            # The creation is shared, so it runs outside any one caller's deadline
+            task = run_detached(self._create(key))
+            self._creating[key] = task
+            task.add_done_callback(lambda done: self._creating.pop(key, None))
+        
+        try:
+            await wait_shared(task)
+        except asyncio.TimeoutError:
+            return None
+        
+        return self._ids.get(key)
+
+    async def _create(self, key: str) -> None:
+        """Create a channel and record its ID, or that it is unavailable."""
+        create_result = await create_channel(key)
+        if create_result["success"]:
+            self._ids = {**self._ids, key: create_result["channel_id"]}
+            self._unavailable.discard(key)
+        elif create_result["error_details"]["error_code"] not in ("SLACK_CIRCUIT_OPEN", "SLACK_DEADLINE_EXCEEDED", "SLACK_RATE_LIMITED"):
+            self._unavailable.add(key)
+
+    async def provision(self, channels: Iterable[str]) -> None:
+        """Make sure every channel in `channels` exists, creating missing ones."""
+        missing = {channel_key(channel) for channel in channels if channel and self.resolve(channel) is None}
+        if missing:
+            logger.info(f"Creating {len(missing)} missing Slack channels: {', '.join(sorted(missing))}")
+            await asyncio.gather(*(self.ensure(channel, create=True) for channel in missing))
+
+    async def run_refresh(self, interval: float) -> None:
+        """Reload the directory every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+            except Exception as e:
+                logger.warning(f"Failed to refresh Slack channel directory: {str(e)}")
+
+
+def get_channel_directory() -> ChannelDirectory:
+    """Return the process-wide Slack channel directory."""
+    global _directory
+    
+    if _directory is None:
+        _directory = ChannelDirectory()
+    
+    return _directory
+
+
+def start_channel_directory(channels: Iterable[str]) -> Optional[asyncio.Task]:
+    """
+    Start loading the channel directory, creating missing routed channels, and refreshing it.
+    
+    Startup does not wait for the load: creating channels is paced at
+    Slack's Tier 2 rate and may be held up by a 429. Until the directory is
+    loaded, messages post by channel name. Failures are logged rather than
+    raised.
+    
+    Args:
+        channels: Channels messages may be routed to
+        
+    Returns:
+        asyncio.Task: The background load and refresh task, or None if Slack is not configured
+    """
+    settings = get_settings()
+    if not settings.slack_bot_token:
+        return None
+    
+    provision = channels if settings.slack_provision_channels else ()
+    return asyncio.create_task(
+        _load_and_refresh(get_channel_directory(), provision, settings.slack_directory_refresh_interval)
+    )
+
+
+async def _load_and_refresh(directory: ChannelDirectory, provision: Iterable[str], interval: float) -> None:
+    start = time.perf_counter()
+    try:
+        await directory.load(provision)
+        logger.info(f"Slack channel directory ready after {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        logger.warning(f"Failed to load Slack channel directory, posting by channel name: {str(e)}")
+    
+    await directory.run_refresh(interval)
+
+
+def normalize_channel(channel: Optional[str]) -> str:
+    """Return the channel to post to, falling back to the default and adding the # prefix."""
+    if not channel:
+        channel = get_settings().slack_default_channel
+    
+    # Ensure channel has # prefix
+    if channel and not channel.startswith('#'):
+        channel = f'#{channel}'
+    
+    return channel
+
+
+def get_incident_url(incident_number: str) -> str:
+    """Return the ServiceNow link for an incident."""
+    settings = get_settings()
+    return f"https://{settings.servicenow_instance}/nav_to.do?uri=incident.do?sysparm_query=number={incident_number}"
+
+
+def build_incident_blocks(
     incident_number: Optional[str] = None,
     short_description: str = "",
     description: Optional[str] = None,
@@ -76,159 +451,238 @@ def send_slack_message(
     urgency: Optional[str] = None,
     impact: Optional[str] = None,
     caller: Optional[str] = None
-) -> dict:
+) -> list:
     """
-    Send a Slack notification about a new incident.
+    Build the Block Kit blocks for a single incident notification.
+    
+    Returns:
+        list: Slack message blocks
+    """
+    # Build the message blocks for rich formatting
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"🎫 New Incident Created: {incident_number or 'N/A'}",
+                "emoji": True
+            }
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*{short_description}*"
+            }
+        },
+        {
+            "type": "divider"
+        }
+    ]
+    
+    # Add incident details section
+    fields = []
+    
+    if assignment_group:
+        fields.append({
+            "type": "mrkdwn",
+            "text": f"*Assignment Group:*\n{assignment_group}"
+        })
+        
+    if urgency:
+        urgency_emoji = get_urgency_emoji(urgency)
+        fields.append({
+            "type": "mrkdwn",
+            "text": f"*Urgency:*\n{urgency_emoji} {urgency}"
+        })
+        
+    if impact:
+        fields.append({
+            "type": "mrkdwn",
+            "text": f"*Impact:*\n{impact}"
+        })
+        
+    if caller:
+        fields.append({
+            "type": "mrkdwn",
+            "text": f"*Reported By:*\n{caller}"
+        })
+    
+    if fields:
+        blocks.append({
+            "type": "section",
+            "fields": fields
+        })
+    
+    # Add description if provided
+    if description:
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": f"*Description:*\n{description[:500]}{'...' if len(description) > 500 else ''}"
+            }
+        })
+    
+    # Add link to ServiceNow (if incident number exists)
+    if incident_number:
+        blocks.append({
+            "type": "actions",
+            "elements": [
+                {
+                    "type": "button",
+                    "text": {
+                        "type": "plain_text",
+                        "text": "View in ServiceNow",
+                        "emoji": True
+                    },
+                    "url": get_incident_url(incident_number),
+                    "style": "primary"
+                }
+            ]
+        })
+    
+    return blocks
+
+
+def build_incident_list_blocks(incidents: list) -> list:
+    """
+    Build the Block Kit blocks listing several incidents in one message.
     
     Args:
-        channel: Slack channel to post to (defaults to configured channel)
-        incident_number: The ServiceNow incident number
-        short_description: Brief summary of the incident
-        description: Detailed description of the incident
-        assignment_group: The assigned support group
-        urgency: Urgency level
-        impact: Impact level
-        caller: Username of the person who reported the incident
+        incidents: Dicts with incident_number, short_description, assignment_group and urgency
         
     Returns:
-        dict: Contains success status and any error details
+        list: Slack message blocks
+    """
+    blocks = [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"🎫 {len(incidents)} New Incidents Created",
+                "emoji": True
+            }
+        },
+        {
+            "type": "divider"
+        }
+    ]
+    
+    for incident in incidents:
+        incident_number = incident.get("incident_number") or "N/A"
+        lines = [f"*<{get_incident_url(incident_number)}|{incident_number}>* {incident.get('short_description', '')}"]
+        
+        details = []
+        if incident.get("urgency"):
+            details.append(f"{get_urgency_emoji(incident['urgency'])} Urgency {incident['urgency']}")
+        if incident.get("assignment_group"):
+            details.append(incident["assignment_group"])
+        if details:
+            lines.append(" · ".join(details))
+        
+        blocks.append({
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "\n".join(lines)
+            }
+        })
+    
+    return blocks
+
+
+async def post_message(channel: str, text: str, blocks: list, thread_ts: Optional[str] = None) -> dict:
+    """
+    Post a message, by channel ID when the channel directory knows it.
+    
+    Args:
+        channel: Slack channel to post to (with # prefix)
+        text: Fallback text for notifications
+        blocks: Block Kit blocks
+        thread_ts: Timestamp of the message to reply to, if posting in a thread
+        
+    Returns:
+        dict: Contains success status, the channel and its ID, the message
+              timestamp and any error details
     """
-    settings = get_settings()
     result = {
         "success": False,
-        "channel": None,
+        "channel": channel,
+        "channel_id": None,
+        "ts": None,
         "error_details": None
     }
     
-    # Use default channel if not specified
-    if not channel:
-        channel = settings.slack_default_channel
-    
-    # Ensure channel has # prefix
-    if channel and not channel.startswith('#'):
-        channel = f'#{channel}'
-    
-    # Store the channel being used in the result
-    result["channel"] = channel
+    from slack_sdk.errors import SlackApiError
     
     try:
         client = get_slack_client()
+        directory = get_channel_directory()
+        result["channel_id"] = await directory.ensure(channel)
         
-        # Build the message blocks for rich formatting
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"🎫 New Incident Created: {incident_number or 'N/A'}",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*{short_description}*"
-                }
-            },
-            {
-                "type": "divider"
-            }
-        ]
-        
-        # Add incident details section
-        fields = []
-        
-        if assignment_group:
-            fields.append({
-                "type": "mrkdwn",
-                "text": f"*Assignment Group:*\n{assignment_group}"
-            })
-            
-        if urgency:
-            urgency_emoji = get_urgency_emoji(urgency)
-            fields.append({
-                "type": "mrkdwn",
-                "text": f"*Urgency:*\n{urgency_emoji} {urgency}"
-            })
-            
-        if impact:
-            fields.append({
-                "type": "mrkdwn",
-                "text": f"*Impact:*\n{impact}"
-            })
-            
-        if caller:
-            fields.append({
-                "type": "mrkdwn",
-                "text": f"*Reported By:*\n{caller}"
-            })
-        
-        if fields:
-            blocks.append({
-                "type": "section",
-                "fields": fields
-            })
-        
-        # Add description if provided
-        if description:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Description:*\n{description[:500]}{'...' if len(description) > 500 else ''}"
-                }
-            })
-        
-        # Add link to ServiceNow (if incident number exists)
-        if incident_number:
-            servicenow_url = f"https://{settings.servicenow_instance}/nav_to.do?uri=incident.do?sysparm_query=number={incident_number}"
-            blocks.append({
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {
-                            "type": "plain_text",
-                            "text": "View in ServiceNow",
-                            "emoji": True
-                        },
-                        "url": servicenow_url,
-                        "style": "primary"
-                    }
-                ]
-            })
-        
-        # Send the message
+        # Send the message once the channel's rate limit allows
         try:
-            response = client.chat_postMessage(
-                channel=channel,
-                text=f"New Incident: {incident_number} - {short_description}",  # Fallback text
-                blocks=blocks
-            )
+            await pace("chat.postMessage", channel)
+            with downstream_call("slack", "chat.postMessage"):
+                response = await client.chat_postMessage(
+                    channel=result["channel_id"] or channel,
+                    text=text,  # Fallback text
+                    blocks=blocks,
+                    thread_ts=thread_ts
+                )
             result["success"] = response["ok"]
+            result["ts"] = response.get("ts")
             logger.info(f"Successfully sent Slack message to {channel}")
             
         except SlackApiError as e:
-            # If channel not found, try to create it
+            # The cached ID is stale or the channel is missing; recreate it once
             if e.response['error'] == 'channel_not_found':
                 logger.info(f"Channel {channel} not found, attempting to create it...")
-                create_result = create_channel(channel)
+                directory.forget(channel)
+                result["channel_id"] = await directory.ensure(channel, create=True)
                 
-                if create_result["success"]:
+                if result["channel_id"]:
                     # Retry sending the message to the newly created channel
-                    response = client.chat_postMessage(
-                        channel=channel,
-                        text=f"New Incident: {incident_number} - {short_description}",
-                        blocks=blocks
-                    )
+                    await pace("chat.postMessage", channel)
+                    with downstream_call("slack", "chat.postMessage"):
+                        response = await client.chat_postMessage(
+                            channel=result["channel_id"],
+                            text=text,
+                            blocks=blocks
+                        )
                     result["success"] = response["ok"]
+                    result["ts"] = response.get("ts")
                     logger.info(f"Successfully sent Slack message to newly created channel {channel}")
                 else:
                     raise e
             else:
                 raise e
         
+    except CircuitOpenError as e:
+        logger.warning(f"Skipping Slack message: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SLACK_CIRCUIT_OPEN",
+            "error_message": str(e),
+            "service": "slack"
+        }
+        
+    except DeadlineExceededError as e:
+        logger.warning(f"Skipping Slack message: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SLACK_DEADLINE_EXCEEDED",
+            "error_message": str(e),
+            "service": "slack"
+        }
+        
+    except RateLimitWaitError as e:
+        logger.warning(f"Skipping Slack message: {str(e)}")
+        result["error_details"] = {
+            "error_code": "SLACK_RATE_LIMITED",
+            "error_message": str(e),
+            "service": "slack"
+        }
+        
     except SlackApiError as e:
         logger.error(f"Slack API error: {e.response['error']}")
         result["error_details"] = {
@@ -248,6 +702,253 @@ def send_slack_message(
     return result
 
 
+async def send_slack_message(
+    channel: Optional[str] = None,
+    incident_number: Optional[str] = None,
+    short_description: str = "",
+    description: Optional[str] = None,
+    assignment_group: Optional[str] = None,
+    urgency: Optional[str] = None,
+    impact: Optional[str] = None,
+    caller: Optional[str] = None,
+    hold_for_digest: bool = True
+) -> dict:
+    """
+    Send a Slack notification about a new incident.
+    
+    Args:
+        channel: Slack channel to post to (defaults to configured channel)
+        incident_number: The ServiceNow incident number
+        short_description: Brief summary of the incident
+        description: Detailed description of the incident
+        assignment_group: The assigned support group
+        urgency: Urgency level
+        impact: Impact level
+        caller: Username of the person who reported the incident
+        hold_for_digest: Whether the incident may be held for a digest. Held
+                         incidents only live in memory until the digest is
+                         posted, so durable callers (the outbox) pass False.
+        
+    Returns:
+        dict: Contains success status and any error details
+    """
+    channel = normalize_channel(channel)
+    
+    # During a burst, hold the incident for the channel's next digest
+    digest = get_incident_digest()
+    if hold_for_digest and digest.hold(channel, {
+        "incident_number": incident_number,
+        "short_description": short_description,
+        "assignment_group": assignment_group,
+        "urgency": urgency
+    }):
+        return {"success": True, "channel": channel, "channel_id": None, "ts": None, "digest": True, "error_details": None}
+    
+    blocks = build_incident_blocks(
+        incident_number=incident_number,
+        short_description=short_description,
+        description=description,
+        assignment_group=assignment_group,
+        urgency=urgency,
+        impact=impact,
+        caller=caller
+    )
+    
+    result = await post_message(
+        channel,
+        f"New Incident: {incident_number} - {short_description}",
+        blocks
+    )
+    if hold_for_digest:
+        if result["success"]:
+            digest.opened(channel, result.get("ts"))
+        else:
+            digest.abandon(channel)
+    return result
+
+
+async def send_slack_incident_list(channel: Optional[str], incidents: list) -> dict:
+    """
+    Send one Slack message listing several new incidents.
+    
+    Args:
+        channel: Slack channel to post to (defaults to configured channel)
+        incidents: Dicts with incident_number, short_description, assignment_group and urgency
+        
+    Returns:
+        dict: Contains success status and any error details
+    """
+    return await post_incident_list(normalize_channel(channel), incidents)
+
+
+async def post_incident_list(channel: str, incidents: list, thread_ts: Optional[str] = None) -> dict:
+    """Post incident list messages to a normalized channel, optionally in a thread."""
+    if not incidents:
+        return {"success": True, "channel": channel, "error_details": None}
+    
+    # Slack allows at most 50 blocks per message
+    results = []
+    for start in range(0, len(incidents), MAX_INCIDENTS_PER_MESSAGE):
+        chunk = incidents[start:start + MAX_INCIDENTS_PER_MESSAGE]
+        numbers = ", ".join(incident.get("incident_number") or "N/A" for incident in chunk)
+        results.append(await post_message(
+            channel,
+            f"{len(chunk)} New Incidents: {numbers}",
+            build_incident_list_blocks(chunk),
+            thread_ts=thread_ts
+        ))
+    
+    failed = [result for result in results if not result["success"]]
+    return failed[0] if failed else results[0]
+
+
+def parse_digest_windows(value: str) -> dict:
+    """Parse "2:30,3:60" into {"2": 30.0, "3": 60.0}; malformed entries are skipped."""
+    windows = {}
+    for entry in value.split(","):
+        urgency, _, seconds = entry.partition(":")
+        try:
+            windows[urgency.strip()] = float(seconds)
+        except ValueError:
+            continue
+    return windows
+
+
+class IncidentDigest:
+    """
+    Coalesces bursts of incident notifications per channel.
+    
+    The first incident in a channel is posted right away and opens a
+    coalescing window. Incidents arriving while the window is open are held
+    and, when it closes, posted together as one digest message ("digest"
+    mode) or as one reply in the first message's thread ("thread" mode).
+    Each flush opens the next window, so a sustained burst costs one
+    message per window. Windows are set per urgency; urgency 1 is never held.
+    """
+
+    MODES = ("digest", "thread")
+
+    def __init__(self, mode: str = "off", default_window: float = 60.0, windows: Optional[dict] = None):
+        self.mode = mode
+        self.default_window = default_window
+        self.windows = windows or {}
+        self._channels = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in self.MODES
+
+    def window(self, urgency: Optional[str]) -> float:
+        """Return the coalescing window in seconds for an urgency."""
+        if urgency == "1":
+            return 0.0
+        return self.windows.get(urgency, self.default_window)
+
+    def hold(self, channel: str, incident: dict) -> bool:
+        """
+        Hold an incident for its channel's next digest if a window is open.
+        
+        Args:
+            channel: Normalized Slack channel
+            incident: Dict with incident_number, short_description, assignment_group and urgency
+            
+        Returns:
+            bool: True if the incident was held; False if it should be posted
+                  now, in which case a new window is opened for the channel
+        """
+        window = self.window(incident.get("urgency"))
+        if not self.enabled or window <= 0:
+            return False
+        
+        now = time.monotonic()
+        state = self._channels.setdefault(channel_key(channel), {
+            "channel": channel,
+            "opened_at": None,
+            "thread_ts": None,
+            "pending": [],
+            "due": None,
+            "task": None
+        })
+        
+        if state["opened_at"] is None or now >= state["opened_at"] + window:
+            # Opened before posting, so concurrent incidents are held rather than posted too
+            state["opened_at"] = now
+            state["thread_ts"] = None
+            return False
+        
+        state["pending"].append(incident)
+        _stats["digest_held"] += 1
+        
+        due = state["opened_at"] + window
+        if state["due"] is None or due < state["due"]:
+            state["due"] = due
+            if state["task"] is not None:
+                state["task"].cancel()
+            # A fresh context: the flush must not inherit this request's deadline
+            state["task"] = asyncio.get_running_loop().create_task(
+                self._flush_later(state), context=contextvars.Context()
+            )
+        
+        return True
+
+    def opened(self, channel: str, ts: Optional[str]) -> None:
+        """Remember the message that opened a channel's window, for thread replies."""
+        state = self._channels.get(channel_key(channel))
+        if state is not None and ts:
+            state["thread_ts"] = ts
+
+    def abandon(self, channel: str) -> None:
+        """Close a window whose opening message failed, so the next incident is posted right away."""
+        state = self._channels.get(channel_key(channel))
+        if state is not None:
+            state["opened_at"] = None
+            state["thread_ts"] = None
+
+    async def _flush_later(self, state: dict) -> None:
+        await asyncio.sleep(max(0.0, state["due"] - time.monotonic()))
+        state["task"] = None
+        await self._flush(state)
+
+    async def _flush(self, state: dict) -> None:
+        incidents = state["pending"]
+        if not incidents:
+            return
+        
+        state["pending"] = []
+        state["due"] = None
+        state["opened_at"] = time.monotonic()
+        thread_ts = state["thread_ts"] if self.mode == "thread" else None
+        
+        result = await post_incident_list(state["channel"], incidents, thread_ts=thread_ts)
+        _stats["digest_messages"] += 1
+        if not result["success"]:
+            logger.warning(f"Failed to post Slack digest of {len(incidents)} incidents to {state['channel']}: {result['error_details']}")
+            record_error(result["error_details"])
+
+    async def flush(self) -> None:
+        """Post every held incident now, e.g. on shutdown."""
+        for state in list(self._channels.values()):
+            if state["task"] is not None:
+                state["task"].cancel()
+                state["task"] = None
+            await self._flush(state)
+
+
+def get_incident_digest() -> IncidentDigest:
+    """Return the process-wide incident digest."""
+    global _digest
+    
+    if _digest is None:
+        settings = get_settings()
+        _digest = IncidentDigest(
+            mode=settings.slack_digest_mode,
+            default_window=settings.slack_digest_window,
+            windows=parse_digest_windows(settings.slack_digest_windows)
+        )
+    
+    return _digest
+
+
 def get_urgency_emoji(urgency: str) -> str:
     """Return an emoji based on urgency level."""
     urgency_lower = urgency.lower()
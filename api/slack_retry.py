@@ -0,0 +1,63 @@
+"""Retry handlers for the Slack AsyncWebClient that count what they do.
+
+They subclass slack_sdk's handlers, so this module is only imported when
+the Slack client is created (see slack_client.get_slack_client).
+"""
+
+import asyncio
+import logging
+import random
+
+from slack_sdk.http_retry.builtin_async_handlers import (
+    AsyncConnectionErrorRetryHandler,
+    AsyncRateLimitErrorRetryHandler
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CountingRateLimitRetryHandler(AsyncRateLimitErrorRetryHandler):
+    """Retry 429 responses after Retry-After, recording how long we were throttled."""
+
+    def __init__(self, stats: dict, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def prepare_for_next_attempt_async(self, *, state, request, response=None, error=None) -> None:
+        if response is None:
+            raise error
+
+        retry_after = None
+        for name, values in response.headers.items():
+            if name.lower() == "retry-after":
+                retry_after = values[0] if isinstance(values, list) else values
+                break
+
+        try:
+            duration = float(retry_after) if retry_after is not None else 1.0
+        except ValueError:
+            duration = 1.0
+        duration += random.random()
+
+        self.stats["retries"] += 1
+        self.stats["rate_limited"] += 1
+        self.stats["throttled_seconds"] += duration
+        logger.warning(f"Slack rate limited {request.url}, retrying in {duration:.1f}s")
+
+        state.next_attempt_requested = True
+        await asyncio.sleep(duration)
+        state.increment_current_attempt()
+
+
+class CountingConnectionErrorRetryHandler(AsyncConnectionErrorRetryHandler):
+    """Retry dropped connections, recording each retry."""
+
+    def __init__(self, stats: dict, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def prepare_for_next_attempt_async(self, *, state, request, response=None, error=None) -> None:
+        self.stats["retries"] += 1
+        await super().prepare_for_next_attempt_async(
+            state=state, request=request, response=response, error=error
+        )
@@ -0,0 +1,202 @@
+"""Startup profiling and pre-warming.
+
+Run as a command, this module reports how long each module takes to import
+and how long the app takes to build:
+
+    python -m api.startup                 # slowest 25 modules
+    python -m api.startup --top 50 --min-ms 5
+
+At startup, prewarm() pays the first request's cold-start costs before the
+readiness probe passes:
+- It resolves the downstream hosts.
+- It imports PyGithub, which is otherwise deferred until the first stack
+  trace.
+- It builds the GitHub client and fetches /rate_limit (not counted against
+  the limit) to open its connection.
+- It loads the ServiceNow assignment groups into the reference cache.
+- It builds the OpenAPI schema.
+The Slack connection pool is warmed by the channel directory load, which
+runs in the background and is not waited for.
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import subprocess
+import sys
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_status = {"ready": False, "seconds": None, "steps": {}}
+
+
+def get_prewarm_status() -> dict:
+    """Return whether start-up pre-warming has finished, with each step's outcome."""
+    return _status
+
+
+def mark_ready() -> None:
+    """Let the readiness probe pass without pre-warming."""
+    _status["ready"] = True
+
+
+def downstream_hosts() -> list:
+    """Return the host names of the configured downstream APIs."""
+    from .servicenow_client import get_servicenow_base_url
+
+    settings = get_settings()
+    urls = [settings.slack_api_url, settings.github_api_url]
+    if settings.servicenow_username:
+        urls.append(get_servicenow_base_url())
+    return sorted({urlsplit(url).hostname for url in urls if urlsplit(url).hostname})
+
+
+async def _resolve_hosts() -> None:
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.getaddrinfo(host, 443) for host in downstream_hosts()),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            raise result
+
+
+def _warm_github() -> None:
+    from .github_client import get_github_client
+
+    importlib.import_module("github")
+    client = get_github_client()
+    if get_settings().github_token:
+        client.get_rate_limit()
+
+
+async def _warm_servicenow() -> None:
+    from .servicenow_client import get_assignment_groups
+
+    if get_settings().servicenow_username:
+        await get_assignment_groups()
+
+
+async def _timed_step(name: str, step) -> None:
+    start = time.perf_counter()
+    try:
+        await step
+        _status["steps"][name] = {"ok": True}
+    except Exception as e:
+        logger.warning(f"Startup pre-warm step '{name}' failed: {str(e)}")
+        _status["steps"][name] = {"ok": False, "error": str(e)}
+    _status["steps"][name]["seconds"] = round(time.perf_counter() - start, 3)
+
+
+async def prewarm(app, timeout: Optional[float] = None) -> dict:
+    """
+    Pay the cold-start costs of the first request, then mark the app ready.
+
+    Steps run concurrently and are best effort: a failing step is logged,
+    and the app becomes ready after `timeout` seconds even if some steps
+    have not finished.
+
+    Args:
+        app: The FastAPI application whose OpenAPI schema to build
+        timeout: Seconds to spend pre-warming, or None for no limit
+
+    Returns:
+        dict: The pre-warm status, as returned by get_prewarm_status()
+    """
+    start = time.perf_counter()
+
+    async def build_openapi() -> None:
+        app.openapi()
+
+    try:
+        await asyncio.wait_for(asyncio.gather(
+            _timed_step("dns", _resolve_hosts()),
+            _timed_step("github", asyncio.to_thread(_warm_github)),
+            _timed_step("servicenow", _warm_servicenow()),
+            _timed_step("openapi", build_openapi())
+        ), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Startup pre-warming did not finish within {timeout:.0f}s")
+
+    _status["seconds"] = round(time.perf_counter() - start, 3)
+    _status["ready"] = True
+    logger.info(f"Startup pre-warming finished in {_status['seconds']:.2f}s")
+    return _status
+
+
+def profile_imports(module: str) -> list:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import, e.g. "api.main"
+
+    Returns:
+        list: (module name, self seconds, cumulative seconds) per imported module
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True
+    ).stderr
+
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return imports
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report import and app start-up times.")
+    parser.add_argument("--module", default="api.main", help="module to profile (default: api.main)")
+    parser.add_argument("--top", type=int, default=25, help="number of slowest modules to list")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="hide modules faster than this (cumulative)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    imports = profile_imports(args.module)
+    total = max((cumulative for _, _, cumulative in imports), default=0.0)
+
+    print(f"Import profile of {args.module}")
+    print("=" * 80)
+    print(f"{'module':52} {'self':>12} {'cumulative':>12}")
+    print("-" * 80)
+    slowest = sorted(imports, key=lambda entry: entry[2], reverse=True)
+    for name, self_seconds, cumulative in slowest[:args.top]:
+        if cumulative * 1000 < args.min_ms:
+            break
+        print(f"{name:52} {self_seconds * 1000:10.1f}ms {cumulative * 1000:10.1f}ms")
+
+    print("-" * 80)
+    print("The app's own modules (cumulative):")
+    for name, _, cumulative in imports:
+        if name.split(".")[0] == "api" and cumulative * 1000 >= args.min_ms:
+            print(f"  {name:50} {cumulative * 1000:23.1f}ms")
+
+    start = time.perf_counter()
+    app = getattr(importlib.import_module(args.module), "app", None)
+    imported = time.perf_counter() - start
+    print("-" * 80)
+    print(f"{'total import time (-X importtime)':52} {total * 1000:23.1f}ms")
+    print(f"{'import in this process':52} {imported * 1000:23.1f}ms")
+    if app is not None:
+        start = time.perf_counter()
+        app.openapi()
+        print(f"{'OpenAPI schema build':52} {(time.perf_counter() - start) * 1000:23.1f}ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
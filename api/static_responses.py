@@ -0,0 +1,61 @@
+"""Pre-serialized responses for the constant reference endpoints.
+
+/categories, /impacts and /urgencies return fixed lists, so their JSON is
+encoded once and served as bytes with a strong ETag derived from the
+content. The ETag changes whenever the underlying data does, and clients
+revalidating with If-None-Match get an empty 304.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+from fastapi import Response
+
+from .config import get_settings
+from .servicenow_client import get_categories, get_impacts, get_urgencies
+
+_responses = {}
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+class StaticResponse:
+    """A JSON payload encoded once, with its ETag and caching headers."""
+
+    def __init__(self, payload: dict, max_age: int):
+        self.body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"private, max-age={max_age}"
+        }
+
+    def respond(self, if_none_match: Optional[str] = None) -> Response:
+        """Return the payload, or 304 Not Modified if the client already has it."""
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=self.headers)
+        return Response(content=self.body, media_type="application/json", headers=self.headers)
+
+
+def build_static_responses() -> None:
+    """Encode the reference endpoint payloads; called at startup."""
+    max_age = get_settings().static_cache_max_age
+    _responses.update({
+        "categories": StaticResponse({"categories": get_categories()}, max_age),
+        "impacts": StaticResponse({"impacts": get_impacts()}, max_age),
+        "urgencies": StaticResponse({"urgencies": get_urgencies()}, max_age),
+    })
+
+
+def get_static_response(name: str) -> StaticResponse:
+    """Return a pre-serialized response, building them if startup has not."""
+    if not _responses:
+        build_static_responses()
+    return _responses[name]
@@ -0,0 +1,183 @@
+"""
+Microbenchmarks for the CPU-bound code that runs on every request.
+
+Times stack-trace detection, GitHub issue body and Slack block
+construction, Slack channel routing, SupportRequest validation and
+SupportResponse serialization on 1 KB, 100 KB and 5 MB descriptions, and
+compares each result with a stored baseline. A benchmark more than
+--tolerance slower than its baseline is flagged and makes the run exit
+with status 1.
+
+Timings are only comparable on the same machine, so the baseline is a
+local file (ignored by git): record one before a change with --save, then
+run again after it.
+
+Usage:
+    python -m tests.benchmarks.bench_hot_paths --save      # record a baseline
+    python -m tests.benchmarks.bench_hot_paths             # compare against it
+    python -m tests.benchmarks.bench_hot_paths --filter slack --tolerance 0.1
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import timeit
+from pathlib import Path
+
+from api.github_client import build_issue_body, contains_stack_trace
+from api.main import get_slack_channel_for_assignment_group
+from api.models import SupportRequest, SupportResponse
+from api.slack_client import build_incident_blocks
+from tests.benchmarks.bench_stack_trace import JAVA_TRACE, PLAIN_DESCRIPTION
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+SIZES = {
+    "1 KB": 1_000,
+    "100 KB": 100_000,
+    "5 MB": 5_000_000,
+}
+
+
+def make_description(size: int) -> str:
+    """Plain support text cut to `size` characters."""
+    return (PLAIN_DESCRIPTION * (size // len(PLAIN_DESCRIPTION) + 1))[:size]
+
+
+def make_request_body(description: str) -> bytes:
+    """A /get_support JSON body carrying `description`."""
+    return json.dumps({
+        "short_description": "Reporting dashboard export fails",
+        "description": description,
+        "urgency_value": "2",
+        "impact_value": "2",
+        "assignment_group": "CLOUD-L1-Support",
+        "caller_username": "admin",
+        "incident_category": "Performance"
+    }).encode()
+
+
+def build_benchmarks() -> dict:
+    """Return {name: zero-argument callable} for every benchmark."""
+    benchmarks = {}
+    
+    for label, size in SIZES.items():
+        plain = make_description(size)
+        traced = make_description(size - len(JAVA_TRACE)) + JAVA_TRACE
+        body = make_request_body(plain)
+        
+        benchmarks[f"contains_stack_trace / no trace {label}"] = lambda text=plain: contains_stack_trace(text)
+        benchmarks[f"contains_stack_trace / trace at end {label}"] = lambda text=traced: contains_stack_trace(text)
+        benchmarks[f"build_issue_body / {label}"] = lambda text=traced: build_issue_body(
+            text,
+            incident_number="INC0010001",
+            short_description="Payments service returns 500",
+            caller_username="admin",
+            fingerprint="3f2a9c1d0e8b7a65"
+        )
+        benchmarks[f"slack blocks / {label}"] = lambda text=plain: build_incident_blocks(
+            incident_number="INC0010001",
+            short_description="Reporting dashboard export fails",
+            description=text,
+            assignment_group="CLOUD-L1-Support",
+            urgency="2",
+            impact="2",
+            caller="admin"
+        )
+        benchmarks[f"SupportRequest validation / {label}"] = lambda body=body: SupportRequest.model_validate(json.loads(body))
+    
+    unknown_groups = (f"UNROUTED-{index}-Team" for index in itertools.count())
+    benchmarks["slack channel routing / routed group"] = lambda: get_slack_channel_for_assignment_group("DEVTOOLS-L2-Engineering")
+    benchmarks["slack channel routing / new group each call"] = lambda: get_slack_channel_for_assignment_group(next(unknown_groups))
+    
+    response = SupportResponse(
+        success=True,
+        incident_number="INC0010001",
+        incident_sys_id="9d385017c611228701d22104cc95c371",
+        slack_message_sent=True,
+        slack_channel="#cloud-support",
+        github_issue_created=True,
+        github_issue_url="https://github.com/technova/support/issues/42",
+        github_issue_number=42,
+        timings={"auth": 0.1, "servicenow": 180.4, "slack": 95.2, "github": 410.7}
+    )
+    benchmarks["SupportResponse serialization"] = response.model_dump_json
+    
+    return benchmarks
+
+
+def time_benchmark(func, repeat: int) -> float:
+    """Return the best per-call time in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:10.2f}ms"
+    return f"{seconds * 1e6:10.2f}us"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the per-request hot paths")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats per benchmark (best is kept)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() and not args.save else None
+    
+    print("Hot Path Benchmarks")
+    print("=" * 96)
+    if baseline:
+        print(f"Baseline: {args.baseline}")
+    elif not args.save:
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+    print(f"{'benchmark':50} {'time':>12} {'baseline':>12} {'change':>9}")
+    print("-" * 96)
+    
+    results = {}
+    regressions = []
+    
+    for name, func in build_benchmarks().items():
+        if args.filter not in name:
+            continue
+        
+        seconds = time_benchmark(func, args.repeat)
+        results[name] = seconds
+        line = f"{name:50} {format_time(seconds)}"
+        
+        expected = baseline.get(name) if baseline else None
+        if expected:
+            change = seconds / expected - 1
+            line += f" {format_time(expected)} {change:+8.1%}"
+            if change > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        
+        print(line)
+    
+    if args.save:
+        saved = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        saved.update(results)
+        args.baseline.write_text(json.dumps(saved, indent=2) + "\n")
+        print(f"\nSaved {len(results)} results to {args.baseline}")
+    
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) more than {args.tolerance:.0%} slower than baseline:")
+        for name in regressions:
+            print(f"  {name}")
+        return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Throughput benchmark for stack-trace detection.
+
+Measures detect_stack_trace on realistic Python, Java and Node.js support
+descriptions, plain non-trace descriptions, multi-megabyte pasted logs and
+a pathological single-line input that made the old per-pattern loop
+backtrack quadratically. The old loop is timed alongside on inputs up to
+100 KB for comparison; beyond that it is too slow to be worth waiting for.
+
+Usage:
+    python -m tests.benchmarks.bench_stack_trace
+"""
+
+import re
+import timeit
+
+from api.github_client import detect_stack_trace
+
+# The per-pattern loop contains_stack_trace used before the compiled detector
+LEGACY_PATTERNS = [
+    r'Traceback \(most recent call last\)',
+    r'at .+\(.+:\d+\)',
+    r'^\s+at\s+',
+    r'Exception in thread',
+    r'Error:\s*\n\s+at\s+',
+    r'File ".+", line \d+',
+    r'\.py", line \d+',
+    r'\.java:\d+\)',
+    r'\.js:\d+:\d+',
+    r'\.ts:\d+:\d+',
+    r'Stack trace:',
+    r'Call stack:',
+    r'NullPointerException',
+    r'TypeError:|ValueError:|KeyError:|AttributeError:',
+    r'Caused by:',
+]
+
+PYTHON_TRACE = """Our nightly export job crashed again after the upgrade:
+
+Traceback (most recent call last):
+  File "/srv/app/jobs/export.py", line 88, in run
+    rows = fetch_rows(conn, batch_size)
+  File "/srv/app/db/query.py", line 41, in fetch_rows
+    return cursor.fetchmany(size)
+KeyError: 'customer_id'
+"""
+
+JAVA_TRACE = """Payments service returns 500 when the card token is missing.
+
+Exception in thread "main" java.lang.NullPointerException: token is null
+\tat com.technova.pay.TokenService.resolve(TokenService.java:57)
+\tat com.technova.pay.PaymentController.charge(PaymentController.java:112)
+Caused by: java.lang.IllegalStateException: vault unavailable
+\tat com.technova.pay.Vault.open(Vault.java:23)
+"""
+
+NODE_TRACE = """Portal login page is blank, browser console shows:
+
+TypeError: Cannot read properties of undefined (reading 'user')
+    at renderHeader (/app/src/components/Header.js:14:22)
+    at processChild (/app/node_modules/react-dom/server.js:3043:14)
+    at Object.<anonymous> (/app/src/index.js:5:3)
+"""
+
+PLAIN_DESCRIPTION = (
+    "Since this morning the reporting dashboard takes over a minute to load for "
+    "customers in the EU region. The export button does nothing at all and users "
+    "are asking whether their scheduled reports will still be delivered on time. "
+)
+
+SAMPLES = {
+    "python trace (1 KB)": PYTHON_TRACE,
+    "java trace (1 KB)": JAVA_TRACE,
+    "node trace (1 KB)": NODE_TRACE,
+    "no trace (1 KB)": PLAIN_DESCRIPTION * 4,
+    "no trace (100 KB)": PLAIN_DESCRIPTION * 400,
+    "no trace (5 MB)": PLAIN_DESCRIPTION * 20000,
+    "trace at end of 5 MB log": PLAIN_DESCRIPTION * 20000 + JAVA_TRACE,
+}
+
+# The legacy loop backtracks quadratically on long single-line inputs
+LEGACY_MAX_SIZE = 100_000
+
+# Inputs that drive the legacy loop into quadratic backtracking
+PATHOLOGICAL_SAMPLES = {
+    "single-line 'at x(' x 50K": "at x(" * 50000,
+    "single-line 'at x(' x 500K": "at x(" * 500000,
+}
+
+
+def legacy_contains_stack_trace(error_message: str) -> bool:
+    """The original per-pattern detection loop."""
+    for pattern in LEGACY_PATTERNS:
+        if re.search(pattern, error_message, re.MULTILINE | re.IGNORECASE):
+            return True
+    return False
+
+
+def time_call(func, text: str) -> float:
+    """Return the best per-call time in seconds."""
+    number = max(1, int(200_000 / max(len(text), 1)))
+    return min(timeit.repeat(lambda: func(text), number=number, repeat=5)) / number
+
+
+def throughput(size: int, seconds: float) -> str:
+    """Format throughput in MB/s."""
+    return f"{size / seconds / 1_000_000:10.1f} MB/s"
+
+
+def main():
+    print("Stack Trace Detection Benchmark")
+    print("=" * 96)
+    print(f"{'input':32} {'family':12} {'detector':>14} {'':>14} {'legacy':>12} {'speedup':>8}")
+    print("-" * 96)
+
+    for name, text in SAMPLES.items():
+        family = detect_stack_trace(text)
+        new_time = time_call(detect_stack_trace, text)
+        line = f"{name:32} {str(family):12} {new_time * 1e6:12.1f}us {throughput(len(text), new_time)}"
+
+        if len(text) <= LEGACY_MAX_SIZE:
+            old_time = time_call(legacy_contains_stack_trace, text)
+            line += f" {old_time * 1e6:10.1f}us {old_time / new_time:7.1f}x"
+        else:
+            line += f" {'-':>12} {'-':>8}"
+
+        print(line)
+
+    print()
+    print("Pathological inputs (detector only)")
+    print("-" * 96)
+    for name, text in PATHOLOGICAL_SAMPLES.items():
+        new_time = time_call(detect_stack_trace, text)
+        print(f"{name:32} {str(detect_stack_trace(text)):12} {new_time * 1e3:12.1f}ms {throughput(len(text), new_time)}")
+
+
+if __name__ == "__main__":
+    main()
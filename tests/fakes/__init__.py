@@ -0,0 +1,11 @@
+"""
+In-memory stand-ins for ServiceNow, Slack and GitHub.
+
+Point the support API at these to benchmark and capacity-plan without
+creating real incidents, messages or issues. See tests/fakes/__main__.py
+for how to run them.
+"""
+
+from .faults import FaultConfig
+
+__all__ = ["FaultConfig"]
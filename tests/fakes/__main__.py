@@ -0,0 +1,74 @@
+"""
+Run the fake ServiceNow, Slack and GitHub servers.
+
+Usage:
+    python -m tests.fakes [--latency-ms 80] [--jitter-ms 40] [--error-rate 0.01] [--rate-limit-rate 0.01]
+
+Then start the API against them with the environment this prints, e.g.:
+
+    SERVICENOW_INSTANCE=http://127.0.0.1:8101 \\
+    SLACK_API_URL=http://127.0.0.1:8102/api/ \\
+    GITHUB_API_URL=http://127.0.0.1:8103 \\
+    uvicorn api.main:app --port 8000
+
+Faults can be changed while the servers run, per service:
+
+    curl -X PUT localhost:8102/_faults -H 'Content-Type: application/json' \\
+         -d '{"latency_ms": 200, "rate_limit_rate": 0.1, "retry_after": 2}'
+
+and GET /_stats on each server shows how many calls it received.
+"""
+
+import argparse
+import asyncio
+
+import uvicorn
+
+from . import github, servicenow, slack
+from .faults import FaultConfig
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fake ServiceNow, Slack and GitHub servers")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--servicenow-port", type=int, default=8101)
+    parser.add_argument("--slack-port", type=int, default=8102)
+    parser.add_argument("--github-port", type=int, default=8103)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform latency variation per call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failing with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls failing with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds on 429s")
+    return parser.parse_args()
+
+
+async def serve(args) -> None:
+    faults = FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after
+    )
+    apps = [
+        (servicenow.create_app(faults.model_copy()), args.servicenow_port),
+        (slack.create_app(faults.model_copy()), args.slack_port),
+        (github.create_app(faults.model_copy()), args.github_port)
+    ]
+    servers = [
+        uvicorn.Server(uvicorn.Config(app, host=args.host, port=port, log_level="warning"))
+        for app, port in apps
+    ]
+    
+    print("Fake servers running. Start the API with:")
+    print(f"  SERVICENOW_INSTANCE=http://{args.host}:{args.servicenow_port}")
+    print(f"  SLACK_API_URL=http://{args.host}:{args.slack_port}/api/")
+    print(f"  GITHUB_API_URL=http://{args.host}:{args.github_port}")
+    print("  SLACK_BOT_TOKEN=xoxb-fake GITHUB_TOKEN=fake GITHUB_DEFAULT_REPO=technova/support")
+    print(f"Faults: {faults.model_dump()}")
+    
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(parse_args()))
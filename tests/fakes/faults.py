@@ -0,0 +1,86 @@
+"""
+Latency, error and rate-limit injection shared by the fake servers.
+
+Every fake installs the same middleware: each request is delayed by
+`latency_ms` plus or minus `jitter_ms`, then fails with a 429 (with a
+Retry-After header) with probability `rate_limit_rate`, or with a 503 with
+probability `error_rate`. The settings can be read and changed while the
+server runs with GET/PUT /_faults, and GET /_stats returns the number of
+calls per endpoint and status.
+"""
+
+import asyncio
+import random
+from collections import Counter
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+
+class FaultConfig(BaseModel):
+    """Faults injected into every request to a fake server."""
+    latency_ms: float = Field(default=0.0, ge=0, description="Mean added latency in milliseconds")
+    jitter_ms: float = Field(default=0.0, ge=0, description="Latency varies uniformly by up to this much")
+    error_rate: float = Field(default=0.0, ge=0, le=1, description="Fraction of requests answered with a 503")
+    rate_limit_rate: float = Field(default=0.0, ge=0, le=1, description="Fraction of requests answered with a 429")
+    retry_after: int = Field(default=1, ge=0, description="Retry-After seconds sent with 429s")
+
+
+def install_faults(app: FastAPI, faults: FaultConfig, error_body: dict, rate_limit_body: dict) -> None:
+    """
+    Add fault injection and the /_faults and /_stats endpoints to a fake.
+    
+    Args:
+        app: The fake server's FastAPI app
+        faults: Initial fault settings
+        error_body: JSON body of injected 503 responses, in the service's error format
+        rate_limit_body: JSON body of injected 429 responses
+    """
+    app.state.faults = faults
+    app.state.calls = Counter()
+    
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if request.url.path.startswith("/_"):
+            return await call_next(request)
+        
+        config = app.state.faults
+        delay = config.latency_ms + random.uniform(-config.jitter_ms, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        
+        roll = random.random()
+        if roll < config.rate_limit_rate:
+            response = JSONResponse(
+                rate_limit_body,
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after)}
+            )
+        elif roll < config.rate_limit_rate + config.error_rate:
+            response = JSONResponse(error_body, status_code=503)
+        else:
+            response = await call_next(request)
+        
+        # Count by route template so /issues/{number}/comments is one entry
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        app.state.calls[f"{request.method} {route} {response.status_code}"] += 1
+        return response
+    
+    @app.get("/_faults")
+    async def get_faults() -> FaultConfig:
+        return app.state.faults
+    
+    @app.put("/_faults")
+    async def set_faults(config: FaultConfig) -> FaultConfig:
+        app.state.faults = config
+        return config
+    
+    @app.get("/_stats")
+    async def get_stats() -> dict:
+        return {"calls": dict(sorted(app.state.calls.items()))}
+    
+    @app.delete("/_stats")
+    async def reset_stats() -> dict:
+        app.state.calls.clear()
+        return {"calls": {}}
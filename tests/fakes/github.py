@@ -0,0 +1,136 @@
+"""
+Fake GitHub REST API.
+
+Implements the rate limit, repository, label, issue and issue comment
+endpoints the support API uses. Any owner/repo exists on first access. Repository and
+label responses carry ETags and answer conditional requests with 304, like
+GitHub does.
+"""
+
+import hashlib
+import itertools
+import json
+import time
+from typing import Optional
+
+from fastapi import Body, FastAPI, Request, Response
+
+from .faults import FaultConfig, install_faults
+
+
+def json_response(request: Request, payload, status_code: int = 200) -> Response:
+    """Return JSON with an ETag, or 304 if the client's If-None-Match matches."""
+    body = json.dumps(payload).encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, status_code=status_code, media_type="application/json", headers={"ETag": etag})
+
+
+def create_app(faults: Optional[FaultConfig] = None) -> FastAPI:
+    """Create the fake GitHub app."""
+    app = FastAPI(title="Fake GitHub")
+    install_faults(
+        app,
+        faults or FaultConfig(),
+        error_body={"message": "Service Unavailable"},
+        rate_limit_body={"message": "API rate limit exceeded"}
+    )
+    
+    repos = {}
+    
+    def get_repo(request: Request, owner: str, name: str) -> dict:
+        full_name = f"{owner}/{name}"
+        if full_name not in repos:
+            api_url = str(request.base_url).rstrip("/")
+            repos[full_name] = {
+                "info": {
+                    "id": len(repos) + 1,
+                    "name": name,
+                    "full_name": full_name,
+                    "owner": {"login": owner},
+                    "private": True,
+                    "url": f"{api_url}/repos/{full_name}",
+                    "html_url": f"https://github.com/{full_name}"
+                },
+                "labels": {},
+                "issues": {},
+                "numbers": itertools.count(1)
+            }
+        return repos[full_name]
+    
+    def not_found() -> Response:
+        return Response(json.dumps({"message": "Not Found"}), status_code=404, media_type="application/json")
+    
+    @app.get("/rate_limit")
+    async def rate_limit(request: Request):
+        window = {"limit": 5000, "remaining": 5000, "reset": int(time.time()) + 3600, "used": 0}
+        return json_response(request, {
+            "resources": {"core": window, "search": window, "graphql": window},
+            "rate": window
+        })
+    
+    @app.get("/repos/{owner}/{name}")
+    async def read_repo(request: Request, owner: str, name: str):
+        return json_response(request, get_repo(request, owner, name)["info"])
+    
+    @app.get("/repos/{owner}/{name}/labels")
+    async def list_labels(request: Request, owner: str, name: str):
+        return json_response(request, list(get_repo(request, owner, name)["labels"].values()))
+    
+    @app.post("/repos/{owner}/{name}/labels")
+    async def create_label(request: Request, owner: str, name: str, label: dict = Body(...)):
+        repo = get_repo(request, owner, name)
+        if label.get("name") in repo["labels"]:
+            return Response(
+                json.dumps({"message": "Validation Failed", "errors": [{"code": "already_exists"}]}),
+                status_code=422,
+                media_type="application/json"
+            )
+        
+        repo["labels"][label["name"]] = {
+            "name": label["name"],
+            "color": label.get("color", "ededed"),
+            "description": label.get("description"),
+            "url": f"{repo['info']['url']}/labels/{label['name']}"
+        }
+        return json_response(request, repo["labels"][label["name"]], status_code=201)
+    
+    @app.post("/repos/{owner}/{name}/issues")
+    async def create_issue(request: Request, owner: str, name: str, issue: dict = Body(...)):
+        repo = get_repo(request, owner, name)
+        number = next(repo["numbers"])
+        repo["issues"][number] = {
+            "id": number,
+            "number": number,
+            "title": issue.get("title", ""),
+            "body": issue.get("body", ""),
+            "state": "open",
+            "labels": [{"name": label} for label in issue.get("labels", [])],
+            "comments": 0,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "url": f"{repo['info']['url']}/issues/{number}",
+            "html_url": f"{repo['info']['html_url']}/issues/{number}"
+        }
+        return json_response(request, repo["issues"][number], status_code=201)
+    
+    @app.get("/repos/{owner}/{name}/issues/{number}")
+    async def read_issue(request: Request, owner: str, name: str, number: int):
+        issue = get_repo(request, owner, name)["issues"].get(number)
+        return json_response(request, issue) if issue else not_found()
+    
+    @app.post("/repos/{owner}/{name}/issues/{number}/comments")
+    async def create_comment(request: Request, owner: str, name: str, number: int, comment: dict = Body(...)):
+        issue = get_repo(request, owner, name)["issues"].get(number)
+        if issue is None:
+            return not_found()
+        
+        issue["comments"] += 1
+        return json_response(request, {
+            "id": issue["comments"],
+            "body": comment.get("body", ""),
+            "url": f"{issue['url']}/comments/{issue['comments']}",
+            "html_url": f"{issue['html_url']}#issuecomment-{issue['comments']}"
+        }, status_code=201)
+    
+    return app
@@ -0,0 +1,185 @@
+"""
+Fake ServiceNow instance.
+
+Implements the parts of the Table API the support API uses: creating and
+reading incidents, listing and creating assignment groups (with the
+encoded queries build_assignment_group_query produces), and the Batch API
+for /get_support/batch. Assignment groups are seeded from the assignment
+group knowledge base. Everything is kept in memory.
+"""
+
+import base64
+import itertools
+import json
+import re
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Body, FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from .faults import FaultConfig, install_faults
+
+KNOWLEDGE_BASE_PATH = (
+    Path(__file__).resolve().parents[2] / "knowledge-base" / "servicenow-assignment-groups.txt"
+)
+
+# "| CLOUD-L1-Support | AGR-CLOUD-001 | ..." rows of the knowledge base tables
+GROUP_ROW = re.compile(r"^\|\s*([A-Z]+-[\w-]+)\s*\|\s*AGR-", re.MULTILINE)
+
+BATCH_URL = re.compile(r"^/api/now/table/(\w+)")
+
+
+def load_seed_groups(path: Path = KNOWLEDGE_BASE_PATH) -> list:
+    """Return the assignment group names listed in the knowledge base."""
+    try:
+        return GROUP_ROW.findall(path.read_text(encoding="utf-8"))
+    except OSError:
+        return ["GENERAL-L1-Support"]
+
+
+def parse_query(query: str) -> tuple:
+    """
+    Parse the subset of ServiceNow encoded queries the API sends.
+    
+    Supports `field=value`, `fieldSTARTSWITHvalue`, `^OR` alternatives and
+    `ORDERBYfield`.
+    
+    Returns:
+        tuple: (list of OR-groups of (field, operator, value), order-by field or None)
+    """
+    groups = []
+    order_by = None
+    
+    for term in query.split("^") if query else []:
+        alternative = term.startswith("OR") and not term.startswith("ORDERBY") and groups
+        if alternative:
+            term = term[2:]
+        
+        if term.startswith("ORDERBY"):
+            order_by = term[len("ORDERBY"):]
+            continue
+        
+        match = re.match(r"^(\w+?)(STARTSWITH|=)(.*)$", term)
+        if not match:
+            continue
+        
+        condition = (match.group(1), match.group(2), match.group(3))
+        if alternative:
+            groups[-1].append(condition)
+        else:
+            groups.append([condition])
+    
+    return groups, order_by
+
+
+def matches(record: dict, groups: list) -> bool:
+    """True if a record satisfies every OR-group of a parsed query."""
+    for alternatives in groups:
+        if not any(
+            str(record.get(field, "")).startswith(value) if operator == "STARTSWITH"
+            else str(record.get(field, "")) == value
+            for field, operator, value in alternatives
+        ):
+            return False
+    return True
+
+
+def select_fields(record: dict, fields: Optional[str]) -> dict:
+    """Apply sysparm_fields to a record."""
+    if not fields:
+        return dict(record)
+    return {field: record.get(field, "") for field in fields.split(",")}
+
+
+def create_app(faults: Optional[FaultConfig] = None) -> FastAPI:
+    """Create the fake ServiceNow app."""
+    app = FastAPI(title="Fake ServiceNow")
+    install_faults(
+        app,
+        faults or FaultConfig(),
+        error_body={"error": {"message": "Service Unavailable", "detail": "Injected fault"}, "status": "failure"},
+        rate_limit_body={"error": {"message": "Rate limit exceeded", "detail": "Injected fault"}, "status": "failure"}
+    )
+    
+    numbers = itertools.count(10001)
+    tables = {
+        "incident": {},
+        "sys_user_group": {}
+    }
+    for name in load_seed_groups():
+        sys_id = uuid.uuid4().hex
+        tables["sys_user_group"][sys_id] = {"sys_id": sys_id, "name": name, "active": "true"}
+    
+    def insert(table: str, values: dict) -> dict:
+        record = {key: str(value) for key, value in values.items()}
+        record["sys_id"] = uuid.uuid4().hex
+        if table == "incident":
+            record["number"] = f"INC{next(numbers):07d}"
+            record.setdefault("state", "1")
+        if table == "sys_user_group":
+            record.setdefault("active", "true")
+        tables.setdefault(table, {})[record["sys_id"]] = record
+        return record
+    
+    def not_found(message: str) -> JSONResponse:
+        return JSONResponse({"error": {"message": message, "detail": ""}, "status": "failure"}, status_code=404)
+    
+    @app.get("/api/now/table/{table}")
+    async def list_records(
+        table: str,
+        sysparm_query: str = "",
+        sysparm_fields: Optional[str] = None,
+        sysparm_limit: int = 10000,
+        sysparm_offset: int = 0
+    ):
+        groups, order_by = parse_query(sysparm_query)
+        records = [record for record in tables.get(table, {}).values() if matches(record, groups)]
+        if order_by:
+            records.sort(key=lambda record: record.get(order_by, ""))
+        
+        page = records[sysparm_offset:sysparm_offset + sysparm_limit]
+        return {"result": [select_fields(record, sysparm_fields) for record in page]}
+    
+    @app.get("/api/now/table/{table}/{sys_id}")
+    async def get_record(table: str, sys_id: str, sysparm_fields: Optional[str] = None):
+        record = tables.get(table, {}).get(sys_id)
+        if record is None:
+            return not_found("No Record found")
+        return {"result": select_fields(record, sysparm_fields)}
+    
+    @app.post("/api/now/table/{table}", status_code=201)
+    async def create_record(table: str, values: dict = Body(...), sysparm_fields: Optional[str] = None):
+        return {"result": select_fields(insert(table, values), sysparm_fields)}
+    
+    @app.post("/api/now/v1/batch")
+    async def batch(request: Request):
+        payload = await request.json()
+        serviced = []
+        
+        for rest_request in payload.get("rest_requests", []):
+            match = BATCH_URL.match(rest_request.get("url", ""))
+            if rest_request.get("method") != "POST" or not match:
+                status, body = 400, {"error": {"message": "Unsupported batch request"}, "status": "failure"}
+            else:
+                values = json.loads(base64.b64decode(rest_request.get("body") or "") or b"{}")
+                query = rest_request["url"].partition("?")[2]
+                fields = re.search(r"sysparm_fields=([^&]*)", query)
+                status = 201
+                body = {"result": select_fields(insert(match.group(1), values), fields and fields.group(1))}
+            
+            serviced.append({
+                "id": rest_request.get("id"),
+                "status_code": status,
+                "status_text": "Created" if status == 201 else "Bad Request",
+                "body": base64.b64encode(json.dumps(body).encode()).decode()
+            })
+        
+        return {
+            "batch_request_id": payload.get("batch_request_id"),
+            "serviced_requests": serviced,
+            "unserviced_requests": []
+        }
+    
+    return app
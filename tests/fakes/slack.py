@@ -0,0 +1,116 @@
+"""
+Fake Slack Web API.
+
+Implements chat.postMessage, conversations.create and conversations.list
+(paginated) for the bot token the support API uses. Channels are seeded
+with every channel in the routing table, so a default setup resolves all
+routed channels at startup without creating any.
+"""
+
+import itertools
+import time
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI, Request
+
+from .faults import FaultConfig, install_faults
+
+
+def load_seed_channels() -> list:
+    """Return the routed Slack channel names, without the leading '#'."""
+    from api.config import get_settings
+    from api.routing import build_routing_index
+    
+    channels = set(build_routing_index().routes.values()) | {get_settings().slack_default_channel}
+    return sorted(channel.lstrip("#") for channel in channels)
+
+
+async def read_arguments(request: Request) -> dict:
+    """Collect Web API arguments from the query string, a form-encoded or a JSON body."""
+    arguments = dict(request.query_params)
+    content_type = request.headers.get("content-type", "")
+    
+    if content_type.startswith("application/json"):
+        arguments.update(await request.json())
+    elif content_type.startswith("application/x-www-form-urlencoded"):
+        arguments.update(parse_qsl((await request.body()).decode()))
+    
+    return arguments
+
+
+def create_app(faults: Optional[FaultConfig] = None, seed_channels: Optional[list] = None) -> FastAPI:
+    """Create the fake Slack app."""
+    app = FastAPI(title="Fake Slack")
+    install_faults(
+        app,
+        faults or FaultConfig(),
+        error_body={"ok": False, "error": "internal_error"},
+        rate_limit_body={"ok": False, "error": "ratelimited"}
+    )
+    
+    ids = itertools.count(1)
+    channels = {}
+    messages = []
+    
+    def add_channel(name: str) -> dict:
+        channel = {
+            "id": f"C{next(ids):08d}",
+            "name": name,
+            "is_channel": True,
+            "is_private": False,
+            "is_archived": False,
+            "created": int(time.time())
+        }
+        channels[channel["id"]] = channel
+        return channel
+    
+    def find_channel(reference: str) -> Optional[dict]:
+        if reference in channels:
+            return channels[reference]
+        name = reference.lstrip("#")
+        return next((channel for channel in channels.values() if channel["name"] == name), None)
+    
+    for name in seed_channels if seed_channels is not None else load_seed_channels():
+        add_channel(name)
+    
+    @app.api_route("/api/chat.postMessage", methods=["POST"])
+    async def chat_post_message(request: Request):
+        arguments = await read_arguments(request)
+        channel = find_channel(str(arguments.get("channel", "")))
+        if channel is None:
+            return {"ok": False, "error": "channel_not_found"}
+        
+        message = {
+            "type": "message",
+            "ts": f"{time.time():.6f}",
+            "text": arguments.get("text", ""),
+            "blocks": arguments.get("blocks", [])
+        }
+        messages.append(message)
+        if len(messages) > 1000:
+            del messages[:500]
+        return {"ok": True, "channel": channel["id"], "ts": message["ts"], "message": message}
+    
+    @app.api_route("/api/conversations.create", methods=["POST"])
+    async def conversations_create(request: Request):
+        arguments = await read_arguments(request)
+        name = str(arguments.get("name", "")).lstrip("#")
+        if not name:
+            return {"ok": False, "error": "invalid_name_required"}
+        if find_channel(name) is not None:
+            return {"ok": False, "error": "name_taken"}
+        return {"ok": True, "channel": add_channel(name)}
+    
+    @app.api_route("/api/conversations.list", methods=["GET", "POST"])
+    async def conversations_list(request: Request):
+        arguments = await read_arguments(request)
+        limit = int(arguments.get("limit") or 100)
+        offset = int(arguments.get("cursor") or 0)
+        
+        listed = list(channels.values())
+        page = listed[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(listed) else ""
+        return {"ok": True, "channels": page, "response_metadata": {"next_cursor": next_cursor}}
+    
+    return app
@@ -0,0 +1,175 @@
+"""
+Concurrent load test for POST /get_support.
+
+Sends a fixed number of support requests with a fixed number in flight
+and reports throughput, latency percentiles, status codes, how many
+incidents, Slack messages and GitHub issues resulted, and the mean time
+per pipeline stage from the Server-Timing header.
+
+Run it against the fake servers (python -m tests.fakes) rather than the
+real services: every request creates an incident.
+
+Usage:
+    python -m tests.load_test [--requests 1000] [--concurrency 50] [--stack-trace-ratio 0.1]
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import time
+from collections import Counter, defaultdict
+
+import httpx
+from dotenv import load_dotenv
+
+from tests.fakes.servicenow import load_seed_groups
+
+load_dotenv()
+
+# Stack traces attached to a share of the requests, so GitHub issues are
+# opened and then updated as the same crash is reported again
+STACK_TRACES = [
+    'Traceback (most recent call last):\n'
+    '  File "/srv/app/jobs/export.py", line 88, in run\n'
+    '    rows = fetch_rows(conn, batch_size)\n'
+    "KeyError: 'customer_id'\n",
+    'Exception in thread "main" java.lang.NullPointerException: token is null\n'
+    '\tat com.technova.pay.TokenService.resolve(TokenService.java:57)\n'
+    '\tat com.technova.pay.PaymentController.charge(PaymentController.java:112)\n',
+    "TypeError: Cannot read properties of undefined (reading 'user')\n"
+    '    at renderHeader (/app/src/components/Header.js:14:22)\n'
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load test POST /get_support")
+    parser.add_argument("--url", default=os.getenv("API_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--api-key", default=os.getenv("API_KEY"))
+    parser.add_argument("--requests", type=int, default=1000, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once")
+    parser.add_argument("--stack-trace-ratio", type=float, default=0.1, help="Share of requests with a stack trace")
+    parser.add_argument("--description-bytes", type=int, default=1000, help="Approximate description size")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Client timeout per request in seconds")
+    return parser.parse_args()
+
+
+def build_request(index: int, groups: list, args) -> dict:
+    """Build one realistic support request."""
+    description = (
+        f"Load test request {index}: users report the dashboard times out when exporting reports. "
+        * max(1, args.description_bytes // 90)
+    )
+    if random.random() < args.stack_trace_ratio:
+        description += "\n\n" + random.choice(STACK_TRACES)
+    
+    return {
+        "short_description": f"Load test {index}: dashboard export timing out",
+        "description": description,
+        "urgency_value": random.choice(["1", "2", "3", "4"]),
+        "impact_value": random.choice(["1", "2", "3"]),
+        "assignment_group": random.choice(groups),
+        "caller_username": "admin",
+        "incident_category": "Performance"
+    }
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def parse_server_timing(header: str) -> dict:
+    """Parse 'stage;dur=1.2, other;dur=3.4' into {stage: milliseconds}."""
+    stages = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        if params.startswith("dur="):
+            stages[name] = float(params[4:])
+    return stages
+
+
+async def run(args) -> None:
+    groups = load_seed_groups()
+    headers = {"X-API-Key": args.api_key} if args.api_key else {}
+    latencies = []
+    statuses = Counter()
+    outcomes = Counter()
+    stage_totals = defaultdict(float)
+    next_index = iter(range(args.requests))
+    
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        headers=headers,
+        timeout=args.timeout,
+        limits=httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    ) as client:
+        
+        async def worker():
+            for index in next_index:
+                payload = build_request(index, groups, args)
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/get_support", json=payload)
+                except httpx.HTTPError as e:
+                    latencies.append(time.perf_counter() - start)
+                    statuses[type(e).__name__] += 1
+                    continue
+                
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+                
+                for stage, duration in parse_server_timing(response.headers.get("server-timing", "")).items():
+                    stage_totals[stage] += duration
+                
+                if response.status_code == 200:
+                    body = response.json()
+                    outcomes["incident created"] += body.get("success", False)
+                    outcomes["slack message sent"] += body.get("slack_message_sent", False)
+                    outcomes["github issue created"] += body.get("github_issue_created", False)
+                    if body.get("error_details"):
+                        outcomes[f"error {body['error_details'].get('error_code')}"] += 1
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    completed = len(latencies)
+    
+    print("Load Test: POST /get_support")
+    print("=" * 60)
+    print(f"Target:       {args.url}")
+    print(f"Requests:     {completed} ({args.concurrency} concurrent) in {elapsed:.2f}s")
+    print(f"Throughput:   {completed / elapsed:.1f} req/s")
+    print()
+    print("Latency (ms)")
+    print("-" * 60)
+    for label, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        print(f"  {label:6} {percentile(latencies, fraction) * 1000:10.1f}")
+    print(f"  {'max':6} {(latencies[-1] if latencies else 0) * 1000:10.1f}")
+    print(f"  {'mean':6} {(sum(latencies) / completed if completed else 0) * 1000:10.1f}")
+    print()
+    print("Status codes")
+    print("-" * 60)
+    for status, count in sorted(statuses.items(), key=lambda item: str(item[0])):
+        print(f"  {str(status):30} {count}")
+    print()
+    print("Outcomes")
+    print("-" * 60)
+    for outcome, count in sorted(outcomes.items()):
+        print(f"  {outcome:30} {count}")
+    if stage_totals and completed:
+        print()
+        print("Mean stage time from Server-Timing (ms)")
+        print("-" * 60)
+        for stage, total in stage_totals.items():
+            print(f"  {stage:30} {total / completed:10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
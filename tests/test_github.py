@@ -19,7 +19,7 @@ Requirements:
 Author: TechNova Solutions
 Version: 1.0.0
 """
-from api.github_client import contains_stack_trace, create_github_issue
+from api.github_client import contains_stack_trace, create_github_issue, detect_stack_trace, stack_trace_fingerprint
 
 # Sample description containing a Python stack trace for testing
 test_desc = """Application crashed on startup with the following error:
@@ -32,7 +32,13 @@ ValueError: Invalid configuration
 
 # Test stack trace detection
 print('Stack trace detected:', contains_stack_trace(test_desc))
+print('Stack trace family:', detect_stack_trace(test_desc))
+print('Stack trace fingerprint:', stack_trace_fingerprint(test_desc, detect_stack_trace(test_desc)))
 
 # Test GitHub issue creation (only creates if stack trace detected)
 result = create_github_issue(test_desc, 'INC0010005', 'Test issue')
 print('Result:', result)
+
+# The same crash again updates the existing issue instead of opening another
+result = create_github_issue(test_desc, 'INC0010006', 'Test issue')
+print('Repeat result:', result)
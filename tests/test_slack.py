@@ -20,16 +20,29 @@ Requirements:
 Author: TechNova Solutions
 Version: 1.0.0
 """
-from api.slack_client import send_slack_message
-
-# Test sending a Slack message with sample incident data
-result = send_slack_message(
-    incident_number='INC0010005',
-    short_description='Test incident from API',
-    description='This is a test message to verify Slack integration is working.',
-    assignment_group='DevOps Team',
-    urgency='Medium',
-    impact='Medium',
-    caller='test_user'
-)
-print('Result:', result)
+import asyncio
+
+from api.slack_client import get_channel_directory, get_slack_stats, send_slack_message
+
+
+async def main():
+    # Load the channel directory so the message is posted by channel ID
+    directory = get_channel_directory()
+    await directory.load()
+    print('Channels in directory:', len(directory._ids))
+    
+    # Test sending a Slack message with sample incident data
+    result = await send_slack_message(
+        incident_number='INC0010005',
+        short_description='Test incident from API',
+        description='This is a test message to verify Slack integration is working.',
+        assignment_group='DevOps Team',
+        urgency='Medium',
+        impact='Medium',
+        caller='test_user'
+    )
+    print('Result:', result)
+    print('Slack client stats:', get_slack_stats())
+
+
+asyncio.run(main())
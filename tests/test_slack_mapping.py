@@ -1,5 +1,6 @@
 """Test the assignment group to Slack channel mapping."""
-from api.main import get_slack_channel_for_assignment_group, ASSIGNMENT_GROUP_SLACK_CHANNELS
+from api.main import get_slack_channel_for_assignment_group
+from api.routing import get_routing_index
 
 # Test the mapping
 test_groups = [
@@ -25,7 +26,7 @@ for group in test_groups:
     print(f'{group:30} -> {channel or "SLACK_DEFAULT_CHANNEL"}{default_indicator}')
 
 print()
-print('Configured Mappings:')
+print('Loaded Mappings (defaults + knowledge base + routing file):')
 print('-' * 60)
-for prefix, channel in ASSIGNMENT_GROUP_SLACK_CHANNELS.items():
+for prefix, channel in sorted(get_routing_index().routes.items()):
     print(f'  {prefix:15} -> {channel}')
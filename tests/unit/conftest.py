@@ -0,0 +1,36 @@
+"""Shared fixtures for the unit tests.
+
+Run from the repository root with:
+
+    python -m pytest tests/unit
+"""
+
+import pytest
+
+
+class FakeClock:
+    """Stands in for the `time` module of the code under test; time only moves when advanced."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+    async def sleep(self, seconds: float) -> None:
+        """Stands in for asyncio.sleep: advance the clock instead of waiting."""
+        self.advance(max(0.0, seconds))
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
@@ -0,0 +1,171 @@
+"""Circuit breaker state transitions (api.circuit_breaker)."""
+
+import asyncio
+import contextvars
+
+import pytest
+
+from api import circuit_breaker, deadline
+from api.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    downstream_call
+)
+from api.deadline import set_deadline
+
+
+@pytest.fixture
+def breaker(clock, monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "time", clock)
+    return CircuitBreaker(
+        "unit-test",
+        window=60.0,
+        min_calls=4,
+        error_rate=0.5,
+        slow_call_seconds=5.0,
+        slow_call_rate=0.75,
+        open_seconds=30.0,
+        half_open_calls=1
+    )
+
+
+def call(breaker, failed=False, duration=0.1):
+    breaker.before_call()
+    breaker.record(failed, duration)
+
+
+def trip(breaker):
+    for failed in (True, True, False, False):
+        call(breaker, failed=failed)
+
+
+def test_stays_closed_below_min_calls(breaker):
+    for _ in range(3):
+        call(breaker, failed=True)
+
+    assert breaker.state == STATE_CLOSED
+
+
+def test_opens_at_error_rate(breaker):
+    trip(breaker)
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.rejecting
+
+
+def test_stays_closed_below_error_rate(breaker):
+    for failed in (True, False, False, False):
+        call(breaker, failed=failed)
+
+    assert breaker.state == STATE_CLOSED
+
+
+def test_opens_on_slow_calls(breaker):
+    for duration in (6.0, 6.0, 6.0, 0.1):
+        call(breaker, duration=duration)
+
+    assert breaker.state == STATE_OPEN
+
+
+def test_failures_outside_window_expire(breaker, clock):
+    call(breaker, failed=True)
+    call(breaker, failed=True)
+    clock.advance(61)
+    call(breaker)
+    call(breaker)
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.snapshot()["calls"] == 2
+
+
+def test_open_rejects_until_cool_down(breaker, clock):
+    trip(breaker)
+    clock.advance(10)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after == pytest.approx(20)
+    assert breaker.snapshot()["retry_after"] == 20.0
+
+
+def test_half_open_probe_success_closes(breaker, clock):
+    trip(breaker)
+    clock.advance(30)
+
+    breaker.before_call()
+    assert breaker.state == STATE_HALF_OPEN
+
+    breaker.record(False, 0.1)
+    assert breaker.state == STATE_CLOSED
+    assert breaker.snapshot()["calls"] == 0
+
+
+def test_half_open_probe_failure_reopens(breaker, clock):
+    trip(breaker)
+    clock.advance(30)
+
+    breaker.before_call()
+    breaker.record(True, 0.1)
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.opened_at == clock.now
+
+
+def test_half_open_slow_probe_reopens(breaker, clock):
+    trip(breaker)
+    clock.advance(30)
+
+    breaker.before_call()
+    breaker.record(False, 6.0)
+
+    assert breaker.state == STATE_OPEN
+
+
+def test_half_open_admits_limited_probes(breaker, clock):
+    trip(breaker)
+    clock.advance(30)
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+@pytest.fixture
+def registered(breaker, monkeypatch):
+    monkeypatch.setitem(circuit_breaker._breakers, breaker.service, breaker)
+    return breaker
+
+
+async def cancelled_call(service, clock, elapsed):
+    with downstream_call(service, "test"):
+        clock.advance(elapsed)
+        raise asyncio.CancelledError()
+
+
+def run_cancelled_call(service, clock, elapsed=1.0, budget=None):
+    """Run a downstream call cancelled after `elapsed` seconds, in a fresh context."""
+    def run():
+        set_deadline(budget)
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(cancelled_call(service, clock, elapsed))
+
+    contextvars.Context().run(run)
+
+
+def test_cancelled_call_counts_as_failure(registered, clock):
+    for _ in range(4):
+        run_cancelled_call(registered.service, clock)
+
+    assert registered.state == STATE_OPEN
+
+
+def test_cancelled_call_after_deadline_is_not_a_failure(registered, clock, monkeypatch):
+    monkeypatch.setattr(deadline, "time", clock)
+    for _ in range(4):
+        run_cancelled_call(registered.service, clock, elapsed=2.0, budget=1.0)
+
+    assert registered.state == STATE_CLOSED
+    assert registered.snapshot()["error_rate"] == 0.0
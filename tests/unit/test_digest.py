@@ -0,0 +1,194 @@
+"""Coalescing incident notifications into per-channel digests (api.slack_client)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from api import slack_client
+from api.slack_client import IncidentDigest, parse_digest_windows
+
+
+def incident(number, urgency="3"):
+    return {
+        "incident_number": number,
+        "short_description": f"Incident {number}",
+        "assignment_group": "DEVTOOLS-L1-Support",
+        "urgency": urgency
+    }
+
+
+@pytest.fixture
+def posted(clock, monkeypatch):
+    """Record digest posts instead of sending them to Slack."""
+    posts = []
+
+    async def post_incident_list(channel, incidents, thread_ts=None):
+        posts.append((channel, [item["incident_number"] for item in incidents], thread_ts))
+        return {"success": True}
+
+    monkeypatch.setattr(slack_client, "time", clock)
+    monkeypatch.setattr(slack_client, "post_incident_list", post_incident_list)
+    monkeypatch.setattr(slack_client, "_stats", dict(slack_client._stats))
+    return posts
+
+
+def test_parse_digest_windows_skips_malformed_entries():
+    assert parse_digest_windows("2:30, 3:60,4,x:y") == {"2": 30.0, "3": 60.0}
+    assert parse_digest_windows("") == {}
+
+
+def test_urgency_windows():
+    digest = IncidentDigest("digest", default_window=60, windows={"2": 30})
+
+    assert digest.window("1") == 0.0
+    assert digest.window("2") == 30
+    assert digest.window("3") == 60
+    assert digest.window(None) == 60
+
+
+def test_first_incident_is_posted_and_later_ones_held(posted):
+    async def run():
+        digest = IncidentDigest("digest", default_window=60)
+        held = [digest.hold("#dev", incident(f"INC{n}")) for n in range(3)]
+        await digest.flush()
+        return held
+
+    assert asyncio.run(run()) == [False, True, True]
+    assert posted == [("#dev", ["INC1", "INC2"], None)]
+    assert slack_client._stats["digest_held"] == 2
+    assert slack_client._stats["digest_messages"] == 1
+
+
+def test_held_incidents_are_posted_when_the_window_closes(posted, clock, monkeypatch):
+    monkeypatch.setattr(slack_client, "asyncio", SimpleNamespace(
+        sleep=clock.sleep,
+        get_running_loop=asyncio.get_running_loop
+    ))
+    start = clock.now
+
+    async def run():
+        digest = IncidentDigest("digest", default_window=60)
+        digest.hold("#dev", incident("INC0"))
+        digest.hold("#dev", incident("INC1"))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert clock.now == start + 60
+        assert posted == [("#dev", ["INC1"], None)]
+
+        # The flush opened the next window, so the burst keeps being held
+        held = digest.hold("#dev", incident("INC2"))
+        await digest.flush()
+        return held
+
+    assert asyncio.run(run()) is True
+    assert posted == [("#dev", ["INC1"], None), ("#dev", ["INC2"], None)]
+
+
+def test_new_window_opens_after_a_quiet_period(posted, clock):
+    async def run():
+        digest = IncidentDigest("digest", default_window=60)
+        digest.hold("#dev", incident("INC0"))
+        clock.advance(61)
+        return digest.hold("#dev", incident("INC1"))
+
+    assert asyncio.run(run()) is False
+    assert posted == []
+
+
+def test_channels_have_separate_windows(posted):
+    async def run():
+        digest = IncidentDigest("digest", default_window=60)
+        return [digest.hold(channel, incident("INC0")) for channel in ("#dev", "#security", "#dev")]
+
+    assert asyncio.run(run()) == [False, False, True]
+
+
+@pytest.mark.parametrize("mode, urgency", [("digest", "1"), ("off", "3")])
+def test_incidents_that_are_never_held(posted, mode, urgency):
+    async def run():
+        digest = IncidentDigest(mode, default_window=60)
+        return [digest.hold("#dev", incident(f"INC{n}", urgency)) for n in range(3)]
+
+    assert asyncio.run(run()) == [False, False, False]
+
+
+def test_thread_mode_replies_to_the_opening_message(posted):
+    async def run():
+        digest = IncidentDigest("thread", default_window=60)
+        digest.hold("#dev", incident("INC0"))
+        digest.opened("#dev", "1700000000.000100")
+        digest.hold("#dev", incident("INC1"))
+        await digest.flush()
+
+    asyncio.run(run())
+    assert posted == [("#dev", ["INC1"], "1700000000.000100")]
+
+
+@pytest.fixture
+def slack_posts(monkeypatch):
+    """Record single-incident posts sent through one digest; queue False in `outcomes` to fail a post."""
+    posts = []
+    digest = IncidentDigest("digest", default_window=60)
+    outcomes = []
+
+    async def post_message(channel, text, blocks, thread_ts=None):
+        posts.append(text)
+        success = outcomes.pop(0) if outcomes else True
+        if not success:
+            return {"success": False, "ts": None, "error_details": {"error_code": "SLACK_API_ERROR"}}
+        return {"success": True, "ts": f"1700000000.00{len(posts)}", "error_details": None}
+
+    monkeypatch.setattr(slack_client, "post_message", post_message)
+    monkeypatch.setattr(slack_client, "get_incident_digest", lambda: digest)
+    return SimpleNamespace(posts=posts, digest=digest, outcomes=outcomes)
+
+
+def send(number, **kwargs):
+    return slack_client.send_slack_message("#dev", incident_number=number, urgency="3", **kwargs)
+
+
+def test_failed_first_post_does_not_open_a_window(posted, slack_posts):
+    slack_posts.outcomes.append(False)
+
+    async def run():
+        first = await send("INC0")
+        second = await send("INC1")
+        third = await send("INC2")
+        await slack_posts.digest.flush()
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert not first["success"]
+    assert second["success"] and not second.get("digest")
+    assert third.get("digest") is True
+    assert len(slack_posts.posts) == 2
+    assert posted == [("#dev", ["INC2"], None)]
+
+
+def test_incidents_not_held_for_digest_are_posted_immediately(posted, slack_posts):
+    async def run():
+        return [await send(f"INC{n}", hold_for_digest=False) for n in range(3)]
+
+    results = asyncio.run(run())
+    assert [result.get("digest") for result in results] == [None, None, None]
+    assert len(slack_posts.posts) == 3
+    assert posted == []
+
+
+def test_outbox_slack_delivery_bypasses_the_digest(posted, slack_posts, monkeypatch):
+    from api import circuit_breaker, main
+
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    request = {"short_description": "Checkout fails", "urgency_value": "3", "impact_value": "3"}
+
+    async def run():
+        return [
+            await main.deliver_outbox_item("slack", {"incident_number": f"INC{n}", "request": request})
+            for n in range(2)
+        ]
+
+    results = asyncio.run(run())
+    # Each item is only marked delivered once its own message was posted
+    assert all(result["success"] and not result.get("digest") for result in results)
+    assert len(slack_posts.posts) == 2
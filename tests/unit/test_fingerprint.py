@@ -0,0 +1,97 @@
+"""Stack trace normalization and fingerprinting (api.github_client)."""
+
+import pytest
+
+from api import github_client
+from api.github_client import detect_stack_trace, normalize_frame, stack_trace_fingerprint
+
+PYTHON_TRACE = """Traceback (most recent call last):
+  File "/home/alice/app/service.py", line 42, in handle
+    result = process(payload)
+  File "/home/alice/app/worker.py", line 17, in process
+    raise ValueError("bad payload 8f14e45f")
+ValueError: bad payload 8f14e45f"""
+
+JAVA_TRACE = """Exception in thread "main" java.lang.IllegalStateException: pool exhausted after 30000ms
+    at com.technova.pool.Pool.acquire(Pool.java:118)
+    at com.technova.api.Handler.handle(Handler.java:52)
+Caused by: java.io.IOException: connection reset
+    at com.technova.net.Socket.read(Socket.java:77)"""
+
+
+def fingerprint(text):
+    return stack_trace_fingerprint(text, detect_stack_trace(text))
+
+
+@pytest.mark.parametrize("line, other_run", [
+    (
+        'file "/home/alice/app/service.py", line 42, in handle',
+        'file "c:\\users\\bob\\app\\service.py", line 7, in handle'
+    ),
+    ("at com.technova.pool.pool.acquire(pool.java:118)", "at com.technova.pool.pool.acquire(pool.java:120)"),
+    ("at handler (/srv/app/dist/handler.js:10:5)", "at handler (/opt/release-2/handler.js:11:9)"),
+    ("2024-05-01t12:30:45.123z worker crashed at 0x7ffee4b2c8a0", "2024-06-02 08:01:02,5 worker crashed at 0x1a2b"),
+    ("request 123e4567-e89b-12d3-a456-426614174000 failed after 3 retries", "request failed after 5 retries")
+])
+def test_normalize_frame_strips_run_specific_parts(line, other_run):
+    assert normalize_frame(line) == normalize_frame(other_run)
+
+
+def test_normalize_frame_keeps_file_and_function():
+    normalized = normalize_frame('file "/home/alice/app/service.py", line 42, in handle')
+
+    assert "service.py" in normalized and "handle" in normalized
+    assert "alice" not in normalized and "42" not in normalized
+
+
+def test_same_crash_on_other_hosts_matches():
+    other_host = PYTHON_TRACE.replace("/home/alice", "/srv/build-7").replace("line 42", "line 45")
+
+    assert fingerprint(other_host) == fingerprint(PYTHON_TRACE)
+
+
+def test_narrative_around_the_trace_is_ignored():
+    report = f"Checkout failed, support suspected a TimeoutError.\n\n{PYTHON_TRACE}\n\nThanks!"
+
+    assert fingerprint(report) == fingerprint(PYTHON_TRACE)
+
+
+def test_exception_type_changes_fingerprint():
+    other_error = PYTHON_TRACE.replace("ValueError: bad", "KeyError: bad")
+
+    assert fingerprint(other_error) != fingerprint(PYTHON_TRACE)
+
+
+def test_caused_by_exception_is_part_of_fingerprint():
+    other_cause = JAVA_TRACE.replace("java.io.IOException", "java.net.SocketTimeoutException")
+
+    assert fingerprint(other_cause) != fingerprint(JAVA_TRACE)
+
+
+def test_python_uses_innermost_frames(monkeypatch):
+    monkeypatch.setattr(github_client, "FINGERPRINT_FRAMES", 1)
+    other_caller = PYTHON_TRACE.replace("service.py", "scheduler.py")
+
+    assert fingerprint(other_caller) == fingerprint(PYTHON_TRACE)
+
+
+def test_java_uses_outermost_listed_frames(monkeypatch):
+    monkeypatch.setattr(github_client, "FINGERPRINT_FRAMES", 1)
+    other_cause_frame = JAVA_TRACE.replace("Socket.read", "Socket.write")
+
+    assert fingerprint(other_cause_frame) == fingerprint(JAVA_TRACE)
+
+
+def test_without_frames_every_line_counts():
+    assert fingerprint("TypeError: x is undefined\nin checkout") != fingerprint("TypeError: x is undefined\nin cart")
+    assert fingerprint("TypeError: x is undefined 12") == fingerprint("TypeError: x is undefined 13")
+
+
+def test_only_the_start_of_a_description_is_read(monkeypatch):
+    monkeypatch.setattr(github_client, "FINGERPRINT_MAX_CHARS", len(PYTHON_TRACE))
+
+    assert fingerprint(PYTHON_TRACE + "\n" + "x" * 1000) == fingerprint(PYTHON_TRACE)
+
+
+def test_empty_message_has_no_fingerprint():
+    assert stack_trace_fingerprint("") is None
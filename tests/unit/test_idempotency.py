@@ -0,0 +1,277 @@
+"""Idempotent replay, key conflicts and in-flight coalescing (api.idempotency)."""
+
+import asyncio
+import contextvars
+
+import pytest
+
+from api import idempotency
+from api.deadline import remaining_budget, set_deadline
+from api.idempotency import IdempotencyConflictError, IdempotencyStore, request_fingerprint
+
+
+@pytest.fixture
+def open_store(tmp_path, clock, monkeypatch):
+    """Open stores on one database, as the workers of one server do."""
+    monkeypatch.setattr(idempotency, "time", clock)
+    stores = []
+
+    def open_store():
+        store = IdempotencyStore(str(tmp_path / "idempotency.db"), ttl=60, max_entries=2, poll_interval=0.001)
+        stores.append(store)
+        return store
+
+    yield open_store
+    for store in stores:
+        store.close()
+
+
+@pytest.fixture
+def store(open_store):
+    return open_store()
+
+
+def counting_call(result="response"):
+    calls = []
+
+    async def call():
+        calls.append(remaining_budget())
+        return result
+
+    return call, calls
+
+
+def run(coro):
+    """Run a coroutine in a fresh context, so no test inherits another's deadline."""
+    return contextvars.Context().run(asyncio.run, coro)
+
+
+def test_fingerprint_is_stable_per_body():
+    assert request_fingerprint('{"a": 1}') == request_fingerprint('{"a": 1}')
+    assert request_fingerprint('{"a": 1}') != request_fingerprint('{"a": 2}')
+
+
+def test_duplicate_replays_stored_result(store):
+    call, calls = counting_call()
+
+    assert run(store.run("key", "fp", call)) == ("response", False)
+    assert run(store.run("key", "fp", call)) == ("response", True)
+    assert len(calls) == 1
+    assert store.stats()["replayed"] == 1
+
+
+def test_key_reused_for_other_request_conflicts(store):
+    call, _ = counting_call()
+    run(store.run("key", "fp", call))
+
+    with pytest.raises(IdempotencyConflictError):
+        run(store.run("key", "other-fp", call))
+
+
+def test_key_reused_while_in_flight_conflicts(store):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_call():
+            await release.wait()
+            return "response"
+
+        first = asyncio.create_task(store.run("key", "fp", slow_call))
+        await asyncio.sleep(0)
+        with pytest.raises(IdempotencyConflictError):
+            await store.run("key", "other-fp", slow_call)
+        release.set()
+        return await first
+
+    assert run(scenario()) == ("response", False)
+
+
+def test_concurrent_duplicates_share_one_run(store):
+    async def scenario():
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await release.wait()
+            return "response"
+
+        runs = [asyncio.create_task(store.run("key", "fp", slow_call)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*runs), calls
+
+    results, calls = run(scenario())
+    assert results == [("response", False), ("response", True), ("response", True)]
+    assert len(calls) == 1
+    assert store.stats()["coalesced"] == 2
+
+
+def test_rejected_results_are_not_replayed(store):
+    call, calls = counting_call("failed")
+
+    run(store.run("key", "fp", call, should_store=lambda result: False))
+    assert run(store.run("key", "fp", call, should_store=lambda result: False)) == ("failed", False)
+    assert len(calls) == 2
+
+
+def test_entries_expire_after_ttl(store, clock):
+    call, calls = counting_call()
+    run(store.run("key", "fp", call))
+
+    clock.advance(61)
+
+    assert run(store.run("key", "fp", call)) == ("response", False)
+    assert len(calls) == 2
+
+
+def test_oldest_entries_are_evicted(store):
+    call, calls = counting_call()
+    for key in ("a", "b", "c"):
+        run(store.run(key, "fp", call))
+
+    assert store.stats()["stored"] == 2
+    assert run(store.run("a", "fp", call)) == ("response", False)
+    assert len(calls) == 4
+
+
+def test_shared_run_does_not_inherit_callers_deadline(store):
+    call, calls = counting_call()
+
+    async def scenario():
+        set_deadline(5.0)
+        return await store.run("key", "fp", call)
+
+    run(scenario())
+    assert calls == [None]
+
+
+def test_starting_request_waits_for_its_run(store):
+    async def scenario():
+        async def slow_call():
+            await asyncio.sleep(0.05)
+            return "response"
+
+        # The call is bounded by the caller's deadline itself, so its result is not dropped
+        set_deadline(0.01)
+        return await store.run("key", "fp", slow_call)
+
+    assert run(scenario()) == ("response", False)
+
+
+def test_duplicate_past_its_deadline_stops_waiting_but_run_completes(store):
+    async def scenario():
+        async def slow_call():
+            await asyncio.sleep(0.05)
+            return "response"
+
+        first = asyncio.create_task(store.run("key", "fp", slow_call))
+        await asyncio.sleep(0)
+
+        set_deadline(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await store.run("key", "fp", slow_call)
+
+        # The run goes on and its result is kept for the retry
+        set_deadline(None)
+        assert await first == ("response", False)
+        return await store.run("key", "fp", slow_call)
+
+    assert run(scenario()) == ("response", True)
+
+
+def test_other_worker_replays_stored_result(open_store):
+    first, second = open_store(), open_store()
+    call, calls = counting_call()
+
+    run(first.run("key", "fp", call))
+
+    assert run(second.run("key", "fp", call)) == ("response", True)
+    with pytest.raises(IdempotencyConflictError):
+        run(second.run("key", "other-fp", call))
+    assert len(calls) == 1
+
+
+def test_other_worker_waits_for_in_flight_run(open_store):
+    first, second = open_store(), open_store()
+
+    async def scenario():
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await release.wait()
+            return "response"
+
+        owner = asyncio.create_task(first.run("key", "fp", slow_call))
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(second.run("key", "fp", slow_call))
+        await asyncio.sleep(0.01)
+        assert second.stats()["inflight"] == 1
+        release.set()
+        return await owner, await duplicate, calls
+
+    owner, duplicate, calls = run(scenario())
+    assert owner == ("response", False)
+    assert duplicate == ("response", True)
+    assert len(calls) == 1
+
+
+def test_other_worker_runs_again_when_result_is_not_stored(open_store):
+    first, second = open_store(), open_store()
+
+    async def scenario():
+        release = asyncio.Event()
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await release.wait()
+            return "failed"
+
+        owner = asyncio.create_task(first.run("key", "fp", slow_call, should_store=lambda result: False))
+        await asyncio.sleep(0)
+        duplicate = asyncio.create_task(second.run("key", "fp", slow_call, should_store=lambda result: False))
+        await asyncio.sleep(0.01)
+        release.set()
+        return await owner, await duplicate, calls
+
+    owner, duplicate, calls = run(scenario())
+    assert owner == ("failed", False)
+    assert duplicate == ("failed", False)
+    assert len(calls) == 2
+
+
+def test_other_worker_stops_waiting_at_its_deadline(open_store):
+    first, second = open_store(), open_store()
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def slow_call():
+            await release.wait()
+            return "response"
+
+        owner = asyncio.create_task(first.run("key", "fp", slow_call))
+        await asyncio.sleep(0)
+
+        set_deadline(0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await second.run("key", "fp", slow_call)
+
+        release.set()
+        return await owner
+
+    assert run(scenario()) == ("response", False)
+
+
+def test_expired_reservation_of_a_dead_worker_is_taken_over(store, open_store, clock):
+    call, calls = counting_call()
+    # A worker reserved the key and died before storing a result
+    assert open_store()._claim("key", "fp") is None
+
+    clock.advance(store.lease + 1)
+
+    assert run(store.run("key", "fp", call)) == ("response", False)
+    assert len(calls) == 1
@@ -0,0 +1,95 @@
+"""Fingerprint reservations in the issue index (api.issue_index)."""
+
+import pytest
+
+from api.issue_index import IssueIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = IssueIndex(str(tmp_path / "issues.db"), ttl=3600, reservation_ttl=60, poll_interval=0.01)
+    yield index
+    index.close()
+
+
+def test_first_claim_reserves_the_fingerprint(index):
+    assert index.claim("org/repo", "abc", now=1000.0) is None
+
+    pending = index.claim("org/repo", "abc", now=1001.0)
+    assert pending["issue_number"] == 0
+    assert pending["occurrences"] == 2
+
+
+def test_recorded_issue_keeps_occurrences_counted_meanwhile(index):
+    index.claim("org/repo", "abc")
+    index.claim("org/repo", "abc")
+    index.record_issue("org/repo", "abc", 7, "https://github.com/org/repo/issues/7")
+
+    entry = index.claim("org/repo", "abc")
+    assert entry["issue_number"] == 7
+    assert entry["occurrences"] == 3
+    assert entry["reported_occurrences"] == 1
+
+
+def test_released_reservation_can_be_claimed_again(index):
+    index.claim("org/repo", "abc", now=1000.0)
+    index.release("org/repo", "abc")
+
+    assert index.claim("org/repo", "abc", now=1001.0) is None
+
+
+def test_expired_reservation_can_be_claimed_again(index):
+    index.claim("org/repo", "abc", now=1000.0)
+
+    assert index.claim("org/repo", "abc", now=1030.0)["issue_number"] == 0
+    assert index.claim("org/repo", "abc", now=1061.0) is None
+
+
+def test_expired_issue_gets_a_fresh_reservation(index):
+    index.claim("org/repo", "abc", now=1000.0)
+    index.record_issue("org/repo", "abc", 7, "https://github.com/org/repo/issues/7")
+
+    assert index.claim("org/repo", "abc", now=1000.0 + 2 * 3600) is None
+
+
+def test_waiting_for_a_released_reservation_returns_none(index):
+    other_worker = IssueIndex(index.path, ttl=3600)
+    try:
+        assert other_worker.claim("org/repo", "abc") is None
+        other_worker.release("org/repo", "abc")
+    finally:
+        other_worker.close()
+
+    assert index.wait_for_issue("org/repo", "abc") is None
+
+
+def test_waiting_returns_the_winners_issue(index):
+    index.claim("org/repo", "abc")
+    index.record_issue("org/repo", "abc", 7, "https://github.com/org/repo/issues/7")
+
+    assert index.wait_for_issue("org/repo", "abc")["issue_number"] == 7
+
+
+def test_fingerprints_are_per_repository(index):
+    assert index.claim("org/one", "abc") is None
+    assert index.claim("org/two", "abc") is None
+
+
+def test_comment_slot_is_handed_out_once_per_interval(index):
+    index.claim("org/repo", "abc")
+    index.record_issue("org/repo", "abc", 7, "https://github.com/org/repo/issues/7")
+    index.claim("org/repo", "abc")
+    commented_at = index.claim("org/repo", "abc")["last_commented_at"]
+
+    assert index.claim_comment("org/repo", "abc", 600, now=commented_at + 599) is None
+
+    entry = index.claim_comment("org/repo", "abc", 600, now=commented_at + 600)
+    assert entry["occurrences"] == 3
+    assert entry["reported_occurrences"] == 1
+    assert index.claim_comment("org/repo", "abc", 600, now=commented_at + 601) is None
+
+
+def test_reserved_fingerprint_has_no_comment_slot(index):
+    index.claim("org/repo", "abc", now=1000.0)
+
+    assert index.claim_comment("org/repo", "abc", 0, now=2000.0) is None
@@ -0,0 +1,74 @@
+"""Summing the metrics of several workers for /metrics (api.metrics)."""
+
+import asyncio
+import json
+
+import pytest
+
+from api import metrics
+from api.metrics import Counter, Gauge, Histogram
+from api.shared_state import SharedStore
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Give each test its own metrics."""
+    monkeypatch.setattr(metrics, "_registry", [])
+    return (
+        Counter("errors_total", "Errors.", ("service",)),
+        Gauge("in_flight", "In flight."),
+        Histogram("duration_seconds", "Duration.", buckets=(0.1, 1.0))
+    )
+
+
+def record(registry, errors, duration):
+    counter, gauge, histogram = registry
+    counter.inc(errors, service="slack")
+    gauge.inc()
+    histogram.observe(duration)
+
+
+def test_other_workers_snapshots_are_added(registry):
+    record(registry, 2, 0.05)
+    # Snapshots travel between workers as JSON
+    other_worker = json.loads(json.dumps(metrics.snapshot_metrics()))
+    counter, _, _ = registry
+    counter.inc(1, service="github")
+
+    lines = metrics.render_metrics([other_worker]).splitlines()
+
+    assert 'errors_total{service="slack"} 4' in lines
+    assert 'errors_total{service="github"} 1' in lines
+    assert "in_flight 2" in lines
+    assert 'duration_seconds_bucket{le="0.1"} 2' in lines
+    assert "duration_seconds_count 2" in lines
+    assert "duration_seconds_sum 0.1" in lines
+
+
+def test_rendering_does_not_change_the_snapshots(registry):
+    record(registry, 1, 0.5)
+    snapshot = metrics.snapshot_metrics()
+    expected = json.dumps(snapshot)
+
+    metrics.render_metrics([snapshot, snapshot])
+
+    assert json.dumps(snapshot) == expected
+
+
+def test_worker_metrics_include_published_snapshots(registry, tmp_path):
+    store = SharedStore(str(tmp_path))
+    record(registry, 1, 0.5)
+    store.write("metrics-1", metrics.snapshot_metrics())
+
+    async def publish_once():
+        publisher = asyncio.create_task(metrics.run_metrics_publisher(store, 0, interval=60))
+        await asyncio.sleep(0)
+        publisher.cancel()
+
+    asyncio.run(publish_once())
+    assert store.keys("metrics-") == ["metrics-0", "metrics-1"]
+
+    # Worker 0's own snapshot is not counted twice
+    lines = metrics.render_worker_metrics(store, 0).splitlines()
+    assert 'errors_total{service="slack"} 2' in lines
+    assert "duration_seconds_count 2" in lines
@@ -0,0 +1,134 @@
+"""Outbox claims, leases and retry backoff (api.outbox)."""
+
+import asyncio
+
+import pytest
+
+from api import outbox as outbox_module
+from api.outbox import STATUS_DELIVERED, STATUS_FAILED, STATUS_IN_PROGRESS, STATUS_PENDING, Outbox, deliver_item
+
+
+@pytest.fixture
+def outbox(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(outbox_module, "time", clock)
+    outbox = Outbox(str(tmp_path / "outbox.db"), max_attempts=3, base_backoff=2.0, lease=300.0)
+    yield outbox
+    outbox.close()
+
+
+def test_enqueued_item_is_claimed_once(outbox):
+    item_id = outbox.enqueue("INC0001", "slack", {"channel": "#dev"})
+
+    claimed = outbox.claim_due(10)
+    assert [item["id"] for item in claimed] == [item_id]
+    assert claimed[0]["payload"] == {"channel": "#dev"}
+    assert claimed[0]["attempts"] == 0
+
+    assert outbox.claim_due(10) == []
+    assert outbox.get_status("INC0001")["slack"]["status"] == STATUS_IN_PROGRESS
+
+
+def test_claims_respect_the_limit(outbox):
+    for kind in ("slack", "github", "slack"):
+        outbox.enqueue("INC0001", kind, {})
+
+    assert len(outbox.claim_due(2)) == 2
+    assert len(outbox.claim_due(2)) == 1
+
+
+def test_expired_lease_is_claimed_again(outbox, clock):
+    item_id = outbox.enqueue("INC0001", "slack", {})
+    outbox.claim_due(10)
+
+    assert outbox.claim_due(10, now=clock.now + 299) == []
+
+    # The expired lease counts as a failed attempt and backs off like one
+    clock.advance(300)
+    assert outbox.claim_due(10) == []
+    status = outbox.get_status("INC0001")["slack"]
+    assert status["status"] == STATUS_PENDING
+    assert status["attempts"] == 1
+    assert status["last_error"] == "Delivery lease expired"
+
+    clock.advance(2.0)
+    claimed = outbox.claim_due(10)
+    assert [item["id"] for item in claimed] == [item_id]
+    assert claimed[0]["attempts"] == 1
+
+
+def test_item_that_keeps_outliving_its_lease_fails(outbox, clock):
+    outbox.enqueue("INC0001", "slack", {})
+
+    for _ in range(3):
+        assert len(outbox.claim_due(10)) == 1
+        clock.advance(300)
+        assert outbox.claim_due(10) == []
+        clock.advance(60)
+
+    status = outbox.get_status("INC0001")["slack"]
+    assert status["status"] == STATUS_FAILED
+    assert status["attempts"] == 3
+    assert outbox.claim_due(10, now=clock.now + 3600) == []
+
+
+def test_failed_attempts_back_off_exponentially(outbox, clock):
+    item_id = outbox.enqueue("INC0001", "github", {})
+    start = clock.now
+
+    for attempts, delay in ((0, 2.0), (1, 4.0)):
+        outbox.claim_due(10, now=clock.now)
+        assert outbox.mark_attempt_failed(item_id, attempts, "boom", now=clock.now) == STATUS_PENDING
+
+        assert outbox.claim_due(10, now=clock.now + delay - 0.1) == []
+        clock.advance(delay)
+
+    assert clock.now == start + 6.0
+    assert [item["attempts"] for item in outbox.claim_due(10)] == [2]
+
+
+def test_item_fails_after_max_attempts(outbox):
+    item_id = outbox.enqueue("INC0001", "github", {})
+    outbox.claim_due(10)
+
+    assert outbox.mark_attempt_failed(item_id, 2, "boom") == STATUS_FAILED
+    assert outbox.claim_due(10, now=10 ** 12) == []
+
+    status = outbox.get_status("INC0001")["github"]
+    assert status["status"] == STATUS_FAILED
+    assert status["attempts"] == 3
+    assert status["last_error"] == "boom"
+
+
+def test_deliver_item_records_success(outbox):
+    outbox.enqueue("INC0001", "slack", {"channel": "#dev"})
+    item = outbox.claim_due(10)[0]
+
+    async def deliver(kind, payload):
+        return {"success": True, "channel": payload["channel"]}
+
+    asyncio.run(deliver_item(outbox, item, deliver))
+
+    status = outbox.get_status("INC0001")["slack"]
+    assert status["status"] == STATUS_DELIVERED
+    assert status["result"] == {"success": True, "channel": "#dev"}
+    assert outbox.backlog() == {STATUS_DELIVERED: 1}
+
+
+@pytest.mark.parametrize("outcome", ["error_result", "exception"])
+def test_deliver_item_schedules_retry_on_failure(outbox, clock, outcome):
+    outbox.enqueue("INC0001", "slack", {})
+    item = outbox.claim_due(10)[0]
+
+    async def deliver(kind, payload):
+        if outcome == "exception":
+            raise RuntimeError("slack down")
+        return {"success": False, "error_details": {"error_message": "slack down"}}
+
+    asyncio.run(deliver_item(outbox, item, deliver))
+
+    status = outbox.get_status("INC0001")["slack"]
+    assert status["status"] == STATUS_PENDING
+    assert status["last_error"] == "slack down"
+    assert outbox.claim_due(10) == []
+    clock.advance(2.0)
+    assert len(outbox.claim_due(10)) == 1
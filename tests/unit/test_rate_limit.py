@@ -0,0 +1,135 @@
+"""GCRA token buckets and the rate limit scheduler (api.rate_limit)."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from api import rate_limit
+from api.rate_limit import RateLimitScheduler, RateLimitWaitError, TokenBucket
+
+
+def take_all(bucket, now, count):
+    """Take `count` tokens as early as possible from `now`; return when each was granted."""
+    granted = []
+    for _ in range(count):
+        at = bucket.ready_at(now)
+        bucket.take(at)
+        granted.append(at)
+    return granted
+
+
+def test_bucket_spaces_tokens_at_rate():
+    bucket = TokenBucket(rate=2)
+
+    assert take_all(bucket, 100.0, 3) == [100.0, 100.5, 101.0]
+
+
+def test_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=1, burst=3)
+
+    assert take_all(bucket, 100.0, 5) == [100.0, 100.0, 100.0, 101.0, 102.0]
+
+
+def test_bucket_refills_while_idle():
+    bucket = TokenBucket(rate=1, burst=3)
+    take_all(bucket, 100.0, 3)
+
+    # Two idle seconds refill two tokens, not more
+    assert take_all(bucket, 102.0, 3) == [102.0, 102.0, 103.0]
+
+
+def test_bucket_never_exceeds_burst_after_long_idle():
+    bucket = TokenBucket(rate=1, burst=2)
+    take_all(bucket, 100.0, 1)
+
+    assert take_all(bucket, 1000.0, 3) == [1000.0, 1000.0, 1001.0]
+
+
+def test_bucket_reserves_future_tokens():
+    bucket = TokenBucket(rate=1)
+    bucket.take(bucket.ready_at(100.0))
+    bucket.take(bucket.ready_at(100.0))
+
+    # The second call reserved the 101.0 slot, so the next one is at 102.0
+    assert bucket.ready_at(100.5) == 102.0
+
+
+def test_burst_below_one_behaves_as_one():
+    bucket = TokenBucket(rate=1, burst=0)
+
+    assert take_all(bucket, 100.0, 2) == [100.0, 101.0]
+
+
+@pytest.fixture
+def scheduler(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "time", clock)
+    monkeypatch.setattr(rate_limit, "asyncio", SimpleNamespace(sleep=clock.sleep))
+
+    def bucket_factory(key):
+        if key[0] == "unlimited":
+            return None
+        # One call per second per method, one per 2 seconds per channel
+        return TokenBucket(rate=1) if len(key) == 1 else TokenBucket(rate=0.5)
+
+    return RateLimitScheduler("unit-test", bucket_factory)
+
+
+def test_scheduler_waits_for_tokens(scheduler, clock):
+    async def run():
+        return [await scheduler.acquire("chat.postMessage") for _ in range(3)]
+
+    assert asyncio.run(run()) == [0.0, 1.0, 1.0]
+    assert clock.now == 1002.0
+
+
+def test_scheduler_takes_from_every_bucket(scheduler):
+    async def run():
+        return [await scheduler.acquire("chat.postMessage", ["C1"]) for _ in range(2)]
+
+    # The channel bucket is the slower of the two
+    assert asyncio.run(run()) == [0.0, 2.0]
+
+
+def test_scheduler_keys_are_independent(scheduler):
+    async def run():
+        await scheduler.acquire("chat.postMessage", ["C1"])
+        return await scheduler.acquire("chat.postMessage", ["C2"])
+
+    # Only the method bucket applies to the second channel
+    assert asyncio.run(run()) == 1.0
+
+
+def test_scheduler_rejects_long_waits_without_taking_a_token(scheduler):
+    async def run():
+        await scheduler.acquire("chat.postMessage")
+        with pytest.raises(RateLimitWaitError) as excinfo:
+            await scheduler.acquire("chat.postMessage", max_wait=0.5)
+        assert excinfo.value.wait == pytest.approx(1.0)
+        # The rejected call did not reserve the next slot
+        return await scheduler.acquire("chat.postMessage", max_wait=1.0)
+
+    assert asyncio.run(run()) == 1.0
+
+
+def test_scheduler_without_bucket_does_not_wait(scheduler):
+    async def run():
+        return [await scheduler.acquire("unlimited") for _ in range(5)]
+
+    assert asyncio.run(run()) == [0.0] * 5
+
+
+def test_scheduler_snapshot_counts_delays(scheduler):
+    async def run():
+        for _ in range(3):
+            await scheduler.acquire("chat.postMessage")
+
+    asyncio.run(run())
+
+    assert scheduler.snapshot()["chat.postMessage"] == {
+        "queue_depth": 0,
+        "calls": 3,
+        "delayed": 2,
+        "wait_seconds": 2.0,
+        "max_wait_seconds": 1.0
+    }
@@ -0,0 +1,76 @@
+"""The client's time budget reaching the /get_support pipeline (api.main)."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import circuit_breaker, main
+from api.deadline import remaining_budget
+from api.idempotency import IdempotencyStore
+
+SUPPORT_REQUEST = {
+    "short_description": "Checkout page times out",
+    "description": "Customers cannot complete checkout",
+    "assignment_group": "DEVTOOLS-L1-Support",
+    "urgency_value": "2",
+    "impact_value": "2"
+}
+
+
+@pytest.fixture
+def budgets(tmp_path, monkeypatch):
+    """Record the budget each downstream call gets; Slack takes longer than any test allows."""
+    budgets = {}
+
+    async def create_service_now_incident(request):
+        budgets["servicenow"] = remaining_budget()
+        return {"success": True, "incident_number": "INC0010001", "incident_sys_id": "abc123"}
+
+    async def send_slack_message(**kwargs):
+        budgets["slack"] = remaining_budget()
+        await asyncio.sleep(10)
+        return {"success": True}
+
+    monkeypatch.setattr(main, "create_service_now_incident", create_service_now_incident)
+    monkeypatch.setattr(main, "send_slack_message", send_slack_message)
+    monkeypatch.setattr(main.settings, "deadline_optional_min_seconds", 0.0)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    store = IdempotencyStore(str(tmp_path / "idempotency.db"), ttl=60, max_entries=10)
+    monkeypatch.setattr(main, "get_idempotency_store", lambda: store)
+    yield budgets
+    store.close()
+
+
+def test_header_budget_reaches_downstream_calls(budgets):
+    response = TestClient(main.app).post(
+        "/get_support", json=SUPPORT_REQUEST, headers={"X-Request-Timeout": "0.3"}
+    )
+
+    assert 0 < budgets["servicenow"] <= 0.3
+    assert 0 < budgets["slack"] <= budgets["servicenow"]
+
+    # The incident exists, so running out of time in Slack is not a 504
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert body["incident_number"] == "INC0010001"
+    assert body["slack_message_sent"] is False
+    assert body["error_details"]["error_code"] == "SLACK_TIMEOUT"
+
+
+def test_without_header_the_server_budget_applies(budgets, monkeypatch):
+    monkeypatch.setattr(main.settings, "request_timeout", 0.2)
+
+    response = TestClient(main.app).post("/get_support", json=SUPPORT_REQUEST)
+
+    assert response.status_code == 200
+    assert 0.1 < budgets["servicenow"] <= 0.2
+
+
+def test_header_is_capped_to_the_server_maximum(budgets, monkeypatch):
+    monkeypatch.setattr(main.settings, "request_timeout_max", 0.2)
+
+    TestClient(main.app).post("/get_support", json=SUPPORT_REQUEST, headers={"X-Request-Timeout": "60"})
+
+    assert 0.1 < budgets["servicenow"] <= 0.2
@@ -0,0 +1,131 @@
+"""Longest-prefix routing of assignment groups to Slack channels (api.routing)."""
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from api import routing
+from api.routing import RoutingIndex, build_routing_index, get_routing_index, parse_knowledge_base_routes
+
+ROUTES = {
+    "DEV": "#dev",
+    "DEVTOOLS": "#devtools",
+    "DEVTOOLS-SEC": "#devtools-security",
+    "SEC": "#security"
+}
+
+KNOWLEDGE_BASE = """# Assignment groups
+
+## CLOUD - Cloud Infrastructure Services
+
+| Assignment Group | Group ID | Products Covered | Escalation Group |
+|------------------|----------|------------------|------------------|
+| CLOUD-L1-Support | AGR-CLOUD-001 | All CLOUD products | CLOUD-L2-Engineering |
+| INFRA-Network-Team | AGR-CLOUD-005 | CLOUD-005 | CLOUD-L2-Engineering |
+
+- **Slack Channel:** #cloud-support
+
+## DATA - Data & Analytics
+
+| DATA-L1-Support | AGR-DATA-001 | All DATA products | DATA-L2-Engineering |
+
+- **Slack Channel:** #data-support
+"""
+
+
+@pytest.mark.parametrize("group, channel", [
+    ("DEVTOOLS-L1-Support", "#devtools"),
+    ("DEVTOOLS-SEC-Team", "#devtools-security"),
+    ("DEV-L2-Engineering", "#dev"),
+    ("DEVOPS-Team", "#dev"),
+    ("SEC-L1-Support", "#security"),
+    ("devtools-l1-support", "#devtools"),
+    ("CLOUD-L1-Support", None),
+    ("DE", None),
+    ("", None)
+])
+def test_longest_prefix_wins(group, channel):
+    assert RoutingIndex(ROUTES).resolve(group) == channel
+
+
+def test_definition_order_does_not_matter():
+    reversed_routes = dict(reversed(list(ROUTES.items())))
+
+    assert RoutingIndex(reversed_routes).resolve("DEVTOOLS-L1-Support") == "#devtools"
+
+
+def test_prefixes_are_case_insensitive_and_empty_ones_ignored():
+    index = RoutingIndex({"cloud": "#cloud", "": "#everything"})
+
+    assert index.resolve("CLOUD-L1") == "#cloud"
+    assert index.resolve("DATA-L1") is None
+
+
+def test_resolution_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(routing, "MAX_CACHED_GROUPS", 2)
+    index = RoutingIndex(ROUTES)
+
+    for group in ("DEV-1", "DEV-2", "DEV-3"):
+        assert index.resolve(group) == "#dev"
+
+    assert len(index._cache) <= 2
+
+
+def test_knowledge_base_sections_route_every_group_prefix():
+    routes = parse_knowledge_base_routes(KNOWLEDGE_BASE)
+
+    assert routes == {
+        "CLOUD": "#cloud-support",
+        "INFRA": "#cloud-support",
+        "DATA": "#data-support"
+    }
+
+
+@pytest.fixture
+def sources(tmp_path, clock, monkeypatch):
+    knowledge_base = tmp_path / "groups.txt"
+    knowledge_base.write_text(KNOWLEDGE_BASE, encoding="utf-8")
+    routing_file = tmp_path / "routes.json"
+    routing_file.write_text(json.dumps({"cloud-l3": "#cloud-architecture"}), encoding="utf-8")
+
+    settings = SimpleNamespace(
+        routing_knowledge_base_path=str(knowledge_base),
+        routing_config_path=str(routing_file),
+        routing_reload_interval=30.0
+    )
+    monkeypatch.setattr(routing, "get_settings", lambda: settings)
+    monkeypatch.setattr(routing, "time", clock)
+    monkeypatch.setattr(routing, "_index", None)
+    monkeypatch.setattr(routing, "_last_reload_check", 0.0)
+    return SimpleNamespace(knowledge_base=knowledge_base, routing_file=routing_file)
+
+
+def test_routing_file_overrides_knowledge_base_and_defaults(sources):
+    index = build_routing_index()
+
+    assert index.resolve("CLOUD-L3-Architecture") == "#cloud-architecture"
+    assert index.resolve("CLOUD-L1-Support") == "#cloud-support"
+    assert index.resolve("ITSM-L1-Support") == routing.ASSIGNMENT_GROUP_SLACK_CHANNELS["ITSM"]
+
+
+def test_missing_source_is_skipped(sources):
+    sources.routing_file.unlink()
+
+    assert build_routing_index().resolve("CLOUD-L3-Architecture") == "#cloud-support"
+
+
+def test_index_reloads_when_a_source_changes(sources, clock):
+    assert get_routing_index().resolve("CLOUD-L3-Architecture") == "#cloud-architecture"
+
+    sources.routing_file.write_text(json.dumps({"cloud-l3": "#cloud-l3"}), encoding="utf-8")
+    stat = sources.routing_file.stat()
+    os.utime(sources.routing_file, (stat.st_atime, stat.st_mtime + 10))
+
+    # Sources are only checked once per reload interval
+    clock.advance(10)
+    assert get_routing_index().resolve("CLOUD-L3-Architecture") == "#cloud-architecture"
+
+    clock.advance(30)
+    assert get_routing_index().resolve("CLOUD-L3-Architecture") == "#cloud-l3"